@@ -0,0 +1,141 @@
+import numpy as np
+
+from cellgrid import ChunkedCellGrid, DEFAULT_TILE_SIZE
+from hashlife import HashLifeCellGrid
+
+# max size of the tile mask used to find the tiles containing changed cells, beyond the size
+# proportional to the changed cell number
+MAX_TILE_MASK_SIZE = 2 ** 16
+
+class ActiveTileMap():
+    '''
+    This class tracks the tiles of tileSize x tileSize cells whose cells changed during the
+    last generation or were edited since. A cell can only change if a cell of its 3 x 3
+    neighborhood changed during the previous generation, so that the next generation only
+    needs to be computed on the changed tiles and their 8 neighbor tiles, the active tiles.
+    The grid view uses the changed tiles too, in order to repaint only them after a step.
+
+    The changed tiles are stored as a set of (tile row, tile col) keys, like the tiles of a
+    ChunkedCellGrid, so that the map of a huge or unbounded grid only costs memory for the
+    tiles which changed.
+    '''
+    def __init__(self, tileSize=DEFAULT_TILE_SIZE):
+        self.tileSize = tileSize
+
+        # None means that the changed tiles are unknown, for example after the grid data
+        # were loaded. All the tiles are then active
+        self.changedTiles = None
+
+    def isTracking(self):
+        return self.changedTiles is not None
+
+    def reset(self):
+        self.changedTiles = None
+
+    def startTracking(self, cellGrid):
+        '''
+        Starts tracking the changed tiles of the passed cell grid if they are unknown. Since
+        only the cells neighboring alive cells can change during the next generation, the
+        tiles containing alive cells are considered changed. This is only done if these tiles
+        can be found without reading the cells, i.e. if the grid is empty or if it is a
+        ChunkedCellGrid or a HashLifeCellGrid, whose allocated tiles or populated nodes are
+        used. A huge or unbounded sparse grid is so never computed over its whole data extent.
+
+        :param cellGrid: CellGrid, ChunkedCellGrid, PackedCellGrid or HashLifeCellGrid
+
+        :return: True if the changed tiles are tracked
+        '''
+        if self.changedTiles is not None:
+            return True
+
+        if isinstance(cellGrid, ChunkedCellGrid):
+            aliveZones = [(tileRow * cellGrid.tileSize, tileCol * cellGrid.tileSize, cellGrid.tileSize) for tileRow, tileCol in cellGrid.tiles]
+        elif isinstance(cellGrid, HashLifeCellGrid):
+            aliveZones = cellGrid.getPopulatedZones(self.tileSize)
+        elif cellGrid.getDataExtent() == (0, 0):
+            aliveZones = []
+        else:
+            return False
+
+        self.changedTiles = set()
+
+        for rowStart, colStart, zoneSize in aliveZones:
+            # the zones can exceed the grid dimensions
+            self.addChangedWindow(max(rowStart, 0), min(rowStart + zoneSize, cellGrid.dimY),
+                                  max(colStart, 0), min(colStart + zoneSize, cellGrid.dimX))
+
+        return True
+
+    def setChangedTiles(self, changedTiles):
+        '''
+        Replaces the changed tiles by the passed tiles, i.e. the tiles changed by the last
+        generation.
+
+        :param changedTiles: set of (tile row, tile col) tuples
+        '''
+        self.changedTiles = changedTiles
+
+    def addChangedCells(self, changedRows, changedCols):
+        '''
+        Adds the tiles containing the passed cells to the changed tiles. Nothing is done if
+        the changed tiles are unknown, since all the tiles are then active.
+
+        :param changedRows: 1 dimension array of 0 based row indexes
+        :param changedCols: 1 dimension array of 0 based col indexes
+        '''
+        if self.changedTiles is None or len(changedRows) == 0:
+            return
+
+        tileRows = np.asarray(changedRows) // self.tileSize
+        tileCols = np.asarray(changedCols) // self.tileSize
+        minTileRow = int(tileRows.min())
+        minTileCol = int(tileCols.min())
+        tileRowNumber = int(tileRows.max()) - minTileRow + 1
+        tileColNumber = int(tileCols.max()) - minTileCol + 1
+
+        if tileRowNumber * tileColNumber > 4 * tileRows.size + MAX_TILE_MASK_SIZE:
+            # the cells are scattered over a huge zone
+            self.changedTiles.update(zip(tileRows.tolist(), tileCols.tolist()))
+            return
+
+        # the tiles are marked in a mask covering the changed cells, so that each changed
+        # tile is added once, whatever its changed cell number
+        tileMask = np.zeros((tileRowNumber, tileColNumber), dtype=bool)
+        tileMask[tileRows - minTileRow, tileCols - minTileCol] = True
+        changedTileRows, changedTileCols = np.nonzero(tileMask)
+        self.changedTiles.update(zip((changedTileRows + minTileRow).tolist(), (changedTileCols + minTileCol).tolist()))
+
+    def addChangedWindow(self, rowStart, rowEnd, colStart, colEnd):
+        '''
+        Adds the tiles covering the zone [rowStart, rowEnd[ x [colStart, colEnd[ to the changed
+        tiles.
+        '''
+        if self.changedTiles is None or rowEnd <= rowStart or colEnd <= colStart:
+            return
+
+        for tileRow in range(rowStart // self.tileSize, (rowEnd - 1) // self.tileSize + 1):
+            for tileCol in range(colStart // self.tileSize, (colEnd - 1) // self.tileSize + 1):
+                self.changedTiles.add((tileRow, tileCol))
+
+    def computeActiveTiles(self, tileRowNumber, tileColNumber, wrapEdges=False):
+        '''
+        Returns the changed tiles and their neighbor tiles.
+
+        :param tileRowNumber: number of tile rows of the grid
+        :param tileColNumber: number of tile cols of the grid
+        :param wrapEdges: if True, the tiles of the last row/col are neighbors of the tiles of
+                          the first row/col. Else, the neighbors outside of the grid are ignored
+
+        :return: set of (tile row, tile col) tuples
+        '''
+        activeTiles = set()
+
+        for tileRow, tileCol in self.changedTiles:
+            for neighborTileRow in range(tileRow - 1, tileRow + 2):
+                for neighborTileCol in range(tileCol - 1, tileCol + 2):
+                    if wrapEdges:
+                        activeTiles.add((neighborTileRow % tileRowNumber, neighborTileCol % tileColNumber))
+                    elif 0 <= neighborTileRow < tileRowNumber and 0 <= neighborTileCol < tileColNumber:
+                        activeTiles.add((neighborTileRow, neighborTileCol))
+
+        return activeTiles
@@ -0,0 +1,75 @@
+from collections import OrderedDict
+
+import pygame as pg
+
+AXIS_LABEL_COLOR_BLACK = (0, 0, 0)
+
+# max number of rendered row/col number labels kept in the cache. The grid view displays
+# at most a few hundred labels, so that panning over the whole grid does not evict the
+# labels currently displayed.
+DEFAULT_MAX_CACHED_LABEL_NUMBER = 1024
+
+class AxisLabelCache():
+    '''
+    This class caches the pre-rendered row/col number label surfaces drawn by the GridView
+    in the grid coord margins. Rendering a label with the font is expensive compared to
+    blitting an already rendered surface. Since the same row and col numbers are drawn frame
+    after frame, the labels are rendered only once and reused afterwards.
+
+    The cached labels are keyed by row/col index and font size. When the cache is full, the
+    least recently used label is evicted.
+    '''
+    def __init__(self, fontSize, maxCachedLabelNumber=DEFAULT_MAX_CACHED_LABEL_NUMBER):
+        self.fontSize = fontSize
+        self.maxCachedLabelNumber = maxCachedLabelNumber
+        self.font = pg.font.SysFont('arial', fontSize, False)
+        self.labels = OrderedDict()
+
+    def setFontSize(self, fontSize):
+        '''
+        Changes the label font size. Since the cached labels were rendered with the previous
+        font, the cache is invalidated.
+
+        :param fontSize: new font size
+        '''
+        if fontSize == self.fontSize:
+            return
+
+        self.fontSize = fontSize
+        self.font = pg.font.SysFont('arial', fontSize, False)
+        self.clear()
+
+    def clear(self):
+        self.labels.clear()
+
+    def getLabel(self, index):
+        '''
+        Returns the surface displaying the passed row or col index. The surface is rendered
+        only if it is not already in the cache.
+
+        :param index: 0 based row or col index
+
+        :return: pg.Surface
+        '''
+        labelKey = (index, self.fontSize)
+        label = self.labels.get(labelKey)
+
+        if label is not None:
+            self.labels.move_to_end(labelKey)
+            return label
+
+        if index < 10:
+            ident = '  '
+        elif index < 100:
+            ident = ' '
+        else:
+            ident = ''
+
+        label = self.font.render(ident + str(index), 1, AXIS_LABEL_COLOR_BLACK)
+        self.labels[labelKey] = label
+
+        if len(self.labels) > self.maxCachedLabelNumber:
+            # evicting the least recently used label
+            self.labels.popitem(last=False)
+
+        return label
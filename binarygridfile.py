@@ -0,0 +1,318 @@
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from cellgrid import PackedCellGrid
+
+BINARY_GRID_FILE_EXTENSION = '.grid'
+COMPRESSED_BINARY_GRID_FILE_EXTENSION = '.gridz'
+
+BINARY_GRID_FILE_MAGIC = b'DGRD'
+BINARY_GRID_FILE_VERSION = 1
+
+# header layout: magic, version, flags, dimX, dimY. The fields are little endian
+BINARY_GRID_FILE_HEADER_FORMAT = '<4sHHQQ'
+BINARY_GRID_FILE_HEADER_SIZE = struct.calcsize(BINARY_GRID_FILE_HEADER_FORMAT)
+
+# header flags
+FLAG_COMPRESSED = 0x1
+
+# zlib level used for the .gridz files. Level 6 compresses typical grids almost as well as
+# level 9 at a fraction of the cost
+COMPRESSION_LEVEL = 6
+
+# max number of packed bytes written at once, so that saving a memory mapped grid does not
+# require loading it entirely in memory
+WRITTEN_BAND_BYTE_NUMBER = 2 ** 24
+
+# size of the chunks read from a compressed grid file
+READ_CHUNK_BYTE_NUMBER = 2 ** 20
+
+class BinaryGridFile():
+    '''
+    This class reads/writes grid data from/to the DrawGrid binary grid file format. Each cell
+    value is stored as one bit, so that a grid file is 8 times smaller than the cell grid in
+    memory and 16 times smaller than the csv file.
+
+    The file starts with a fixed size header containing the format magic, the format version,
+    the flags and the grid dimensions. The cells follow, row after row, each row being bit packed
+    into (dimX + 7) // 8 bytes, the most significant bit of the first byte being the col 0 cell.
+
+    In a .grid file, the rows are stored uncompressed, so that any row can be accessed at a fixed
+    offset and the file can be memory mapped. In a .gridz file, the packed rows are compressed
+    with zlib.
+    '''
+    @staticmethod
+    def isBinaryGridFilename(filename):
+        '''
+        Returns True if the file extension of the passed filename selects the binary grid file
+        format, False if the file is a csv file.
+        '''
+        extension = os.path.splitext(filename)[1].lower()
+
+        return extension in (BINARY_GRID_FILE_EXTENSION, COMPRESSED_BINARY_GRID_FILE_EXTENSION)
+
+    @staticmethod
+    def isCompressedGridFilename(filename):
+        return os.path.splitext(filename)[1].lower() == COMPRESSED_BINARY_GRID_FILE_EXTENSION
+
+    @staticmethod
+    def computeRowByteNumber(dimX):
+        return (dimX + 7) // 8
+
+    @staticmethod
+    def readHeader(file):
+        '''
+        Reads and checks the header of the passed binary grid file.
+
+        :param file: binary file object positioned at the start of the file
+
+        :raise ValueError: if the file is not a binary grid file or has an unsupported version
+
+        :return: dimX, dimY, flags tuple
+        '''
+        header = file.read(BINARY_GRID_FILE_HEADER_SIZE)
+
+        if len(header) < BINARY_GRID_FILE_HEADER_SIZE:
+            raise ValueError('{} is not a binary grid file: truncated header'.format(file.name))
+
+        magic, version, flags, dimX, dimY = struct.unpack(BINARY_GRID_FILE_HEADER_FORMAT, header)
+
+        if magic != BINARY_GRID_FILE_MAGIC:
+            raise ValueError('{} is not a binary grid file: invalid magic {}'.format(file.name, magic))
+
+        if version > BINARY_GRID_FILE_VERSION:
+            raise ValueError('{} has unsupported binary grid file version {}'.format(file.name, version))
+
+        return dimX, dimY, flags
+
+    @staticmethod
+    def write(filename, cells):
+        '''
+        Writes the passed cell array into the passed file. The file is compressed if its
+        extension is .gridz.
+
+        :param filename: binary grid file name
+        :param cells: 2 dimensions uint8 array of 0 or 1 values
+        '''
+        BinaryGridFile.writeRowBatches(filename, cells.shape[1], [cells])
+
+    @staticmethod
+    def writeRowBatches(filename, dimX, cellRowBatches):
+        '''
+        Writes the passed batches of rows into the passed file, each batch being bit packed
+        just before being written. The batches can be produced by a generator, so that a grid
+        larger than the memory can be written.
+
+        :param filename: binary grid file name
+        :param dimX: 1 based horizontal dimension of the grid
+        :param cellRowBatches: iterable of (batch row number, dimX) uint8 arrays
+        '''
+        BinaryGridFile.writePackedRowBatches(filename, dimX, (np.packbits(cells, axis=1) for cells in cellRowBatches))
+
+    @staticmethod
+    def writePackedRows(filename, dimX, packedRows, replaceFile=True):
+        '''
+        Writes the passed bit packed rows into the passed file band by band, so that a memory
+        mapped grid is not loaded entirely in memory.
+
+        :param filename: binary grid file name
+        :param dimX: 1 based horizontal dimension of the grid
+        :param packedRows: (dimY, (dimX + 7) // 8) uint8 array or memory map
+        :param replaceFile: see writePackedRowBatches()
+        '''
+        bandRowNumber = max(WRITTEN_BAND_BYTE_NUMBER // max(packedRows.shape[1], 1), 1)
+        packedRowBands = (packedRows[bandRowStart:bandRowStart + bandRowNumber] for bandRowStart in range(0, packedRows.shape[0], bandRowNumber))
+
+        BinaryGridFile.writePackedRowBatches(filename, dimX, packedRowBands, replaceFile)
+
+    @staticmethod
+    def isMappedFile(packedRows, filename):
+        '''
+        Returns True if the passed packed rows are a memory map of the passed file.
+        '''
+        return isinstance(packedRows, np.memmap) and packedRows.filename is not None and \
+               os.path.abspath(filename) == os.path.abspath(packedRows.filename)
+
+    @staticmethod
+    def replaceMappedFile(cellGrid, filename):
+        '''
+        Replaces the passed file, which the passed PackedCellGrid maps, by the temporary file
+        written by writePackedRows() with replaceFile=False, and maps the new file. Since a
+        mapped file can not be replaced on Windows, the map is dropped first. The cells are
+        unchanged, the new file containing them.
+
+        :param cellGrid: PackedCellGrid mapping filename
+        :param filename: binary grid file name
+        '''
+        cellGrid.packedRows = None
+        os.replace(filename + '.tmp', filename)
+        cellGrid.packedRows = BinaryGridFile.mapCellGrid(filename).packedRows
+
+    @staticmethod
+    def writePackedRowBatches(filename, dimX, packedRowBatches, replaceFile=True):
+        '''
+        Writes the passed batches of bit packed rows into the passed file. The rows are written
+        into a temporary file which then replaces the passed file. This way, the file is never
+        left half written and a memory mapped grid can be saved into the file it maps. Since
+        the row number is only known once all the batches are written, the header is written
+        again at the end.
+
+        :param filename: binary grid file name
+        :param dimX: 1 based horizontal dimension of the grid
+        :param packedRowBatches: iterable of (batch row number, (dimX + 7) // 8) uint8 arrays
+        :param replaceFile: if False, the rows are left in the filename + '.tmp' temporary
+                            file, which the caller replaces the file with, for example by
+                            replaceMappedFile() if the batches are read from a map of the file
+        '''
+        flags = 0
+        compressor = None
+
+        if BinaryGridFile.isCompressedGridFilename(filename):
+            flags |= FLAG_COMPRESSED
+            compressor = zlib.compressobj(COMPRESSION_LEVEL)
+
+        dimY = 0
+        tmpFilename = filename + '.tmp'
+
+        with open(tmpFilename, 'wb') as file:
+            file.write(struct.pack(BINARY_GRID_FILE_HEADER_FORMAT, BINARY_GRID_FILE_MAGIC, BINARY_GRID_FILE_VERSION, flags, dimX, dimY))
+
+            for packedRowBatch in packedRowBatches:
+                dimY += packedRowBatch.shape[0]
+                packedBytes = np.ascontiguousarray(packedRowBatch).tobytes()
+
+                if compressor is not None:
+                    packedBytes = compressor.compress(packedBytes)
+
+                file.write(packedBytes)
+
+            if compressor is not None:
+                file.write(compressor.flush())
+
+            file.seek(0)
+            file.write(struct.pack(BINARY_GRID_FILE_HEADER_FORMAT, BINARY_GRID_FILE_MAGIC, BINARY_GRID_FILE_VERSION, flags, dimX, dimY))
+
+        if replaceFile:
+            os.replace(tmpFilename, filename)
+
+    @staticmethod
+    def read(filename, maxRowNumber=None):
+        '''
+        Reads the cells stored in the passed binary grid file.
+
+        :param filename: binary grid file name
+        :param maxRowNumber: if not None, the rows beyond maxRowNumber are not unpacked
+
+        :raise FileNotFoundError: if the file does not exist
+        :raise ValueError: if the file is not a valid binary grid file
+
+        :return: 2 dimensions uint8 array
+        '''
+        with open(filename, 'rb') as file:
+            dimX, dimY, flags = BinaryGridFile.readHeader(file)
+
+            if maxRowNumber is not None:
+                dimY = min(dimY, maxRowNumber)
+
+            cells = np.zeros((dimY, dimX), dtype=np.uint8)
+
+            for rowStart, cellRowBatch in BinaryGridFile.iterRowBatches(file, dimX, dimY, flags, max(dimY, 1)):
+                cells[rowStart:rowStart + cellRowBatch.shape[0]] = cellRowBatch
+
+        return cells
+
+    @staticmethod
+    def iterRowBatches(file, dimX, dimY, flags, batchRowNumber):
+        '''
+        Generator reading the cells of the passed binary grid file batch by batch, so that only
+        one batch of rows is in memory at a time.
+
+        :param file: binary file object positioned after the header (see readHeader())
+        :param dimX: 1 based horizontal dimension of the grid
+        :param dimY: number of rows to read, possibly smaller than the file row number
+        :param flags: header flags
+        :param batchRowNumber: max number of rows of a batch
+
+        :raise ValueError: if the file cell data are truncated
+
+        :return: yields (0 based row index of the first batch row, (batch row number, dimX)
+                 uint8 array) tuples
+        '''
+        rowByteNumber = BinaryGridFile.computeRowByteNumber(dimX)
+        decompressor = zlib.decompressobj() if flags & FLAG_COMPRESSED else None
+
+        for rowStart in range(0, dimY, batchRowNumber):
+            rowNumber = min(batchRowNumber, dimY - rowStart)
+            packedBytesSize = rowNumber * rowByteNumber
+
+            if decompressor is None:
+                packedBytes = file.read(packedBytesSize)
+            else:
+                # the excess rows are not even decompressed
+                packedBytes = BinaryGridFile.decompress(file, decompressor, packedBytesSize)
+
+            if len(packedBytes) < packedBytesSize:
+                raise ValueError('{} is not a valid binary grid file: truncated cell data'.format(file.name))
+
+            packedRowBatch = np.frombuffer(packedBytes, dtype=np.uint8).reshape(rowNumber, rowByteNumber)
+
+            yield rowStart, np.unpackbits(packedRowBatch, axis=1, count=dimX)
+
+    @staticmethod
+    def decompress(file, decompressor, size):
+        '''
+        Returns the next size decompressed bytes of the passed compressed file, reading the file
+        by chunks.
+        '''
+        decompressedChunks = []
+
+        while size > 0:
+            compressedBytes = decompressor.unconsumed_tail or file.read(READ_CHUNK_BYTE_NUMBER)
+
+            if not compressedBytes:
+                decompressedChunks.append(decompressor.flush()[:size])
+                break
+
+            decompressedChunk = decompressor.decompress(compressedBytes, size)
+            decompressedChunks.append(decompressedChunk)
+            size -= len(decompressedChunk)
+
+        return b''.join(decompressedChunks)
+
+    @staticmethod
+    def mapCellGrid(filename):
+        '''
+        Opens the passed uncompressed binary grid file as a memory mapped PackedCellGrid. Opening
+        does not read the cells. The rows are read by the operating system only when they are
+        accessed. The mapping is copy on write: the cell modifications are kept in memory and
+        the file is only modified when the grid is saved.
+
+        :param filename: .grid binary grid file name
+
+        :raise FileNotFoundError: if the file does not exist
+        :raise ValueError: if the file is not a valid uncompressed binary grid file
+
+        :return: PackedCellGrid
+        '''
+        with open(filename, 'rb') as file:
+            dimX, dimY, flags = BinaryGridFile.readHeader(file)
+            fileSize = os.fstat(file.fileno()).st_size
+
+        if flags & FLAG_COMPRESSED:
+            raise ValueError('{} is a compressed binary grid file which can not be memory mapped'.format(filename))
+
+        rowByteNumber = BinaryGridFile.computeRowByteNumber(dimX)
+
+        if fileSize < BINARY_GRID_FILE_HEADER_SIZE + dimY * rowByteNumber:
+            raise ValueError('{} is not a valid binary grid file: truncated cell data'.format(filename))
+
+        if dimY * rowByteNumber == 0:
+            # an empty region can not be mapped
+            return PackedCellGrid(dimX, dimY)
+
+        packedRows = np.memmap(filename, dtype=np.uint8, mode='c', offset=BINARY_GRID_FILE_HEADER_SIZE, shape=(dimY, rowByteNumber))
+
+        return PackedCellGrid(dimX, dimY, packedRows)
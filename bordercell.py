@@ -1,100 +1,53 @@
+import numpy as np
+
 from cell import Cell
-from settings import *
 
 class BorderCell(Cell):
     @staticmethod
-
-    def computeBorderCellCoordAndSize(gridView, cellRowOrColIndex, doComputeX):
+    def computeCellCoordsAndSizes(gridView, firstCellRowOrColIndex, endCellRowOrColIndex, doComputeX):
         '''
-        When drawing a cell on the gridView view, according to the gridView view position, a visible cell may be
-        have to be partially drawned if it is at the left side of the gridView view or at its right side.
-        The gridView view position is given by the parm currentGridXorYOffsetPx. For example, moving the gridView view
-        10 pixels to the right will be reflected with a value of -10 for currentGridXorYOffsetPx, which means
-        the underlying gridView matrix is shifted 10 pixels to the left.
-
-        A cell located precisely at the left side of the gridView view would be drawned entirely. But if the view
-        is shifted one pixel to the right (currentGridXorYOffsetPx == -1), the cell has to be partially drawned
-        since 1 pixel of its left part is now outside of the gridView view. Its top left x coordinate will be 20
-        (the gridView view margin size in pixels), but its size will be reduced by 1 pixel.
-
-        The method computes the cell top left x or y coordinate aswell as its size accounting for the fact the cell
-        may have to be partially drawned if part of the cell is before the gridView view left size or beyhound its right
-        side. Additionnally, the displayed or not gridView view margin is taken in consideration.
-
-        Note that the code of this method is commented regarding the horizontal dimension and its effect on the
-        x cell top left coordinate. In order to keep comments readable, their adaptation to handling the vertical
-        dimension (y) is left to the reader !
-
-        :param currentGridXorYOffsetPx: x or y gridView offset in pixels
-        :param borderIndependentCellXorYcoordPx: cell x or y coord as deducted from its location in the internal gridView
-                                           matrix
-        :param cellRowOrColIndex: index of current cell row or col in the internal gridView
-                                           matrix
-
-        :return: drawnedCellXorYcoordPx - drawned cell top left x or y pixel coordinate
-                 cellSizePx - size of current cell (square in fact)
+        Computes at once, in closed form, the drawn top left x or y coordinate and the drawn size
+        of all the cells whose col or row index is in [firstCellRowOrColIndex, endCellRowOrColIndex[.
+
+        A cell whose unclipped coordinate is before the gridView coord margin is clipped so that
+        it starts at the margin and its size is reduced accordingly. A cell which extends beyond
+        the gridView surface is clipped at the surface border. A cell which is not visible at all
+        gets a size of 0. The returned coordinates account for the gridView cell size offset.
+
+        Note that the code of this method is commented regarding the horizontal dimension. Its
+        adaptation to handling the vertical dimension (y) is left to the reader !
+
+        :param gridView: GridView whose cells are drawn
+        :param firstCellRowOrColIndex: index of the first cell row or col in the internal gridView
+                                       matrix
+        :param endCellRowOrColIndex: index following the last cell row or col
+        :param doComputeX: True to compute x coordinates and widths, False to compute y coordinates
+                           and heights
+
+        :return: drawnedCellXorYcoordsPx - int array of drawn cell top left x or y pixel coordinates
+                 cellSizesPx - int array of drawn cell sizes
         '''
-        cellSizePx = 0
-
         if doComputeX:
             currentGridXorYOffsetPx = gridView.gridOffsetXPx
-            borderIndependentCellXorYcoordPx = Cell.computeBorderIndependentCellXCoord(gridView, cellRowOrColIndex)
+            surfaceSizePx = gridView.surface.get_width()
         else:
             currentGridXorYOffsetPx = gridView.gridOffsetYPx
-            borderIndependentCellXorYcoordPx = Cell.computeBorderIndependentCellYCoord(gridView, cellRowOrColIndex)
-
-        drawnedCellXorYcoordPx = borderIndependentCellXorYcoordPx
-
-        if borderIndependentCellXorYcoordPx > 0:
-            # here, the current cell x coordinate is greater than the left gridView limit and so must be
-            # drawn entirely or partially ...
-            cellCoordOffset = gridView.gridCoordMarginSize - borderIndependentCellXorYcoordPx
-            if cellCoordOffset > 0:
-                if cellCoordOffset < gridView.gridCoordMarginSize:
-                    # here, we moved the gridView to the left to a point where the current active cell is partially
-                    # at the left of the col margin (gridView coord margin where the row/col numbers are displayed)
-                    cellSizePx = gridView.cellSize - cellCoordOffset
-                    drawnedCellXorYcoordPx = gridView.gridCoordMarginSize
-                    print(Cell.getExecInfo(gridView, cellRowOrColIndex, doComputeX))
-                else:
-                    # here, the current active cell is behond the gridView coord margin and is drawn entirely
-                    cellSizePx = gridView.cellSize
-                    print(Cell.getExecInfo(gridView, cellRowOrColIndex, doComputeX))
-            else:
-                print(Cell.getExecInfo(gridView, cellRowOrColIndex, doComputeX))
-                cellSizePx = gridView.cellSize
-        else:
-            # here, the current cell x coord is at the left of the left gridView limit
-            cellCoordOffset = gridView.gridCoordMarginSize + borderIndependentCellXorYcoordPx
-            if cellCoordOffset >= 0:
-                if cellCoordOffset <= gridView.gridCoordMarginSize:
-                    # here, the current active cell x coord is at the left of the left
-                    # gridView limit. But part or of the cell has to be drawn for the part
-                    # which is still at the right of the gridView coord margin
+            surfaceSizePx = gridView.surface.get_height()
 
-                    # the move offset must account for the number of columns already moved to the left ...
-                    offset = currentGridXorYOffsetPx - (GRID_LINE_WIDTH + gridView.cellSize) * cellRowOrColIndex
+        cellRowOrColIndexes = np.arange(firstCellRowOrColIndex, endCellRowOrColIndex)
 
-                    cellSizePx = gridView.cellSize - offset + GRID_LINE_WIDTH
-                    drawnedCellXorYcoordPx = gridView.gridCoordMarginSize
-                    print(Cell.getExecInfo(gridView, cellRowOrColIndex, doComputeX))
-                # else: this case is not possible since activeCellCoordOffset = gridView.gridCoordMarginSize + negative
-                # value
-            elif cellCoordOffset < 0:
-                if abs(cellCoordOffset) <= gridView.gridCoordMarginSize:
-                    # the move offset must account for the number of columns already moved to the left ...
-                    offset = currentGridXorYOffsetPx + (GRID_LINE_WIDTH + gridView.cellSize) * cellRowOrColIndex
+        # cell x coordinates as deducted from their location in the internal gridView matrix
+        borderIndependentCellXorYcoordsPx = gridView.gridCoordMarginSize + gridView.gridLineWidth - gridView.cellSizeOffset - \
+                                            currentGridXorYOffsetPx + (gridView.gridLineWidth + gridView.cellSize) * cellRowOrColIndexes
 
-                    cellSizePx = gridView.cellSize + offset + GRID_LINE_WIDTH
-                    drawnedCellXorYcoordPx = gridView.gridCoordMarginSize
-                    print(Cell.getExecInfo(gridView, cellRowOrColIndex, doComputeX))
-                else:
-                    # the move offset must account for the number of columns already moved to the left ...
-                    offset = currentGridXorYOffsetPx - (GRID_LINE_WIDTH + gridView.cellSize) * cellRowOrColIndex
+        # the cells partially at the left of the col margin start at the margin and the cells
+        # partially at the right of the surface end at the surface border
+        drawnedCellXorYcoordsPx = np.maximum(borderIndependentCellXorYcoordsPx, gridView.gridCoordMarginSize)
+        drawnedCellEndXorYcoordsPx = np.minimum(borderIndependentCellXorYcoordsPx + gridView.cellSize, surfaceSizePx)
+        cellSizesPx = np.maximum(drawnedCellEndXorYcoordsPx - drawnedCellXorYcoordsPx, 0)
 
-                    cellwidth = gridView.cellSize - offset + GRID_LINE_WIDTH
-                    cellSizePx = cellwidth
-                    drawnedCellXorYcoordPx = gridView.gridCoordMarginSize
-                    print(Cell.getExecInfo(gridView, cellRowOrColIndex, doComputeX))
+        if gridView.execTracer is not None and len(cellRowOrColIndexes) > 0 and \
+                borderIndependentCellXorYcoordsPx[0] < gridView.gridCoordMarginSize:
+            gridView.execTracer.traceCellComputation(gridView, firstCellRowOrColIndex, doComputeX)
 
-        return drawnedCellXorYcoordPx, cellSizePx
+        return drawnedCellXorYcoordsPx, cellSizesPx
@@ -0,0 +1,560 @@
+import numpy as np
+
+# size in cells of the square tiles a ChunkedCellGrid is made of
+DEFAULT_TILE_SIZE = 64
+
+# cell number per axis of an unbounded ChunkedCellGrid. It is not infinite so that the
+# pixel offsets of the grid view remain in the int64 range used by the NumPy computations
+UNBOUNDED_CELL_NUMBER = 2 ** 40
+
+# Cell storage alternatives, set by the 'Cell storage' configuration setting
+CELL_STORAGE_DENSE = 'dense'
+CELL_STORAGE_SPARSE = 'sparse'
+CELL_STORAGE_MAPPED = 'mapped'
+
+class CellGrid():
+    '''
+    This class stores the internal cell value matrix of the grid view. The cell values (0 for a
+    dead cell, 1 for an alive one) are kept in a two dimensional uint8 NumPy array whose shape
+    is (dimY, dimX), i.e. one byte per cell instead of one boxed Python int per cell.
+
+    The class keeps the grid[row][col] access semantics of the list of list matrix it
+    replaces, so that it can be indexed, compared and iterated the same way. In addition,
+    grid[row, col] and slices are supported since they are directly delegated to the
+    underlying array.
+    '''
+    def __init__(self, dimX, dimY, value=0):
+        '''
+        Creates a dimX x dimY cell grid whose cells are all set to value.
+
+        :param dimX: 1 based horizontal dimension (col number) of the grid
+        :param dimY: 1 based vertical dimension (row number) of the grid
+        :param value: must be 0 (dead) or 1 (alive)
+        '''
+        self.cells = np.full((dimY, dimX), value, dtype=np.uint8)
+
+    @staticmethod
+    def fromMatrix(matrix, requiredDimX=None, requiredDimY=None):
+        '''
+        Builds a CellGrid from the passed matrix (list of list, NumPy array or CellGrid). If
+        required dimensions are passed, the matrix data are truncated or completed with 0
+        values so that the returned grid is a requiredDimX x requiredDimY grid.
+
+        :param matrix: 2 dimensions list, array or CellGrid
+        :param requiredDimX: 1 based horizontal dimension of returned grid or None
+        :param requiredDimY: 1 based vertical dimension of returned grid or None
+
+        :return: new CellGrid instance
+        '''
+        data = np.asarray(matrix, dtype=np.uint8)
+
+        if data.size == 0:
+            data = np.zeros((0, 0), dtype=np.uint8)
+
+        if requiredDimX is None:
+            requiredDimX = data.shape[1]
+
+        if requiredDimY is None:
+            requiredDimY = data.shape[0]
+
+        cellGrid = CellGrid(requiredDimX, requiredDimY)
+        cellGrid.setWindow(0, 0, data)
+
+        return cellGrid
+
+    @property
+    def dimX(self):
+        return self.cells.shape[1]
+
+    @property
+    def dimY(self):
+        return self.cells.shape[0]
+
+    def getDataExtent(self):
+        '''
+        Returns the dimensions of the zone of the grid which contains data. For a dense grid,
+        this is the whole grid.
+
+        :return: dimX, dimY tuple
+        '''
+        return self.dimX, self.dimY
+
+    def getCell(self, row, col):
+        return self.cells[row, col]
+
+    def setCell(self, row, col, value):
+        self.cells[row, col] = value
+
+    def fill(self, value):
+        '''
+        Sets all the cells of the grid to value in one vectorized operation.
+
+        :param value: must be 0 (dead) or 1 (alive)
+        '''
+        self.cells.fill(value)
+
+    def clear(self):
+        self.fill(0)
+
+    def getWindow(self, rowStart, rowEnd, colStart, colEnd):
+        '''
+        Returns the cell values of the rectangular zone [rowStart, rowEnd[ x [colStart, colEnd[
+        as a two dimensional array. The zone is clipped to the grid dimensions. The returned
+        array is a view on the grid data and must not be modified by the caller.
+
+        :return: 2 dimensions uint8 array
+        '''
+        return self.cells[max(rowStart, 0):max(rowEnd, 0), max(colStart, 0):max(colEnd, 0)]
+
+    def setWindow(self, rowStart, colStart, data):
+        '''
+        Copies the passed two dimensional data into the grid, its top left cell being written
+        at position rowStart, colStart. The part of the data which falls outside of the grid
+        is ignored.
+
+        :param rowStart: 0 based row index of the top left written cell
+        :param colStart: 0 based col index of the top left written cell
+        :param data: 2 dimensions list or array
+        '''
+        data = np.asarray(data, dtype=np.uint8)
+        rowEnd = min(rowStart + data.shape[0], self.dimY)
+        colEnd = min(colStart + data.shape[1], self.dimX)
+
+        if rowEnd <= rowStart or colEnd <= colStart:
+            return
+
+        self.cells[rowStart:rowEnd, colStart:colEnd] = data[:rowEnd - rowStart, :colEnd - colStart]
+
+    def copy(self):
+        cellGrid = CellGrid(0, 0)
+        cellGrid.cells = self.cells.copy()
+
+        return cellGrid
+
+    def tolist(self):
+        return self.cells.tolist()
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self.cells
+
+        return self.cells.astype(dtype)
+
+    def __getitem__(self, key):
+        return self.cells[key]
+
+    def __setitem__(self, key, value):
+        self.cells[key] = value
+
+    def __len__(self):
+        return self.dimY
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __eq__(self, other):
+        '''
+        Enables comparing a CellGrid with another CellGrid, an array or a list of list matrix.
+        '''
+        try:
+            otherCells = np.asarray(other)
+        except ValueError:
+            # other is a ragged list of list
+            return False
+
+        return self.cells.shape == otherCells.shape and bool(np.array_equal(self.cells, otherCells))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'CellGrid(dimX={}, dimY={})'.format(self.dimX, self.dimY)
+
+
+class ChunkedCellGrid():
+    '''
+    This class is a sparse version of CellGrid intended for very large or unbounded grids whose
+    alive cell population is small. The grid is split into square tiles of tileSize x tileSize
+    cells stored as uint8 NumPy arrays in a dictionary keyed by (tile row, tile col). A tile
+    is only allocated when a non 0 value is written into it, so that empty zones of the grid
+    cost no memory.
+
+    ChunkedCellGrid offers the same interface as CellGrid, except that grid[row] returns
+    a copy of the row, so that cell values must be written with setCell(), grid[row, col] or
+    setWindow().
+    '''
+    def __init__(self, dimX=UNBOUNDED_CELL_NUMBER, dimY=UNBOUNDED_CELL_NUMBER, tileSize=DEFAULT_TILE_SIZE):
+        '''
+        Creates an empty (all cells 0) dimX x dimY sparse cell grid.
+
+        :param dimX: 1 based horizontal dimension (col number) of the grid
+        :param dimY: 1 based vertical dimension (row number) of the grid
+        :param tileSize: size in cells of the square tiles
+        '''
+        self.dimX = dimX
+        self.dimY = dimY
+        self.tileSize = tileSize
+        self.tiles = {}
+
+    def getDataExtent(self):
+        '''
+        Returns the dimensions of the zone of the grid which contains the allocated tiles,
+        i.e. the zone [0, dimX[ x [0, dimY[ outside of which all cells are 0.
+
+        :return: dimX, dimY tuple
+        '''
+        # the tile keys are copied since a loading thread can add tiles meanwhile
+        tileKeys = list(self.tiles)
+
+        if not tileKeys:
+            return 0, 0
+
+        dataDimX = (max(tileCol for _, tileCol in tileKeys) + 1) * self.tileSize
+        dataDimY = (max(tileRow for tileRow, _ in tileKeys) + 1) * self.tileSize
+
+        return min(dataDimX, self.dimX), min(dataDimY, self.dimY)
+
+    def getCell(self, row, col):
+        tile = self.tiles.get((row // self.tileSize, col // self.tileSize))
+
+        if tile is None:
+            return 0
+
+        return tile[row % self.tileSize, col % self.tileSize]
+
+    def setCell(self, row, col, value):
+        if not (0 <= row < self.dimY and 0 <= col < self.dimX):
+            raise IndexError('cell ({}, {}) is outside of the {} x {} grid'.format(row, col, self.dimX, self.dimY))
+
+        tileKey = (row // self.tileSize, col // self.tileSize)
+        tile = self.tiles.get(tileKey)
+
+        if tile is None:
+            if not value:
+                # writing 0 in a non allocated tile changes nothing
+                return
+
+            tile = np.zeros((self.tileSize, self.tileSize), dtype=np.uint8)
+            self.tiles[tileKey] = tile
+
+        tile[row % self.tileSize, col % self.tileSize] = value
+
+    def fill(self, value):
+        '''
+        Sets all the cells of the grid to value. Since filling a sparse grid with alive cells
+        would allocate all its tiles, only 0 is accepted.
+
+        :param value: must be 0 (dead)
+        '''
+        if value:
+            raise ValueError('a ChunkedCellGrid can only be filled with 0')
+
+        self.tiles.clear()
+
+    def clear(self):
+        self.fill(0)
+
+    def iterTileKeys(self, rowStart, rowEnd, colStart, colEnd):
+        '''
+        Returns the keys of the allocated tiles overlapping the zone [rowStart, rowEnd[ x
+        [colStart, colEnd[. Depending on which is the smallest, either the tiles covering the
+        zone or the allocated tiles are iterated. The allocated tiles are iterated on a copy of
+        the tile keys, since the grid view draws the grid while a loading thread adds tiles
+        to it (see GridView.startLoadGridData()).
+        '''
+        firstTileRow = rowStart // self.tileSize
+        endTileRow = (rowEnd - 1) // self.tileSize + 1
+        firstTileCol = colStart // self.tileSize
+        endTileCol = (colEnd - 1) // self.tileSize + 1
+
+        if (endTileRow - firstTileRow) * (endTileCol - firstTileCol) < len(self.tiles):
+            return [(tileRow, tileCol) for tileRow in range(firstTileRow, endTileRow)
+                                       for tileCol in range(firstTileCol, endTileCol)
+                                       if (tileRow, tileCol) in self.tiles]
+
+        return [(tileRow, tileCol) for tileRow, tileCol in list(self.tiles)
+                                   if firstTileRow <= tileRow < endTileRow and firstTileCol <= tileCol < endTileCol]
+
+    def getWindow(self, rowStart, rowEnd, colStart, colEnd):
+        '''
+        Returns the cell values of the rectangular zone [rowStart, rowEnd[ x [colStart, colEnd[
+        as a new two dimensional array. The zone is clipped to the grid dimensions.
+
+        :return: 2 dimensions uint8 array
+        '''
+        rowStart = max(rowStart, 0)
+        colStart = max(colStart, 0)
+        rowEnd = max(min(rowEnd, self.dimY), rowStart)
+        colEnd = max(min(colEnd, self.dimX), colStart)
+        window = np.zeros((rowEnd - rowStart, colEnd - colStart), dtype=np.uint8)
+
+        if window.size == 0:
+            return window
+
+        for tileRow, tileCol in self.iterTileKeys(rowStart, rowEnd, colStart, colEnd):
+            tileRowStart = tileRow * self.tileSize
+            tileColStart = tileCol * self.tileSize
+
+            # intersection of the tile and the window in grid coordinates
+            copyRowStart = max(rowStart, tileRowStart)
+            copyRowEnd = min(rowEnd, tileRowStart + self.tileSize)
+            copyColStart = max(colStart, tileColStart)
+            copyColEnd = min(colEnd, tileColStart + self.tileSize)
+
+            window[copyRowStart - rowStart:copyRowEnd - rowStart, copyColStart - colStart:copyColEnd - colStart] = \
+                self.tiles[(tileRow, tileCol)][copyRowStart - tileRowStart:copyRowEnd - tileRowStart,
+                                               copyColStart - tileColStart:copyColEnd - tileColStart]
+
+        return window
+
+    def setWindow(self, rowStart, colStart, data):
+        '''
+        Copies the passed two dimensional data into the grid, its top left cell being written
+        at position rowStart, colStart. The part of the data which falls outside of the grid
+        is ignored. Tiles receiving only 0 values are not allocated.
+
+        :param rowStart: 0 based row index of the top left written cell
+        :param colStart: 0 based col index of the top left written cell
+        :param data: 2 dimensions list or array
+        '''
+        data = np.asarray(data, dtype=np.uint8)
+        rowEnd = min(rowStart + data.shape[0], self.dimY)
+        colEnd = min(colStart + data.shape[1], self.dimX)
+
+        if rowEnd <= rowStart or colEnd <= colStart:
+            return
+
+        for tileRow in range(rowStart // self.tileSize, (rowEnd - 1) // self.tileSize + 1):
+            tileRowStart = tileRow * self.tileSize
+            copyRowStart = max(rowStart, tileRowStart)
+            copyRowEnd = min(rowEnd, tileRowStart + self.tileSize)
+
+            for tileCol in range(colStart // self.tileSize, (colEnd - 1) // self.tileSize + 1):
+                tileColStart = tileCol * self.tileSize
+                copyColStart = max(colStart, tileColStart)
+                copyColEnd = min(colEnd, tileColStart + self.tileSize)
+
+                dataPart = data[copyRowStart - rowStart:copyRowEnd - rowStart, copyColStart - colStart:copyColEnd - colStart]
+                tile = self.tiles.get((tileRow, tileCol))
+
+                if tile is None:
+                    if not dataPart.any():
+                        continue
+
+                    tile = np.zeros((self.tileSize, self.tileSize), dtype=np.uint8)
+                    self.tiles[(tileRow, tileCol)] = tile
+
+                tile[copyRowStart - tileRowStart:copyRowEnd - tileRowStart,
+                     copyColStart - tileColStart:copyColEnd - tileColStart] = dataPart
+
+    def copy(self):
+        cellGrid = ChunkedCellGrid(self.dimX, self.dimY, self.tileSize)
+        cellGrid.tiles = {tileKey: tile.copy() for tileKey, tile in list(self.tiles.items())}
+
+        return cellGrid
+
+    def tolist(self):
+        return np.asarray(self).tolist()
+
+    def __array__(self, dtype=None, copy=None):
+        '''
+        Returns the data zone of the grid (see getDataExtent()) as a dense array.
+        '''
+        dataDimX, dataDimY = self.getDataExtent()
+        cells = self.getWindow(0, dataDimY, 0, dataDimX)
+
+        if dtype is None:
+            return cells
+
+        return cells.astype(dtype)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            row, col = key
+            return self.getCell(row, col)
+
+        # returning a copy of the row restricted to the data zone
+        return self.getWindow(key, key + 1, 0, self.getDataExtent()[0])[0]
+
+    def __setitem__(self, key, value):
+        row, col = key
+        self.setCell(row, col, value)
+
+    def __len__(self):
+        return self.dimY
+
+    def __eq__(self, other):
+        try:
+            otherCells = np.asarray(other)
+        except ValueError:
+            return False
+
+        if otherCells.ndim != 2:
+            return False
+
+        # the cells outside of the other matrix must all be 0
+        dataDimX, dataDimY = self.getDataExtent()
+        compareDimX = max(dataDimX, otherCells.shape[1])
+        compareDimY = max(dataDimY, otherCells.shape[0])
+        paddedOtherCells = np.zeros((compareDimY, compareDimX), dtype=np.uint8)
+        paddedOtherCells[:otherCells.shape[0], :otherCells.shape[1]] = otherCells
+
+        return bool(np.array_equal(self.getWindow(0, compareDimY, 0, compareDimX), paddedOtherCells))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'ChunkedCellGrid(dimX={}, dimY={}, tileNumber={})'.format(self.dimX, self.dimY, len(self.tiles))
+
+
+class PackedCellGrid():
+    '''
+    This class stores the cell values as bits, each row of dimX cells being packed into
+    (dimX + 7) // 8 bytes, the most significant bit of the first byte being the col 0 cell.
+    This is the row layout of the binary grid files, so that the packed rows can be a
+    memory mapped .grid file (see BinaryGridFile.mapCellGrid()). In this case, the operating
+    system only reads the rows which are accessed, i.e. the rows the grid view draws, and
+    opening a huge grid costs nothing.
+
+    PackedCellGrid offers the same interface as CellGrid, except that grid[row] returns a copy
+    of the row, so that cell values must be written with setCell(), grid[row, col] or
+    setWindow().
+    '''
+    def __init__(self, dimX, dimY, packedRows=None):
+        '''
+        Creates a dimX x dimY packed cell grid.
+
+        :param dimX: 1 based horizontal dimension (col number) of the grid
+        :param dimY: 1 based vertical dimension (row number) of the grid
+        :param packedRows: (dimY, (dimX + 7) // 8) uint8 array or memory map containing the
+                           packed rows. If None, an array of dead cells is allocated
+        '''
+        self.dimX = dimX
+        self.dimY = dimY
+
+        if packedRows is None:
+            packedRows = np.zeros((dimY, (dimX + 7) // 8), dtype=np.uint8)
+
+        self.packedRows = packedRows
+
+    def getDataExtent(self):
+        return self.dimX, self.dimY
+
+    def isMapped(self):
+        return isinstance(self.packedRows, np.memmap)
+
+    def getCell(self, row, col):
+        return (self.packedRows[row, col >> 3] >> (7 - (col & 7))) & 1
+
+    def setCell(self, row, col, value):
+        if not (0 <= row < self.dimY and 0 <= col < self.dimX):
+            raise IndexError('cell ({}, {}) is outside of the {} x {} grid'.format(row, col, self.dimX, self.dimY))
+
+        bitMask = 0x80 >> (col & 7)
+
+        if value:
+            self.packedRows[row, col >> 3] |= bitMask
+        else:
+            self.packedRows[row, col >> 3] &= ~bitMask & 0xFF
+
+    def fill(self, value):
+        '''
+        Sets all the cells of the grid to value. The padding bits of the last byte of each row
+        are set too, which is harmless since they are never unpacked.
+
+        :param value: must be 0 (dead) or 1 (alive)
+        '''
+        self.packedRows[:] = 0xFF if value else 0
+
+    def clear(self):
+        self.fill(0)
+
+    def getWindow(self, rowStart, rowEnd, colStart, colEnd):
+        '''
+        Returns the cell values of the rectangular zone [rowStart, rowEnd[ x [colStart, colEnd[
+        as a new two dimensional array. The zone is clipped to the grid dimensions. Only the
+        packed bytes covering the zone are read and unpacked.
+
+        :return: 2 dimensions uint8 array
+        '''
+        rowStart = max(rowStart, 0)
+        colStart = max(colStart, 0)
+        rowEnd = max(min(rowEnd, self.dimY), rowStart)
+        colEnd = max(min(colEnd, self.dimX), colStart)
+
+        if rowEnd == rowStart or colEnd == colStart:
+            return np.zeros((rowEnd - rowStart, colEnd - colStart), dtype=np.uint8)
+
+        firstByte = colStart >> 3
+        unpackedCells = np.unpackbits(self.packedRows[rowStart:rowEnd, firstByte:((colEnd - 1) >> 3) + 1], axis=1)
+        firstBit = colStart - (firstByte << 3)
+
+        return unpackedCells[:, firstBit:firstBit + colEnd - colStart]
+
+    def setWindow(self, rowStart, colStart, data):
+        '''
+        Copies the passed two dimensional data into the grid, its top left cell being written
+        at position rowStart, colStart. The part of the data which falls outside of the grid
+        is ignored. Only the packed bytes covering the written zone are modified.
+
+        :param rowStart: 0 based row index of the top left written cell
+        :param colStart: 0 based col index of the top left written cell
+        :param data: 2 dimensions list or array
+        '''
+        data = np.asarray(data, dtype=np.uint8)
+        rowEnd = min(rowStart + data.shape[0], self.dimY)
+        colEnd = min(colStart + data.shape[1], self.dimX)
+
+        if rowEnd <= rowStart or colEnd <= colStart:
+            return
+
+        # the partially written bytes at the zone borders are unpacked, completed and repacked
+        firstByte = colStart >> 3
+        endByte = ((colEnd - 1) >> 3) + 1
+        unpackedCells = np.unpackbits(self.packedRows[rowStart:rowEnd, firstByte:endByte], axis=1)
+        firstBit = colStart - (firstByte << 3)
+        unpackedCells[:, firstBit:firstBit + colEnd - colStart] = data[:rowEnd - rowStart, :colEnd - colStart]
+        self.packedRows[rowStart:rowEnd, firstByte:endByte] = np.packbits(unpackedCells, axis=1)
+
+    def copy(self):
+        '''
+        Returns an in memory copy of the grid, even if the grid is memory mapped.
+        '''
+        return PackedCellGrid(self.dimX, self.dimY, np.array(self.packedRows))
+
+    def tolist(self):
+        return np.asarray(self).tolist()
+
+    def __array__(self, dtype=None, copy=None):
+        cells = self.getWindow(0, self.dimY, 0, self.dimX)
+
+        if dtype is None:
+            return cells
+
+        return cells.astype(dtype)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            row, col = key
+            return self.getCell(row, col)
+
+        return self.getWindow(key, key + 1, 0, self.dimX)[0]
+
+    def __setitem__(self, key, value):
+        row, col = key
+        self.setCell(row, col, value)
+
+    def __len__(self):
+        return self.dimY
+
+    def __eq__(self, other):
+        try:
+            otherCells = np.asarray(other)
+        except ValueError:
+            return False
+
+        return (self.dimY, self.dimX) == otherCells.shape and bool(np.array_equal(np.asarray(self), otherCells))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'PackedCellGrid(dimX={}, dimY={})'.format(self.dimX, self.dimY)
@@ -78,9 +78,54 @@ class ConfigurationManager:
     CONFIG_KEY_GRID_MOVE_INCREMENT = 'Grid move increment'
     DEFAULT_GRID_MOVE_INCREMENT = '1'
 
+    CONFIG_KEY_EXEC_TRACE = 'Execution trace'
+    DEFAULT_EXEC_TRACE = 'False'
+
     CONFIG_KEY_LOAD_AT_START_PATH_FILENAME = 'loadatstartpathfilename'
     DEFAULT_LOAD_AT_START_PATH_FILENAME = 'griddata.csv'
 
+    # dense: the cells are stored in a grid sized to the grid view pixel dimensions.
+    # sparse: the cells are stored in tiles allocated on first write, which enables
+    # editing very large grids whose alive cell population is small.
+    # mapped: the cells of the .grid binary grid file are memory mapped
+    CONFIG_KEY_CELL_STORAGE = 'Cell storage'
+    DEFAULT_CELL_STORAGE = 'dense'
+
+    CONFIG_KEY_SPARSE_GRID_CELL_NUMBER = 'Sparse grid cell number'
+    DEFAULT_SPARSE_GRID_CELL_NUMBER = '1000000'
+
+    CONFIG_KEY_AUTOSAVE_INTERVAL = 'Autosave interval'
+    DEFAULT_AUTOSAVE_INTERVAL = '300'
+
+    CONFIG_KEY_EDIT_JOURNAL = 'Edit journal'
+    DEFAULT_EDIT_JOURNAL = 'False'
+
+    CONFIG_KEY_PATTERN_DIRECTORY = 'Pattern directory'
+    DEFAULT_PATTERN_DIRECTORY = '.'
+
+    CONFIG_KEY_LIFE_RULE = 'Life rule'
+    DEFAULT_LIFE_RULE = 'B3/S23'
+
+    CONFIG_KEY_LIFE_EDGES = 'Life edges'
+    DEFAULT_LIFE_EDGES = 'bounded'
+
+    # vectorized: each generation is computed on the cell grid. hashlife: the cells are
+    # evolved in a HashLife quadtree, 2 ** HashLife step exponent generations at a time
+    CONFIG_KEY_LIFE_ENGINE = 'Life engine'
+    DEFAULT_LIFE_ENGINE = 'vectorized'
+
+    CONFIG_KEY_HASHLIFE_STEP_EXPONENT = 'HashLife step exponent'
+    DEFAULT_HASHLIFE_STEP_EXPONENT = '0'
+
+    # number of threads computing the generations. 0 means one thread per CPU core
+    CONFIG_KEY_LIFE_WORKER_NUMBER = 'Life worker number'
+    DEFAULT_LIFE_WORKER_NUMBER = '0'
+
+    # generations computed per second while the cells evolve, independently of the frame
+    # rate. 0 means as many generations as fit in each frame
+    CONFIG_KEY_SIMULATION_STEP_RATE = 'Simulation step rate'
+    DEFAULT_SIMULATION_STEP_RATE = '0'
+
     def __init__(self, filename):
         self.config = ConfigObj(filename)
         self._updated = False
@@ -148,6 +193,12 @@ class ConfigurationManager:
             self.__gridMoveIncrement = self.DEFAULT_GRID_MOVE_INCREMENT
             self._updated = True
 
+        try:
+            self.__execTrace = self.config[self.CONFIG_SECTION_VIEW_LAYOUT][self.CONFIG_KEY_EXEC_TRACE]
+        except KeyError:
+            self.__execTrace = self.DEFAULT_EXEC_TRACE
+            self._updated = True
+
         try:
             self.__activeCellColor = self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_ACTIVE_CELL_COLOR]
         except KeyError:
@@ -176,6 +227,72 @@ class ConfigurationManager:
             self.__loadAtStartPathFilename = self.DEFAULT_LOAD_AT_START_PATH_FILENAME
             self._updated = True
 
+        try:
+            self.__cellStorage = self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_CELL_STORAGE]
+        except KeyError:
+            self.__cellStorage = self.DEFAULT_CELL_STORAGE
+            self._updated = True
+
+        try:
+            self.__sparseGridCellNumber = self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_SPARSE_GRID_CELL_NUMBER]
+        except KeyError:
+            self.__sparseGridCellNumber = self.DEFAULT_SPARSE_GRID_CELL_NUMBER
+            self._updated = True
+
+        try:
+            self.__autosaveInterval = self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_AUTOSAVE_INTERVAL]
+        except KeyError:
+            self.__autosaveInterval = self.DEFAULT_AUTOSAVE_INTERVAL
+            self._updated = True
+
+        try:
+            self.__editJournal = self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_EDIT_JOURNAL]
+        except KeyError:
+            self.__editJournal = self.DEFAULT_EDIT_JOURNAL
+            self._updated = True
+
+        try:
+            self.__patternDirectory = self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_PATTERN_DIRECTORY]
+        except KeyError:
+            self.__patternDirectory = self.DEFAULT_PATTERN_DIRECTORY
+            self._updated = True
+
+        try:
+            self.__lifeRule = self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_LIFE_RULE]
+        except KeyError:
+            self.__lifeRule = self.DEFAULT_LIFE_RULE
+            self._updated = True
+
+        try:
+            self.__lifeEdges = self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_LIFE_EDGES]
+        except KeyError:
+            self.__lifeEdges = self.DEFAULT_LIFE_EDGES
+            self._updated = True
+
+        try:
+            self.__lifeEngine = self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_LIFE_ENGINE]
+        except KeyError:
+            self.__lifeEngine = self.DEFAULT_LIFE_ENGINE
+            self._updated = True
+
+        try:
+            self.__hashLifeStepExponent = self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_HASHLIFE_STEP_EXPONENT]
+        except KeyError:
+            self.__hashLifeStepExponent = self.DEFAULT_HASHLIFE_STEP_EXPONENT
+            self._updated = True
+
+        try:
+            self.__lifeWorkerNumber = self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_LIFE_WORKER_NUMBER]
+        except KeyError:
+            self.__lifeWorkerNumber = self.DEFAULT_LIFE_WORKER_NUMBER
+            self._updated = True
+
+        try:
+            self.__simulationStepRate = self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_SIMULATION_STEP_RATE]
+        except KeyError:
+            self.__simulationStepRate = self.DEFAULT_SIMULATION_STEP_RATE
+            self._updated = True
+
 
         self.storeConfig() #will save config file in case one config key raised an exception
 
@@ -205,11 +322,23 @@ class ConfigurationManager:
 
         self.activeCellColor = self.DEFAULT_ACTIVE_CELL_COLOR
         self.loadAtStartPathFilename = self.DEFAULT_LOAD_AT_START_PATH_FILENAME
+        self.cellStorage = self.DEFAULT_CELL_STORAGE
+        self.sparseGridCellNumber = self.DEFAULT_SPARSE_GRID_CELL_NUMBER
+        self.autosaveInterval = self.DEFAULT_AUTOSAVE_INTERVAL
+        self.editJournal = self.DEFAULT_EDIT_JOURNAL
+        self.patternDirectory = self.DEFAULT_PATTERN_DIRECTORY
+        self.lifeRule = self.DEFAULT_LIFE_RULE
+        self.lifeEdges = self.DEFAULT_LIFE_EDGES
+        self.lifeEngine = self.DEFAULT_LIFE_ENGINE
+        self.hashLifeStepExponent = self.DEFAULT_HASHLIFE_STEP_EXPONENT
+        self.lifeWorkerNumber = self.DEFAULT_LIFE_WORKER_NUMBER
+        self.simulationStepRate = self.DEFAULT_SIMULATION_STEP_RATE
         self.fps = self.DEFAULT_FPS
         self.gridCoordMarginHideCellSizeLimit = self.DEFAULT_COORD_MARGIN_HIDE_CELL_SIZE_LIMIT
         self.gridCoordMarginSize = self.DEFAULT_GRID_COORD_MARGIN_SIZE
         self.gridAxisFontSize = self.DEFAULT_GRID_AXIS_FONT_SIZE
         self.gridMoveIncrement = self.DEFAULT_GRID_MOVE_INCREMENT
+        self.execTrace = self.DEFAULT_EXEC_TRACE
         self._updated = True
 
         self.storeConfig()
@@ -265,6 +394,130 @@ class ConfigurationManager:
         self._updated = True
 
 
+    @property
+    def cellStorage(self):
+        '''
+        Returns 'dense', 'sparse' or 'mapped'.
+        '''
+        return self.__cellStorage.strip().lower()
+
+    @cellStorage.setter
+    def cellStorage(self, cellStorageStr):
+        self.__cellStorage = cellStorageStr
+        self._updated = True
+
+
+    @property
+    def sparseGridCellNumber(self):
+        '''
+        Returns the horizontal and vertical cell number of a sparse grid. 0 means that the
+        sparse grid is unbounded.
+        '''
+        return int(self.__sparseGridCellNumber)
+
+    @sparseGridCellNumber.setter
+    def sparseGridCellNumber(self, sparseGridCellNumberStr):
+        self.__sparseGridCellNumber = sparseGridCellNumberStr
+        self._updated = True
+
+
+    @property
+    def autosaveInterval(self):
+        '''
+        Returns the number of seconds between two automatic grid data saves. 0 means that
+        autosave is disabled.
+        '''
+        return int(self.__autosaveInterval)
+
+    @autosaveInterval.setter
+    def autosaveInterval(self, autosaveIntervalStr):
+        self.__autosaveInterval = autosaveIntervalStr
+        self._updated = True
+
+
+    @property
+    def editJournal(self):
+        '''
+        Returns True if the cell edits are persisted in the edit journal.
+        '''
+        return str(self.__editJournal).lower() == 'true'
+
+    @editJournal.setter
+    def editJournal(self, editJournalStr):
+        self.__editJournal = str(editJournalStr)
+        self._updated = True
+
+
+    @property
+    def patternDirectory(self):
+        return self.__patternDirectory
+
+    @patternDirectory.setter
+    def patternDirectory(self, patternDirectoryStr):
+        self.__patternDirectory = patternDirectoryStr
+        self._updated = True
+
+
+    @property
+    def lifeRule(self):
+        return self.__lifeRule
+
+    @lifeRule.setter
+    def lifeRule(self, lifeRuleStr):
+        self.__lifeRule = lifeRuleStr
+        self._updated = True
+
+
+    @property
+    def lifeEdges(self):
+        return self.__lifeEdges
+
+    @lifeEdges.setter
+    def lifeEdges(self, lifeEdgesStr):
+        self.__lifeEdges = lifeEdgesStr
+        self._updated = True
+
+
+    @property
+    def lifeEngine(self):
+        return self.__lifeEngine
+
+    @lifeEngine.setter
+    def lifeEngine(self, lifeEngineStr):
+        self.__lifeEngine = lifeEngineStr
+        self._updated = True
+
+
+    @property
+    def hashLifeStepExponent(self):
+        return int(self.__hashLifeStepExponent)
+
+    @hashLifeStepExponent.setter
+    def hashLifeStepExponent(self, hashLifeStepExponentStr):
+        self.__hashLifeStepExponent = hashLifeStepExponentStr
+        self._updated = True
+
+
+    @property
+    def lifeWorkerNumber(self):
+        return int(self.__lifeWorkerNumber)
+
+    @lifeWorkerNumber.setter
+    def lifeWorkerNumber(self, lifeWorkerNumberStr):
+        self.__lifeWorkerNumber = lifeWorkerNumberStr
+        self._updated = True
+
+
+    @property
+    def simulationStepRate(self):
+        return int(self.__simulationStepRate)
+
+    @simulationStepRate.setter
+    def simulationStepRate(self, simulationStepRateStr):
+        self.__simulationStepRate = simulationStepRateStr
+        self._updated = True
+
+
     @property
     def fps(self):
         return int(self.__fps)
@@ -374,6 +627,19 @@ class ConfigurationManager:
         self._updated = True
 
 
+    @property
+    def execTrace(self):
+        '''
+        Returns True if the execution trace is enabled.
+        '''
+        return str(self.__execTrace).lower() == 'true'
+
+    @execTrace.setter
+    def execTrace(self, execTraceStr):
+        self.__execTrace = str(execTraceStr)
+        self._updated = True
+
+
     def storeConfig(self):
         if not self._updated:
             return
@@ -382,6 +648,17 @@ class ConfigurationManager:
         self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_GRID_LINE_WIDTH_TUPLE] = self.__gridLineWidthTuple
         self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_CELL_SIZE] = self.__defaultCellSize
         self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_LOAD_AT_START_PATH_FILENAME] = self.__loadAtStartPathFilename
+        self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_CELL_STORAGE] = self.__cellStorage
+        self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_SPARSE_GRID_CELL_NUMBER] = self.__sparseGridCellNumber
+        self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_AUTOSAVE_INTERVAL] = self.__autosaveInterval
+        self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_EDIT_JOURNAL] = self.__editJournal
+        self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_PATTERN_DIRECTORY] = self.__patternDirectory
+        self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_LIFE_RULE] = self.__lifeRule
+        self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_LIFE_EDGES] = self.__lifeEdges
+        self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_LIFE_ENGINE] = self.__lifeEngine
+        self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_HASHLIFE_STEP_EXPONENT] = self.__hashLifeStepExponent
+        self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_LIFE_WORKER_NUMBER] = self.__lifeWorkerNumber
+        self.config[self.CONFIG_SECTION_GRID_LAYOUT][self.CONFIG_KEY_SIMULATION_STEP_RATE] = self.__simulationStepRate
         self.config[self.CONFIG_SECTION_VIEW_LAYOUT][self.CONFIG_KEY_WINDOW_TITLE] = self.__windowTitle
         self.config[self.CONFIG_SECTION_VIEW_LAYOUT][self.CONFIG_KEY_WINDOW_LOCATION] = self.__windowLocation
         self.config[self.CONFIG_SECTION_VIEW_LAYOUT][self.CONFIG_KEY_GRID_WIDTH] = self.__gridWidth
@@ -391,6 +668,7 @@ class ConfigurationManager:
         self.config[self.CONFIG_SECTION_VIEW_LAYOUT][self.CONFIG_KEY_GRID_COORD_MARGIN_SIZE] = self.__gridCoordMarginSize
         self.config[self.CONFIG_SECTION_VIEW_LAYOUT][self.CONFIG_KEY_GRID_AXIS_FONT_SIZE] = self.__gridAxisFontSize
         self.config[self.CONFIG_SECTION_VIEW_LAYOUT][self.CONFIG_KEY_GRID_MOVE_INCREMENT] = self.__gridMoveIncrement
+        self.config[self.CONFIG_SECTION_VIEW_LAYOUT][self.CONFIG_KEY_EXEC_TRACE] = self.__execTrace
 
         self.addCommentsToIniFile()
 
@@ -420,6 +698,11 @@ class ConfigurationManager:
             self.CONFIG_KEY_GRID_COORD_MARGIN_SIZE: [""],
             self.CONFIG_KEY_GRID_AXIS_FONT_SIZE: [""],
             self.CONFIG_KEY_GRID_MOVE_INCREMENT: [""],
+            self.CONFIG_KEY_EXEC_TRACE: ["",
+                                         self.CONFIG_KEY_EXEC_TRACE + " explanation:",
+                                         "If True, the grid view border cell computations are traced on the",
+                                         "console. Since tracing slows down drawing, keep it False unless",
+                                         "debugging"],
         }
 
         # add inline comments for each parm in the view layout section
@@ -433,6 +716,7 @@ class ConfigurationManager:
             self.CONFIG_KEY_GRID_COORD_MARGIN_SIZE: "value in pixel(s)",
             self.CONFIG_KEY_GRID_AXIS_FONT_SIZE: None,
             self.CONFIG_KEY_GRID_MOVE_INCREMENT: "value in pixel(s)",
+            self.CONFIG_KEY_EXEC_TRACE: "True or False",
         }
 
         # add empty comment before grid layout section which translates into a blank line before the section tag
@@ -462,7 +746,56 @@ class ConfigurationManager:
                                                 "GREEN = (0, 255, 0)",
                                                 "BLUE = (0, 0, 255)",
                                                 "YELLOW = (255, 255, 0)"],
-            self.CONFIG_KEY_LOAD_AT_START_PATH_FILENAME: [""],
+            self.CONFIG_KEY_LOAD_AT_START_PATH_FILENAME: ["",
+                                                          self.CONFIG_KEY_LOAD_AT_START_PATH_FILENAME + " explanation:",
+                                                          "The file extension selects the grid data file format. .grid: binary",
+                                                          "grid file, .gridz: compressed binary grid file. Any other extension,",
+                                                          "like .csv: tab separated text file"],
+            self.CONFIG_KEY_CELL_STORAGE: ["",
+                                           self.CONFIG_KEY_CELL_STORAGE + " explanation:",
+                                           "dense: the cells are stored in a grid sized to the grid width and height.",
+                                           "sparse: the cells are stored in tiles allocated when a cell is set, which",
+                                           "enables editing very large grids whose alive cell population is small.",
+                                           "mapped: the .grid binary grid file is memory mapped, so that opening it is",
+                                           "instantaneous and only the displayed rows are read. The grid has the file",
+                                           "dimensions"],
+            self.CONFIG_KEY_SPARSE_GRID_CELL_NUMBER: [""],
+            self.CONFIG_KEY_AUTOSAVE_INTERVAL: ["",
+                                                self.CONFIG_KEY_AUTOSAVE_INTERVAL + " explanation:",
+                                                "The grid data are periodically saved in the background into the autosave",
+                                                "file, whose name is the loadatstartpathfilename name followed by _autosave.",
+                                                "0 disables autosave"],
+            self.CONFIG_KEY_EDIT_JOURNAL: ["",
+                                           self.CONFIG_KEY_EDIT_JOURNAL + " explanation:",
+                                           "If True, each cell edit is immediately appended to the journal file, whose",
+                                           "name is the loadatstartpathfilename name followed by .journal. The journal",
+                                           "is merged into the grid data file when it becomes big and on quit, without",
+                                           "asking. A journal left by a crash is replayed when the grid data are loaded"],
+            self.CONFIG_KEY_PATTERN_DIRECTORY: ["",
+                                                self.CONFIG_KEY_PATTERN_DIRECTORY + " explanation:",
+                                                "Directory containing the pattern files, named pattern_<pattern name>.csv.",
+                                                "P selects the next pattern and the right mouse button stamps it on the grid"],
+            self.CONFIG_KEY_LIFE_RULE: ["",
+                                        self.CONFIG_KEY_LIFE_RULE + " explanation:",
+                                        "Rule of the cell evolution started and stopped with the space key, N computing",
+                                        "a single generation. B3/S23: a dead cell with 3 alive neighbors is born and an",
+                                        "alive cell with 2 or 3 alive neighbors survives (Conway's Game of Life)"],
+            self.CONFIG_KEY_LIFE_EDGES: [""],
+            self.CONFIG_KEY_LIFE_ENGINE: ["",
+                                          self.CONFIG_KEY_LIFE_ENGINE + " explanation:",
+                                          "vectorized: each generation is computed on the whole cell grid.",
+                                          "hashlife: the cells are evolved in a HashLife quadtree which skips",
+                                          "2 ** HashLife step exponent generations at a time. The HashLife universe",
+                                          "is unbounded: the Life edges setting is ignored"],
+            self.CONFIG_KEY_HASHLIFE_STEP_EXPONENT: [""],
+            self.CONFIG_KEY_LIFE_WORKER_NUMBER: ["",
+                                                 self.CONFIG_KEY_LIFE_WORKER_NUMBER + " explanation:",
+                                                 "Number of threads computing the bands of rows of a generation",
+                                                 "with the vectorized Life engine"],
+            self.CONFIG_KEY_SIMULATION_STEP_RATE: ["",
+                                                   self.CONFIG_KEY_SIMULATION_STEP_RATE + " explanation:",
+                                                   "Generations computed per second while the cells evolve, whatever",
+                                                   "the frames per second. 0 means as many generations as fit in a frame"],
         }
 
         # add inline comments for each parm in the grid layout section
@@ -471,6 +804,17 @@ class ConfigurationManager:
             self.CONFIG_KEY_GRID_LINE_WIDTH_TUPLE: "value in pixel(s)",
             self.CONFIG_KEY_ACTIVE_CELL_COLOR: None,
             self.CONFIG_KEY_LOAD_AT_START_PATH_FILENAME: None,
+            self.CONFIG_KEY_CELL_STORAGE: "dense, sparse or mapped",
+            self.CONFIG_KEY_SPARSE_GRID_CELL_NUMBER: "horizontal and vertical cell number. 0 means unbounded",
+            self.CONFIG_KEY_AUTOSAVE_INTERVAL: "value in seconds",
+            self.CONFIG_KEY_EDIT_JOURNAL: "True or False",
+            self.CONFIG_KEY_PATTERN_DIRECTORY: None,
+            self.CONFIG_KEY_LIFE_RULE: "B/S notation",
+            self.CONFIG_KEY_LIFE_EDGES: "bounded or wrap. Always bounded for an unbounded sparse grid",
+            self.CONFIG_KEY_LIFE_ENGINE: "vectorized or hashlife",
+            self.CONFIG_KEY_HASHLIFE_STEP_EXPONENT: "2 ** exponent generations are computed at each step",
+            self.CONFIG_KEY_LIFE_WORKER_NUMBER: "0 means one thread per CPU core",
+            self.CONFIG_KEY_SIMULATION_STEP_RATE: "generations per second",
         }
 
 
@@ -0,0 +1,40 @@
+import sys
+import time
+
+class ExecTracer():
+    '''
+    This class traces the grid view cell computations for debugging purpose. It is only
+    instanciated by the GridView if the 'Execution trace' setting of the configuration file
+    is True. Otherwise, GridView.execTracer is None and the traced code only performs a
+    None test, so that tracing costs nothing when disabled.
+
+    Unlike inspect.getframeinfo(), which reads the source file of the traced code, the
+    caller file name and line number are obtained directly from the caller frame.
+    '''
+    def __init__(self, output=None):
+        '''
+        :param output: file like object the traces are written to. Default is sys.stdout.
+        '''
+        self.output = output
+
+    def getExecInfo(self, gridView, rowCol, doComputeX, callerFrame):
+        if doComputeX:
+            cellInfo = 'col: ' + str(rowCol)
+        else:
+            cellInfo = 'row: ' + str(rowCol)
+
+        gridViewInfo = ['gridOffsetXPx: ' + str(gridView.gridOffsetXPx), 'gridOffsetYPx: ' + str(gridView.gridOffsetYPx), cellInfo]
+        execInfo = int(time.time()), callerFrame.f_code.co_filename.split('\\')[-1], callerFrame.f_lineno
+
+        return execInfo, gridViewInfo
+
+    def traceCellComputation(self, gridView, rowCol, doComputeX):
+        '''
+        Writes the caller location and the grid view offsets used to compute the passed cell
+        row or col.
+
+        :param gridView: traced GridView
+        :param rowCol: 0 based row or col index of the computed cell
+        :param doComputeX: True if rowCol is a col index, False if it is a row index
+        '''
+        print(self.getExecInfo(gridView, rowCol, doComputeX, sys._getframe(1)), file=self.output or sys.stdout)
@@ -0,0 +1,243 @@
+'''
+Headless batch mode: loads grid data files, inserts patterns into them, computes their next
+generations and writes the results, without opening any window. Neither pygame nor tkinter
+is imported, so that the grids can be processed on a server. The settings are read from the
+same configuration file as the grid view.
+
+Usage example, computing 100 generations of two grids after stamping a glider at row 10,
+col 20 of each one, the results being written in the out directory:
+
+    python gridbatch.py -n 100 -p glider@10,20 -o out griddata.csv other.grid
+'''
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from activetilemap import ActiveTileMap
+from cellgrid import CellGrid, ChunkedCellGrid, UNBOUNDED_CELL_NUMBER, CELL_STORAGE_SPARSE, CELL_STORAGE_MAPPED
+from configurationmanager import ConfigurationManager
+from griddatamanager import GridDataManager
+from gridpatternlibrary import GridPatternLibrary
+from hashlife import HashLife, HashLifeCellGrid
+from lifeengine import LifeEngine, LIFE_EDGES_BOUNDED, LIFE_ENGINE_HASHLIFE
+
+DEFAULT_CONFIG_FILENAME = 'gridView.ini'
+
+class GridBatch():
+    '''
+    This class processes grid data files the way the grid view would: the cell grid has the
+    dimensions and the storage configured for the grid view, the patterns are taken from the
+    configured pattern directory and the generations are computed by the configured Life
+    engine and rule.
+    '''
+    def __init__(self, configManager):
+        self.configMgr = configManager
+        self.cellStorage = configManager.cellStorage
+
+        # same cell grid dimensions as the grid view. The dense grid view is sized to the
+        # window pixel dimensions
+        if self.cellStorage == CELL_STORAGE_SPARSE:
+            sparseGridCellNumber = configManager.sparseGridCellNumber
+
+            if sparseGridCellNumber <= 0:
+                sparseGridCellNumber = UNBOUNDED_CELL_NUMBER
+
+            self.horizontalMaxManagedCellNumber = sparseGridCellNumber
+            self.verticalMaxManagedCellNumber = sparseGridCellNumber
+        else:
+            self.horizontalMaxManagedCellNumber = configManager.gridWidth
+            self.verticalMaxManagedCellNumber = configManager.gridHeight
+
+        self.gridPatternLibrary = GridPatternLibrary(configManager.patternDirectory)
+
+    def processGridFile(self, inputFilename, outputFilename, stepNumber=0, patternInserts=()):
+        '''
+        Loads the passed grid data file, its edit journal being replayed, inserts the passed
+        patterns, computes stepNumber generations and writes the resulting grid data. The
+        output file extension selects its format.
+
+        :param inputFilename: grid data file name
+        :param outputFilename: result file name, which can be inputFilename
+        :param stepNumber: number of generations to compute
+        :param patternInserts: list of (pattern name, 0 based row, 0 based col) tuples
+
+        :raise FileNotFoundError: if the input file or a pattern file does not exist
+        :raise KeyError: if a pattern is unknown
+        '''
+        gridDataMgr = GridDataManager(configManager=self.configMgr)
+        gridDataMgr.filename = inputFilename
+        cellGrid = self.loadGridData(gridDataMgr)
+
+        for patternName, row, col in patternInserts:
+            gridDataMgr.insertGridPatternToGridData(self.gridPatternLibrary.getPattern(patternName), cellGrid, col, row, doOverwrite=True)
+
+        if stepNumber > 0:
+            cellGrid = self.stepCells(cellGrid, stepNumber)
+
+        gridDataMgr.writeGridData(cellGrid, outputFilename)
+
+    def loadGridData(self, gridDataMgr):
+        '''
+        :raise FileNotFoundError: if the grid data file does not exist
+
+        :return: CellGrid, ChunkedCellGrid or mapped PackedCellGrid
+        '''
+        if self.cellStorage == CELL_STORAGE_MAPPED:
+            cellGrid, fileNotFoundName = gridDataMgr.mapGridData()
+        else:
+            cellGrid, fileNotFoundName = gridDataMgr.readGridData(requiredDimX=self.horizontalMaxManagedCellNumber,
+                                                                  requiredDimY=self.verticalMaxManagedCellNumber,
+                                                                  cellGrid=self.createCellGrid())
+
+        if fileNotFoundName is not None:
+            raise FileNotFoundError('grid data file {} not found'.format(fileNotFoundName))
+
+        return cellGrid
+
+    def createCellGrid(self):
+        if self.cellStorage == CELL_STORAGE_SPARSE:
+            return ChunkedCellGrid(self.horizontalMaxManagedCellNumber, self.verticalMaxManagedCellNumber)
+
+        return CellGrid(self.horizontalMaxManagedCellNumber, self.verticalMaxManagedCellNumber)
+
+    def stepCells(self, cellGrid, stepNumber):
+        '''
+        Computes stepNumber generations of the passed cell grid with the configured Life
+        engine.
+
+        :return: the passed cell grid or, with the HashLife engine, a HashLifeCellGrid
+        '''
+        if self.configMgr.lifeEngine == LIFE_ENGINE_HASHLIFE:
+            cellGrid = HashLifeCellGrid.fromCellGrid(cellGrid, HashLife(self.configMgr.lifeRule))
+            cellGrid.advance(stepNumber)
+
+            return cellGrid
+
+        # the edges of an unbounded sparse grid can not be wrapped
+        lifeEdges = self.configMgr.lifeEdges
+
+        if max(cellGrid.dimX, cellGrid.dimY) >= UNBOUNDED_CELL_NUMBER:
+            lifeEdges = LIFE_EDGES_BOUNDED
+
+        lifeEngine = LifeEngine(self.configMgr.lifeRule, lifeEdges, self.configMgr.lifeWorkerNumber)
+        activeTileMap = ActiveTileMap()
+
+        try:
+            for _ in range(stepNumber):
+                changedRows, _, _ = lifeEngine.step(cellGrid, activeTileMap)
+
+                if changedRows.size == 0:
+                    # the next generations would not change the cells either
+                    break
+        finally:
+            lifeEngine.close()
+
+        return cellGrid
+
+
+def processGridFile(configFilename, inputFilename, outputFilename, stepNumber, patternInserts):
+    '''
+    Worker process target, processing one grid data file.
+    '''
+    GridBatch(ConfigurationManager(configFilename)).processGridFile(inputFilename, outputFilename, stepNumber, patternInserts)
+
+
+def parsePatternInsert(patternInsertStr):
+    '''
+    Parses a pattern insert argument.
+
+    :param patternInsertStr: <pattern name>@<0 based row>,<0 based col>, like glider@10,20
+
+    :raise argparse.ArgumentTypeError: if the argument is invalid
+
+    :return: (pattern name, row, col) tuple
+    '''
+    patternName, _, position = patternInsertStr.rpartition('@')
+
+    try:
+        row, col = (int(coord) for coord in position.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError('invalid pattern insert {}. Expected format: glider@10,20'.format(patternInsertStr))
+
+    if not patternName or row < 0 or col < 0:
+        raise argparse.ArgumentTypeError('invalid pattern insert {}. Expected format: glider@10,20'.format(patternInsertStr))
+
+    return patternName, row, col
+
+
+def computeOutputFilename(inputFilename, outputDirectory, outputExtension):
+    '''
+    Returns the name of the file the result of the passed input file is written into. Without
+    output directory nor extension, the input file is overwritten.
+    '''
+    outputFilename = inputFilename
+
+    if outputDirectory is not None:
+        outputFilename = os.path.join(outputDirectory, os.path.basename(outputFilename))
+
+    if outputExtension is not None:
+        outputFilename = os.path.splitext(outputFilename)[0] + outputExtension
+
+    return outputFilename
+
+
+def main(argv=None):
+    '''
+    Processes the grid data files passed on the command line, in parallel worker processes if
+    several jobs are requested.
+
+    :return: 0 if all the files were processed, 1 otherwise
+    '''
+    parser = argparse.ArgumentParser(description='Processes grid data files without display.')
+    parser.add_argument('gridDataFilenames', nargs='+', metavar='GRID_DATA_FILE',
+                        help='.csv or .grid grid data file')
+    parser.add_argument('-c', '--config', default=DEFAULT_CONFIG_FILENAME,
+                        help='configuration file. Default: ' + DEFAULT_CONFIG_FILENAME)
+    parser.add_argument('-n', '--steps', type=int, default=0,
+                        help='number of generations to compute')
+    parser.add_argument('-p', '--pattern', type=parsePatternInsert, action='append', default=[],
+                        help='pattern inserted before computing the generations, as '
+                             '<pattern name>@<row>,<col>. Can be repeated')
+    parser.add_argument('-o', '--output-dir',
+                        help='directory the results are written into. Default: the input files are overwritten')
+    parser.add_argument('-e', '--extension', choices=('.csv', '.grid', '.gridz'),
+                        help='extension, and so format, of the result files. Default: the input file extension')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of files processed in parallel')
+    args = parser.parse_args(argv)
+
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    outputFilenames = [computeOutputFilename(inputFilename, args.output_dir, args.extension) for inputFilename in args.gridDataFilenames]
+    jobArgs = [(args.config, inputFilename, outputFilename, args.steps, args.pattern)
+               for inputFilename, outputFilename in zip(args.gridDataFilenames, outputFilenames)]
+    exitCode = 0
+
+    if args.jobs > 1 and len(jobArgs) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            futures = [executor.submit(processGridFile, *jobArg) for jobArg in jobArgs]
+            results = [(jobArg, future.exception()) for jobArg, future in zip(jobArgs, futures)]
+    else:
+        results = []
+
+        for jobArg in jobArgs:
+            try:
+                processGridFile(*jobArg)
+                results.append((jobArg, None))
+            except Exception as e:
+                results.append((jobArg, e))
+
+    for (_, inputFilename, outputFilename, _, _), error in results:
+        if error is None:
+            print('{} -> {}'.format(inputFilename, outputFilename))
+        else:
+            print('{}: {}'.format(inputFilename, error), file=sys.stderr)
+            exitCode = 1
+
+    return exitCode
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,202 @@
+'''
+Rendering benchmark of the grid view. GridView.draw() and the zoom, move and cell toggle
+operations followed by their draw are timed on an offscreen SDL dummy driver surface, for
+all the combinations of cell sizes, active cell densities and grid line width tuples. The
+results are written as JSON, so that the timings of two commits can be compared.
+
+Usage example:
+
+    python gridbenchmark.py -o benchmark.json
+'''
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+# the benchmark never opens a window and its standard output only contains the results
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import numpy as np
+import pygame as pg
+
+from configurationmanager import ConfigurationManager
+from gridview import GridView
+
+# from the smallest possible cell size to beyond the default cell sizes
+BENCHMARK_CELL_SIZES = sorted({2, 5, int(ConfigurationManager.DEFAULT_CELL_SIZE_WINDOWS), int(ConfigurationManager.DEFAULT_CELL_SIZE_ANDROID), 60})
+
+# ratio of active cells
+BENCHMARK_DENSITIES = (0.0, 0.1, 0.5)
+
+BENCHMARK_GRID_LINE_WIDTH_TUPLES = ('1, 0', '3, 1', '5, 2')
+
+BENCHMARK_OPERATIONS = ('draw', 'zoomIn', 'zoomOut', 'move', 'toggleCell')
+
+DEFAULT_REPEAT_NUMBER = 20
+
+# move done by the move operation, in pixels
+BENCHMARK_MOVE_PX = 10
+
+class GridViewBenchmark():
+    '''
+    This class times the grid view operations. Each operation is executed on a grid view
+    configured with the benchmarked cell size and grid line width tuple, whose cells were
+    randomly activated with the benchmarked density, and is followed by the draw() call which
+    displays its result, since this is what the game loop does.
+    '''
+    def __init__(self, configFilename, surface, repeatNumber=DEFAULT_REPEAT_NUMBER, seed=0):
+        self.configFilename = configFilename
+        self.surface = surface
+        self.repeatNumber = repeatNumber
+        self.rng = np.random.default_rng(seed)
+
+    def createGridView(self, cellSize, density, gridLineWidthTuple):
+        configMgr = ConfigurationManager(self.configFilename)
+        configMgr.defaultCellSize = str(cellSize)
+        configMgr.gridLineWidthTuple = gridLineWidthTuple
+        gridView = GridView(surface=self.surface, configManager=configMgr)
+        gridView.initialiseCellsToValue(0)
+        cellGrid = gridView.cellValueGrid
+        cellGrid.setWindow(0, 0, (self.rng.random((cellGrid.dimY, cellGrid.dimX)) < density).astype(np.uint8))
+
+        # the first draw renders the axis labels and the grid line layer, which are cached
+        gridView.draw()
+
+        return gridView
+
+    def timeOperation(self, gridView, operation):
+        '''
+        Executes the passed operation self.repeatNumber times, each time followed by a draw.
+        The zoom and move operations alternate with their reverse operation, which is not
+        timed, so that the grid view does not drift.
+
+        :return: list of the durations in seconds
+        '''
+        durations = []
+        cellZoneRect = gridView.getCellZoneRect()
+        toggledCellPos = cellZoneRect.center
+
+        for repeatIndex in range(self.repeatNumber):
+            if operation == 'draw':
+                # full repaint
+                gridView.changed = True
+                startTime = time.perf_counter()
+                gridView.draw()
+            elif operation == 'zoomIn':
+                startTime = time.perf_counter()
+                gridView.zoomIn()
+                gridView.draw()
+                durations.append(time.perf_counter() - startTime)
+                gridView.zoomOut()
+                gridView.draw()
+                continue
+            elif operation == 'zoomOut':
+                gridView.zoomIn()
+                gridView.draw()
+                startTime = time.perf_counter()
+                gridView.zoomOut()
+                gridView.draw()
+            elif operation == 'move':
+                # the odd moves return to the initial position
+                moveOffsetPx = -BENCHMARK_MOVE_PX if repeatIndex % 2 == 0 else BENCHMARK_MOVE_PX
+                startTime = time.perf_counter()
+                gridView.move(moveOffsetPx, moveOffsetPx)
+                gridView.draw()
+            elif operation == 'toggleCell':
+                startTime = time.perf_counter()
+                gridView.toggleCell(toggledCellPos)
+                gridView.draw()
+            else:
+                raise ValueError('unknown benchmark operation {}'.format(operation))
+
+            durations.append(time.perf_counter() - startTime)
+
+        return durations
+
+    def run(self, cellSizes=BENCHMARK_CELL_SIZES, densities=BENCHMARK_DENSITIES,
+            gridLineWidthTuples=BENCHMARK_GRID_LINE_WIDTH_TUPLES, operations=BENCHMARK_OPERATIONS):
+        '''
+        Times all the operations for all the combinations of the passed parameters.
+
+        :return: list of result dicts
+        '''
+        results = []
+
+        for cellSize in cellSizes:
+            for density in densities:
+                for gridLineWidthTuple in gridLineWidthTuples:
+                    for operation in operations:
+                        gridView = self.createGridView(cellSize, density, gridLineWidthTuple)
+                        durationsMs = [duration * 1000 for duration in self.timeOperation(gridView, operation)]
+                        results.append({'operation': operation,
+                                        'cellSize': cellSize,
+                                        'density': density,
+                                        'gridLineWidthTuple': gridLineWidthTuple,
+                                        'repeatNumber': len(durationsMs),
+                                        'minMs': min(durationsMs),
+                                        'medianMs': statistics.median(durationsMs),
+                                        'meanMs': statistics.mean(durationsMs),
+                                        'maxMs': max(durationsMs)})
+
+        return results
+
+
+def getGitCommit():
+    '''
+    Returns the hash of the commit the benchmarked code belongs to or None if it is not known.
+    '''
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Times the grid view rendering operations.')
+    parser.add_argument('-c', '--config', default='gridView.ini', help='configuration file. Default: gridView.ini')
+    parser.add_argument('-o', '--output', help='JSON result file. Default: standard output')
+    parser.add_argument('-r', '--repeat', type=int, default=DEFAULT_REPEAT_NUMBER,
+                        help='number of times each operation is timed. Default: {}'.format(DEFAULT_REPEAT_NUMBER))
+    parser.add_argument('--cell-sizes', type=lambda valuesStr: [int(value) for value in valuesStr.split(',')],
+                        default=BENCHMARK_CELL_SIZES, help='comma separated cell sizes in pixels')
+    parser.add_argument('--densities', type=lambda valuesStr: [float(value) for value in valuesStr.split(',')],
+                        default=BENCHMARK_DENSITIES, help='comma separated active cell ratios')
+    parser.add_argument('--grid-line-width-tuples', type=lambda valuesStr: valuesStr.split(';'),
+                        default=BENCHMARK_GRID_LINE_WIDTH_TUPLES, help='semicolon separated grid line width tuples, like "1, 0;3, 1"')
+    parser.add_argument('--operations', type=lambda valuesStr: valuesStr.split(','),
+                        default=BENCHMARK_OPERATIONS, help='comma separated operations among ' + ', '.join(BENCHMARK_OPERATIONS))
+    args = parser.parse_args(argv)
+
+    configMgr = ConfigurationManager(args.config)
+    pg.init()
+    surface = pg.display.set_mode((configMgr.gridWidth, configMgr.gridHeight))
+    benchmark = GridViewBenchmark(args.config, surface, args.repeat)
+
+    results = benchmark.run(args.cell_sizes, args.densities, args.grid_line_width_tuples, args.operations)
+
+    report = {'commit': getGitCommit(),
+              'python': platform.python_version(),
+              'pygame': pg.version.ver,
+              'numpy': np.__version__,
+              'platform': platform.platform(),
+              'surfaceSize': [configMgr.gridWidth, configMgr.gridHeight],
+              'results': results}
+
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
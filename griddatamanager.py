@@ -1,27 +1,213 @@
-import csv
+import itertools
+import os
+
+import numpy as np
+
+from binarygridfile import BinaryGridFile
+from cellgrid import CellGrid, ChunkedCellGrid, PackedCellGrid
+from hashlife import HashLifeCellGrid
+
+# number of cells read, converted and written at once. The grid data files are processed by
+# batches of rows, so that the memory used does not depend on the grid size
+ROW_BATCH_CELL_NUMBER = 2 ** 22
+
+# size of the write buffer of the csv files
+CSV_WRITE_BUFFER_BYTE_NUMBER = 2 ** 20
+
+CSV_SEPARATOR = ord('\t')
+CSV_LINE_END = ord('\n')
+CSV_DIGIT_ZERO = ord('0')
+
+# appended to the grid data file name to obtain the autosave file name
+AUTOSAVE_FILENAME_SUFFIX = '_autosave'
+
+# appended to the grid data file name to obtain the edit journal file name
+JOURNAL_FILENAME_EXTENSION = '.journal'
+
+# an edit journal record stores the 0 based row and col index and the new value of an
+# edited cell
+JOURNAL_RECORD_DTYPE = np.dtype([('row', '<u8'), ('col', '<u8'), ('value', 'u1')])
+
+# number of journal records above which the journal is merged into the grid data file
+JOURNAL_COMPACTION_RECORD_NUMBER = 2 ** 16
 
 class GridDataManager():
     '''
-    This class reads/writes the internal grid data from/to a csv file.
+    This class reads/writes the internal grid data from/to a grid data file. The file
+    extension selects the file format: .grid and .gridz files are (compressed) binary grid
+    files, fast to load and save. Any other file is a tab separated csv file, used for
+    interchange with other tools.
+
+    The grid data files are read and written by batches of rows (see ROW_BATCH_CELL_NUMBER),
+    so that grids larger than the memory can be converted from one format to another.
+
+    The cell edits can also be persisted in an append only edit journal, so that persisting
+    an edit costs a few bytes instead of a rewrite of the whole grid. The journal is replayed
+    when the grid data are loaded and deleted when the grid data file is written.
     '''
 
     def __init__(self, configManager):
         self.configMgr = configManager
         self.filename = configManager.loadAtStartPathFilename
 
-    def writeGridData(self, gridData):
-        with open(self.filename, 'w', newline = '') as file:
-            writer = csv.writer(file, delimiter = '\t')
+        # number of records of the edit journal file
+        self.journalRecordNumber = 0
+
+    @staticmethod
+    def computeBatchRowNumber(dimX):
+        return max(ROW_BATCH_CELL_NUMBER // max(dimX, 1), 1)
+
+    def getAutosaveFilename(self):
+        '''
+        Returns the name of the file the grid data are periodically saved into, i.e. the grid
+        data file name followed by _autosave, the extension, and so the format, being kept.
+        '''
+        filenameRoot, extension = os.path.splitext(self.filename)
+
+        return filenameRoot + AUTOSAVE_FILENAME_SUFFIX + extension
+
+    def writeGridData(self, gridData, filename=None, replaceMappedFile=True):
+        '''
+        Writes the passed grid data (CellGrid, array or list of list) into self.filename. The
+        csv file contains a col header row and a 0 index column storing the 0 based row index.
+        A binary grid file contains the bit packed cells.
+
+        :param gridData: 2 dimensions CellGrid, array or list
+        :param filename: if not None, the grid data are written into this file instead of
+                         self.filename
+        :param replaceMappedFile: if False and gridData is a PackedCellGrid mapping the file
+                                  it is written into, the file is left written under its
+                                  temporary name and must be replaced by
+                                  completeMappedGridDataWrite(), for example by the thread
+                                  which reads the cells while they are written
+
+        :return: True if completeMappedGridDataWrite() must be called, False otherwise
+        '''
+        if filename is None:
+            filename = self.filename
+
+        if isinstance(gridData, PackedCellGrid) and BinaryGridFile.isBinaryGridFilename(filename):
+            # the packed rows are written without being unpacked. A grid saved into the file it
+            # maps is mapped again on the new file
+            isMappedFile = BinaryGridFile.isMappedFile(gridData.packedRows, filename)
+            BinaryGridFile.writePackedRows(filename, gridData.dimX, gridData.packedRows, replaceFile=not isMappedFile)
+
+            if isMappedFile:
+                if not replaceMappedFile:
+                    return True
+
+                BinaryGridFile.replaceMappedFile(gridData, filename)
+        else:
+            dataDimX, cellRowBatches = self.iterGridDataRowBatches(gridData)
+            self.writeRowBatches(filename, dataDimX, cellRowBatches)
+
+        if filename == self.filename:
+            # the grid data file now contains the journaled edits
+            self.deleteJournal()
+
+        return False
+
+    def completeMappedGridDataWrite(self, gridData, filename=None):
+        '''
+        Replaces the file mapped by the passed PackedCellGrid by the temporary file written by
+        writeGridData() with replaceMappedFile=False and maps the new file.
+
+        :param gridData: PackedCellGrid
+        :param filename: if not None, the file the grid data were written into instead of
+                         self.filename
+        '''
+        if filename is None:
+            filename = self.filename
+
+        BinaryGridFile.replaceMappedFile(gridData, filename)
+
+        if filename == self.filename:
+            self.deleteJournal()
+
+    @staticmethod
+    def iterGridDataRowBatches(gridData):
+        '''
+        Splits the passed grid data into batches of rows.
+
+        :param gridData: 2 dimensions CellGrid, ChunkedCellGrid, PackedCellGrid, HashLifeCellGrid,
+                         array or list
+
+        :return: 2 elements tuple: the horizontal dimension of the batches and a generator of
+                 (batch row number, dimX) uint8 arrays
+        '''
+        if isinstance(gridData, (CellGrid, ChunkedCellGrid, PackedCellGrid, HashLifeCellGrid)):
+            # for a sparse grid, only the zone containing data is written
+            dataDimX, dataDimY = gridData.getDataExtent()
+            getWindow = gridData.getWindow
+        else:
+            cells = np.asarray(gridData, dtype=np.uint8)
+
+            if cells.ndim != 2:
+                # empty matrix
+                cells = np.zeros((0, 0), dtype=np.uint8)
+
+            dataDimY, dataDimX = cells.shape
+            getWindow = lambda rowStart, rowEnd, colStart, colEnd: cells[rowStart:rowEnd, colStart:colEnd]
+
+        batchRowNumber = GridDataManager.computeBatchRowNumber(dataDimX)
+        cellRowBatches = (getWindow(rowStart, rowStart + batchRowNumber, 0, dataDimX) for rowStart in range(0, dataDimY, batchRowNumber))
+
+        return dataDimX, cellRowBatches
+
+    @staticmethod
+    def writeRowBatches(filename, dimX, cellRowBatches):
+        '''
+        Writes the passed batches of rows into the passed file, whose extension selects the
+        file format. The rows are written into a temporary file which then replaces the passed
+        file, so that the file is never left half written.
+
+        :param filename: grid data file name
+        :param dimX: 1 based horizontal dimension of the grid
+        :param cellRowBatches: iterable of (batch row number, dimX) uint8 arrays
+        '''
+        if BinaryGridFile.isBinaryGridFilename(filename):
+            BinaryGridFile.writeRowBatches(filename, dimX, cellRowBatches)
+            return
 
+        tmpFilename = filename + '.tmp'
+
+        with open(tmpFilename, 'wb', buffering=CSV_WRITE_BUFFER_BYTE_NUMBER) as file:
             # write col header row
-            csvFileHeader = [''] + [i for i in range(0, len(gridData[0]))]
-            writer.writerow(csvFileHeader)
+            csvFileHeader = '\t' + '\t'.join([str(i) for i in range(0, dimX)]) + '\n'
+            file.write(csvFileHeader.encode())
+            rowStart = 0
+
+            for cellRowBatch in cellRowBatches:
+                file.write(GridDataManager.formatCsvRowBatch(rowStart, cellRowBatch))
+                rowStart += cellRowBatch.shape[0]
+
+        os.replace(tmpFilename, filename)
+
+    @staticmethod
+    def formatCsvRowBatch(rowStart, cells):
+        '''
+        Formats the passed batch of rows as csv lines, the 0 based row index being prepended
+        to each row as col 0.
+
+        :param rowStart: 0 based row index of the first row of the batch
+        :param cells: (batch row number, dimX) uint8 array
+
+        :return: bytes
+        '''
+        rowNumber, dimX = cells.shape
+
+        if dimX == 0 or cells.max() > 9:
+            return b''.join(('\t'.join(map(str, [rowStart + rowIndex] + row)) + '\n').encode() for rowIndex, row in enumerate(cells.tolist()))
 
-            for li in range(0, len(gridData)):
-                line = [li] + gridData[li]
-                writer.writerow(line)
+        # cell values are one digit: the digits are at the even positions of the row chars,
+        # separated by tabs, the last tab being replaced by the line end
+        rowChars = np.full((rowNumber, 2 * dimX), CSV_SEPARATOR, dtype=np.uint8)
+        rowChars[:, 0::2] = cells + CSV_DIGIT_ZERO
+        rowChars[:, -1] = CSV_LINE_END
 
-    def readGridData(self, requiredDimX, requiredDimY):
+        return b''.join([b'%d\t' % (rowStart + rowIndex) + rowChars[rowIndex].tobytes() for rowIndex in range(rowNumber)])
+
+    def readGridData(self, requiredDimX, requiredDimY, cellGrid=None, progressCallback=None):
         '''
         Loads the grid data stored in self.filename. If the input file contains less data than what is
         required to fill a grid table of dimension dimX x dimY, empty (0) cells are added to the
@@ -29,67 +215,254 @@ class GridDataManager():
 
         :param requiredDimX: 1 based horizontal dimension of returned grid table
         :param requiredDimY: 1 based vertical dimension of returned grid table
+        :param cellGrid: empty requiredDimX x requiredDimY CellGrid or ChunkedCellGrid the data
+                         are loaded into. If None, a dense CellGrid is created
+        :param progressCallback: if not None, function called after each loaded batch of rows
+                                 with the loaded ratio, between 0 and 1, of the data to load
 
-        :return: 2 elements tuple: first element is the 2 dimensional grid matrix (list of list) or None
+        :return: 2 elements tuple: first element is the 2 dimensional grid matrix (CellGrid or the
+                 passed cellGrid) or None
                  if fileName not found.
 
                  Second element is None or the name of the missing file if fileName not found.
         '''
-        twoDIntMatrix = []
         fileNotFoundName = None
 
         try:
-            with open(self.filename, 'r') as file:
-                reader = csv.reader(file, delimiter='\t')
-
-                # reading the header line and use it to determine the x dimension of the input data
-
-                header = next(reader)
-                dataDimX = len(header) - 1
-                fillerDimX = 0
-
-                # if fillerDimX is larger than 0, then the read data matrix col number is smaller
-                # than the expected matrix x size and filler col data will have to be generated.
-                # If it is smaller than 0, then the read data matrix col number is larger than the
-                # expected matrix x size and will have to be truncated
-                fillerDimX = requiredDimX - dataDimX
-
-                dataDimY = 0
-
-                for row in reader:
-                    dataDimY += 1
-                    if dataDimY > requiredDimY:
-                        # if the number of read rows data is larger than the expected matrix y size then
-                        # the excess rows are ignored
-                        break
-                    else:
-                        intLst = [int(s) for s in row] # converting the row which contains strings into integers
-                    cellDataRow = intLst[1:] # stripping off col 0 which contains line numbers
-                    if fillerDimX > 0:
-                        # building a filler list denoting the missing col in the read matrix data
-                        fillerList = [0 for _ in range(fillerDimX)]
-                    elif fillerDimX < 0:
-                        # truncating the read row data to respect the required col number (x dimension)
-                        cellDataRow = cellDataRow[:fillerDimX]
-                        fillerList = []
-                    else:
-                        # read and expected col numbers are identical
-                        fillerList = []
-                    twoDIntMatrix.append(cellDataRow + fillerList)
-
-                if dataDimY < requiredDimY:
-                    # if the read data matrix row number is smaller than the expected matrix y size
-                    # filler row data will have to be generated for each missing row
-                    fillerDimY = requiredDimY - dataDimY
-
-                    for _ in range(fillerDimY):
-                        # adding a filler list for each missing row in the read matrix data
-                        twoDIntMatrix.append([0 for _ in range(requiredDimX)])
+            file = open(self.filename, 'rb')
         except FileNotFoundError as e:
             fileNotFoundName = e.filename
             return None, fileNotFoundName
 
-        return twoDIntMatrix, fileNotFoundName
+        if cellGrid is None:
+            cellGrid = CellGrid(requiredDimX, requiredDimY)
+
+        with file:
+            # if the number of data rows is larger than the expected matrix y size then the
+            # excess rows are not even parsed
+            _, cellRowBatches = self.iterFileRowBatches(file, requiredDimX, requiredDimY, progressCallback)
+
+            for rowStart, cellRowBatch in cellRowBatches:
+                # excess cols are truncated by setWindow() and missing rows or cols remain
+                # filled with 0
+                cellGrid.setWindow(rowStart, 0, cellRowBatch)
+
+        self.replayJournal(cellGrid)
+
+        return cellGrid, fileNotFoundName
+
+    def convertGridData(self, targetFilename, progressCallback=None):
+        '''
+        Copies the grid data stored in self.filename into the passed file, whose extension
+        selects the file format. Since the grid data are converted batch of rows after batch of
+        rows, the grid can be larger than the memory.
+
+        :param targetFilename: converted grid data file name
+        :param progressCallback: if not None, function called after each converted batch of
+                                 rows with the converted ratio, between 0 and 1, of the data
+
+        :raise FileNotFoundError: if self.filename does not exist
+        '''
+        with open(self.filename, 'rb') as file:
+            dimX, cellRowBatches = self.iterFileRowBatches(file, progressCallback=progressCallback)
+            self.writeRowBatches(targetFilename, dimX, (cellRowBatch for _, cellRowBatch in cellRowBatches))
+
+    def iterFileRowBatches(self, file, requiredDimX=None, maxRowNumber=None, progressCallback=None):
+        '''
+        Reads the passed grid data file by batches of rows.
+
+        :param file: binary file object of self.filename, positioned at the start of the file
+        :param requiredDimX: if not None, csv rows are truncated to this dimension. The rows
+                             are not completed with 0 up to it, since it can be the huge
+                             dimension of an unbounded sparse grid
+        :param maxRowNumber: if not None, the rows beyond maxRowNumber are not read
+        :param progressCallback: if not None, function called after each read batch of rows
+                                 with the read ratio, between 0 and 1, of the data to read
+
+        :return: 2 elements tuple: the horizontal dimension of the batches and a generator of
+                 (0 based row index of the first batch row, (batch row number, dimX) uint8
+                 array) tuples
+        '''
+        if BinaryGridFile.isBinaryGridFilename(self.filename):
+            dimX, dimY, flags = BinaryGridFile.readHeader(file)
+
+            if maxRowNumber is not None:
+                dimY = min(dimY, maxRowNumber)
+            else:
+                maxRowNumber = dimY
+
+            cellRowBatches = BinaryGridFile.iterRowBatches(file, dimX, dimY, flags, self.computeBatchRowNumber(dimX))
+        else:
+            # the header line is only used to determine the x dimension of the input data
+            dimX = file.readline().count(b'\t')
+
+            if requiredDimX is not None:
+                dimX = min(dimX, requiredDimX)
+
+            cellRowBatches = self.iterCsvRowBatches(file, dimX, maxRowNumber, self.computeBatchRowNumber(dimX))
+
+        if progressCallback is None:
+            return dimX, cellRowBatches
+
+        return dimX, self.iterReportingProgress(file, cellRowBatches, maxRowNumber, progressCallback)
+
+    @staticmethod
+    def iterReportingProgress(file, cellRowBatches, maxRowNumber, progressCallback):
+        '''
+        Generator passing through the passed batches of rows and reporting after each batch the
+        ratio of the file which was read, or of the max row number if it is reached first.
+        '''
+        fileSize = max(os.fstat(file.fileno()).st_size, 1)
+
+        for rowStart, cellRowBatch in cellRowBatches:
+            progressRatio = file.tell() / fileSize
+
+            if maxRowNumber:
+                progressRatio = max(progressRatio, (rowStart + cellRowBatch.shape[0]) / maxRowNumber)
+
+            yield rowStart, cellRowBatch
+            progressCallback(min(progressRatio, 1.0))
+
+        progressCallback(1.0)
+
+    @staticmethod
+    def iterCsvRowBatches(file, dimX, maxRowNumber, batchRowNumber):
+        '''
+        Generator parsing the passed csv file by batches of rows.
+
+        :param file: binary file object positioned after the header line
+        :param dimX: horizontal dimension of the returned batches. The rows are truncated or
+                     completed with 0 to this dimension
+        :param maxRowNumber: if not None, the rows beyond maxRowNumber are not parsed
+        :param batchRowNumber: max number of rows of a batch
+
+        :return: yields (0 based row index of the first batch row, (batch row number, dimX)
+                 uint8 array) tuples
+        '''
+        rowStart = 0
+
+        while maxRowNumber is None or rowStart < maxRowNumber:
+            if maxRowNumber is not None:
+                batchRowNumber = min(batchRowNumber, maxRowNumber - rowStart)
+
+            lines = list(itertools.islice(file, batchRowNumber))
+
+            if not lines:
+                return
+
+            # blank lines are ignored
+            lines = [line for line in lines if not line.isspace()]
+            cellRowBatch = np.zeros((len(lines), dimX), dtype=np.uint8)
+
+            for rowIndex, line in enumerate(lines):
+                rowCells = GridDataManager.parseCsvRow(line)[:dimX]
+                cellRowBatch[rowIndex, :rowCells.size] = rowCells
+
+            if lines:
+                yield rowStart, cellRowBatch
+                rowStart += len(lines)
+
+    @staticmethod
+    def parseCsvRow(line):
+        '''
+        Converts the passed csv line into an array of cell values, the col 0 row index being
+        stripped off.
+
+        :param line: bytes
+
+        :return: 1 dimension uint8 array
+        '''
+        line = line.rstrip(b'\r\n')
+        firstSeparatorIndex = line.find(b'\t')
+
+        if firstSeparatorIndex < 0:
+            return np.zeros(0, dtype=np.uint8)
+
+        cellChars = np.frombuffer(line, dtype=np.uint8)[firstSeparatorIndex + 1:]
+
+        if cellChars.size % 2 == 1:
+            # fast path for the files written by writeGridData(): one digit values separated
+            # by single tabs are converted at once. Non digit chars become values above 9
+            cellValues = cellChars[0::2] - CSV_DIGIT_ZERO
+
+            if (cellChars[1::2] == CSV_SEPARATOR).all() and (cellValues <= 9).all():
+                return cellValues
+
+        return np.array(line[firstSeparatorIndex + 1:].split(b'\t'), dtype=np.int64).astype(np.uint8)
+
+    def mapGridData(self):
+        '''
+        Opens the .grid binary grid file self.filename as a memory mapped PackedCellGrid whose
+        dimensions are those stored in the file. Unlike readGridData(), the cells are not read:
+        only the rows which are accessed are loaded.
+
+        :raise ValueError: if the file is not a valid uncompressed binary grid file
+
+        :return: 2 elements tuple: first element is the PackedCellGrid or None if fileName not
+                 found.
+
+                 Second element is None or the name of the missing file if fileName not found.
+        '''
+        try:
+            cellGrid = BinaryGridFile.mapCellGrid(self.filename)
+        except FileNotFoundError as e:
+            return None, e.filename
+
+        # since the mapping is copy on write, the replayed edits are not written into the file
+        self.replayJournal(cellGrid)
+
+        return cellGrid, None
+
+    def getJournalFilename(self):
+        return self.filename + JOURNAL_FILENAME_EXTENSION
+
+    def appendJournal(self, cellEdits):
+        '''
+        Appends the passed cell edits to the edit journal file.
+
+        :param cellEdits: list of (0 based row index, 0 based col index, new cell value) tuples
+        '''
+        journalRecords = np.array(cellEdits, dtype=JOURNAL_RECORD_DTYPE)
+
+        with open(self.getJournalFilename(), 'ab') as file:
+            file.write(journalRecords.tobytes())
+
+        self.journalRecordNumber += len(journalRecords)
+
+    def replayJournal(self, cellGrid):
+        '''
+        Applies the cell edits stored in the edit journal file, if any, to the passed cell
+        grid. The edits of cells outside of the grid are ignored.
+
+        :param cellGrid: CellGrid, ChunkedCellGrid or PackedCellGrid
+
+        :return: number of journal records
+        '''
+        try:
+            with open(self.getJournalFilename(), 'rb') as file:
+                journalBytes = file.read()
+        except FileNotFoundError:
+            self.journalRecordNumber = 0
+            return 0
+
+        # a last record partially written because of a crash is ignored
+        self.journalRecordNumber = len(journalBytes) // JOURNAL_RECORD_DTYPE.itemsize
+        journalRecords = np.frombuffer(journalBytes, dtype=JOURNAL_RECORD_DTYPE, count=self.journalRecordNumber)
+        isInGrid = (journalRecords['row'] < cellGrid.dimY) & (journalRecords['col'] < cellGrid.dimX)
+
+        # the records are replayed in order, so that the last edit of a cell wins
+        for row, col, value in journalRecords[isInGrid].tolist():
+            cellGrid.setCell(row, col, value)
+
+        return self.journalRecordNumber
+
+    def deleteJournal(self):
+        try:
+            os.remove(self.getJournalFilename())
+        except FileNotFoundError:
+            pass
+
+        self.journalRecordNumber = 0
 
     def insertGridPatternToGridData(self, gridPatternMatrix, gridDataMatrix, zeroBasedInsertPosX, zeroBasedInsertPosY, doOverwrite = True):
         '''
@@ -98,12 +471,57 @@ class GridDataManager():
         and the inserted data overwrites the existing data. Else, cols and rows are added to
         gridDataMatrix to make room to the inserted data.
 
-        :param gridPatternMatrix: 2 dimensions list
-        :param gridDataMatrix: 2 dimensions list
-        :param zeroBasedInsertPosX: integer
+        The pattern is copied with slice assignments and, in expand mode, the existing data are
+        moved by whole blocks, so that no cell is copied individually.
+
+        :param gridPatternMatrix: 2 dimensions list, array or CellGrid
+        :param gridDataMatrix: 2 dimensions list, array, CellGrid, ChunkedCellGrid, PackedCellGrid or
+                               HashLifeCellGrid. Only a list, an array or a CellGrid can be expanded
+        :param zeroBasedInsertPosX: integer. In overwrite mode, the part of the pattern which falls
+                                    outside of the grid is ignored
         :param zeroBasedInsertPosY: integer
         :param doOverwrite: boolean
 
-        :return: the modified gridDataMatrix (or a copy ?)
+        :raise ValueError: if a sparse or packed grid is to be expanded
+
+        :return: the modified gridDataMatrix if it is a CellGrid, ChunkedCellGrid, PackedCellGrid or
+                 HashLifeCellGrid and doOverwrite is True. Else, a new CellGrid
         '''
-        pass
+        gridPattern = np.asarray(gridPatternMatrix, dtype=np.uint8)
+
+        if gridPattern.ndim != 2:
+            # empty pattern
+            gridPattern = np.zeros((0, 0), dtype=np.uint8)
+
+        if not isinstance(gridDataMatrix, (CellGrid, ChunkedCellGrid, PackedCellGrid, HashLifeCellGrid)):
+            gridDataMatrix = CellGrid.fromMatrix(gridDataMatrix)
+
+        if doOverwrite:
+            # the pattern part located above or at the left of the grid is cropped
+            gridPattern = gridPattern[max(-zeroBasedInsertPosY, 0):, max(-zeroBasedInsertPosX, 0):]
+            gridDataMatrix.setWindow(max(zeroBasedInsertPosY, 0), max(zeroBasedInsertPosX, 0), gridPattern)
+
+            return gridDataMatrix
+
+        if not isinstance(gridDataMatrix, CellGrid):
+            raise ValueError('{} can not be expanded. Only a dense CellGrid can be expanded'.format(gridDataMatrix))
+
+        cells = gridDataMatrix.cells
+        dimY, dimX = cells.shape
+        patternDimY, patternDimX = gridPattern.shape
+        insertPosX = min(max(zeroBasedInsertPosX, 0), dimX)
+        insertPosY = min(max(zeroBasedInsertPosY, 0), dimY)
+
+        # the rows below and the cols at the right of the insert position are moved by the
+        # pattern dimensions, the 4 grid parts being copied as blocks
+        expandedCells = np.zeros((dimY + patternDimY, dimX + patternDimX), dtype=np.uint8)
+        expandedCells[:insertPosY, :insertPosX] = cells[:insertPosY, :insertPosX]
+        expandedCells[:insertPosY, insertPosX + patternDimX:] = cells[:insertPosY, insertPosX:]
+        expandedCells[insertPosY + patternDimY:, :insertPosX] = cells[insertPosY:, :insertPosX]
+        expandedCells[insertPosY + patternDimY:, insertPosX + patternDimX:] = cells[insertPosY:, insertPosX:]
+        expandedCells[insertPosY:insertPosY + patternDimY, insertPosX:insertPosX + patternDimX] = gridPattern
+
+        expandedCellGrid = CellGrid(0, 0)
+        expandedCellGrid.cells = expandedCells
+
+        return expandedCellGrid
@@ -0,0 +1,161 @@
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+# a pattern file is named pattern_<pattern name>.csv, like pattern_circle.csv
+PATTERN_FILENAME_PREFIX = 'pattern_'
+PATTERN_FILENAME_EXTENSION = '.csv'
+
+PATTERN_SEPARATOR = ord('\t')
+PATTERN_DIGIT_ZERO = ord('0')
+
+# max number of parsed patterns kept in the cache
+DEFAULT_MAX_CACHED_PATTERN_NUMBER = 64
+
+class GridPatternLibrary():
+    '''
+    This class gives access to the grid patterns stored in the pattern files of a directory.
+    A pattern file is a tab separated text file without header nor row index col, each line
+    being a row of 0 or 1 cell values.
+
+    The directory is only scanned for pattern file names. A pattern file is parsed the first
+    time its pattern is requested and the parsed pattern is kept in a cache, so that stamping
+    the same pattern again and again does not read the file again. The cached patterns are
+    keyed by file path name and modification time, so that a pattern file modified since it
+    was parsed is parsed again. When the cache is full, the least recently used pattern is
+    evicted.
+    '''
+    def __init__(self, directory, maxCachedPatternNumber=DEFAULT_MAX_CACHED_PATTERN_NUMBER):
+        self.directory = directory
+        self.maxCachedPatternNumber = maxCachedPatternNumber
+        self.patternPathnames = {}
+        self.patterns = OrderedDict()
+        self.scan()
+
+    def scan(self):
+        '''
+        Indexes the pattern files of the library directory by pattern name. The files are not
+        read.
+
+        :return: sorted list of the pattern names
+        '''
+        self.patternPathnames = {}
+
+        try:
+            dirEntries = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            dirEntries = []
+
+        for dirEntry in dirEntries:
+            patternName = self.getPatternName(dirEntry.name)
+
+            if patternName is not None and dirEntry.is_file():
+                self.patternPathnames[patternName] = dirEntry.path
+
+        return self.getPatternNames()
+
+    @staticmethod
+    def getPatternName(filename):
+        '''
+        Returns the name of the pattern stored in the passed file or None if the file is not
+        a pattern file.
+        '''
+        name, extension = os.path.splitext(filename)
+
+        if not name.startswith(PATTERN_FILENAME_PREFIX) or extension.lower() != PATTERN_FILENAME_EXTENSION:
+            return None
+
+        return name[len(PATTERN_FILENAME_PREFIX):]
+
+    def getPatternNames(self):
+        return sorted(self.patternPathnames)
+
+    def getPattern(self, patternName):
+        '''
+        Returns the passed pattern, parsing its file only if the pattern is not in the cache or
+        if the file was modified since it was parsed. The returned array is read only since it
+        is shared by all the callers.
+
+        :param patternName: name of the pattern, like circle for pattern_circle.csv
+
+        :raise KeyError: if the library directory contains no file for the pattern
+        :raise FileNotFoundError: if the pattern file was deleted since the directory was scanned
+
+        :return: 2 dimensions uint8 array
+        '''
+        if patternName not in self.patternPathnames:
+            # the pattern file may have been added since the directory was scanned
+            self.scan()
+
+        pathname = self.patternPathnames[patternName]
+        patternKey = (pathname, os.stat(pathname).st_mtime_ns)
+        pattern = self.patterns.get(patternKey)
+
+        if pattern is not None:
+            self.patterns.move_to_end(patternKey)
+            return pattern
+
+        # the pattern parsed from a previous version of the file is obsolete
+        for obsoletePatternKey in [key for key in self.patterns if key[0] == pathname]:
+            del self.patterns[obsoletePatternKey]
+
+        pattern = self.parsePatternFile(pathname)
+        pattern.flags.writeable = False
+        self.patterns[patternKey] = pattern
+
+        if len(self.patterns) > self.maxCachedPatternNumber:
+            # evicting the least recently used pattern
+            self.patterns.popitem(last=False)
+
+        return pattern
+
+    def clear(self):
+        self.patterns.clear()
+
+    @staticmethod
+    def parsePatternFile(pathname):
+        '''
+        Reads the passed pattern file.
+
+        :param pathname: pattern file path name
+
+        :raise ValueError: if the pattern rows do not have the same length
+
+        :return: 2 dimensions uint8 array
+        '''
+        with open(pathname, 'rb') as file:
+            lines = [line for line in file.read().splitlines() if line.strip()]
+
+        if not lines:
+            return np.zeros((0, 0), dtype=np.uint8)
+
+        patternRows = [GridPatternLibrary.parsePatternRow(line) for line in lines]
+        colNumber = patternRows[0].size
+
+        if any(patternRow.size != colNumber for patternRow in patternRows):
+            raise ValueError('{} is not a valid pattern file: the rows do not have the same length'.format(pathname))
+
+        return np.vstack(patternRows)
+
+    @staticmethod
+    def parsePatternRow(line):
+        '''
+        Converts the passed pattern file line into an array of cell values.
+
+        :param line: bytes
+
+        :return: 1 dimension uint8 array
+        '''
+        line = line.rstrip(b'\t\r\n')
+        cellChars = np.frombuffer(line, dtype=np.uint8)
+
+        if cellChars.size % 2 == 1:
+            # fast path for one digit values separated by single tabs. Non digit chars become
+            # values above 9
+            cellValues = cellChars[0::2] - PATTERN_DIGIT_ZERO
+
+            if (cellChars[1::2] == PATTERN_SEPARATOR).all() and (cellValues <= 9).all():
+                return cellValues
+
+        return np.array(line.split(b'\t'), dtype=np.int64).astype(np.uint8)
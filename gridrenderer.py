@@ -0,0 +1,328 @@
+'''
+Offscreen rendering of cell grids to PNG images and numbered PNG frame sequences, without
+any window. Usage example, exporting the cells of a grid data file at 4 px per cell:
+
+    python gridrenderer.py griddata.csv griddata.png --cell-size 4
+'''
+import argparse
+import os
+import struct
+import sys
+import zlib
+
+import numpy as np
+import pygame as pg
+
+from configurationmanager import ConfigurationManager
+from gridbatch import GridBatch, DEFAULT_CONFIG_FILENAME
+from griddatamanager import GridDataManager
+from gridview import GridView
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# IHDR fields: width, height, bit depth, color type (2: RGB), compression, filter, interlace
+PNG_HEADER_FORMAT = '>IIBBBBB'
+PNG_RGB_COLOR_TYPE = 2
+
+# zlib level of the PNG pixel data. Cell images are made of large uniform areas which are
+# compressed well at a low level
+PNG_COMPRESSION_LEVEL = 6
+
+# width and height in pixels of the square tiles the image is rendered by
+DEFAULT_RENDER_TILE_SIZE_PX = 1024
+
+# maximum size in bytes of the band of image rows kept in memory at a time. The band height
+# is derived from the image width, so that very wide images are rendered by thinner bands
+DEFAULT_RENDER_BAND_BYTE_NUMBER = 64 * 1024 * 1024
+
+class PngWriter():
+    '''
+    This class writes a PNG image band of rows after band of rows, so that an image larger
+    than the memory can be written. The rows of each band are compressed with the same
+    zlib.compressobj and written as an IDAT chunk.
+    '''
+    def __init__(self, filename, width, height):
+        '''
+        :param filename: PNG file name
+        :param width: image width in pixels
+        :param height: image height in pixels
+        '''
+        self.filename = filename
+        self.width = width
+        self.height = height
+        self.writtenRowNumber = 0
+        self.compressor = zlib.compressobj(PNG_COMPRESSION_LEVEL)
+
+        # like the grid data files, the image is written under a temporary name and then
+        # renamed, so that it is never left half written
+        self.file = open(filename + '.tmp', 'wb')
+        self.file.write(PNG_SIGNATURE)
+        self.writeChunk(b'IHDR', struct.pack(PNG_HEADER_FORMAT, width, height, 8, PNG_RGB_COLOR_TYPE, 0, 0, 0))
+
+    def writeChunk(self, chunkType, data):
+        self.file.write(struct.pack('>I', len(data)))
+        self.file.write(chunkType)
+        self.file.write(data)
+        self.file.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(chunkType))))
+
+    def writeRows(self, pixelRows):
+        '''
+        Writes the passed band of image rows.
+
+        :param pixelRows: (row number, width, 3) uint8 RGB array
+        '''
+        # each PNG row starts with its filter type byte, 0 meaning unfiltered
+        filteredRows = np.zeros((pixelRows.shape[0], self.width * 3 + 1), dtype=np.uint8)
+        filteredRows[:, 1:] = pixelRows.reshape(pixelRows.shape[0], self.width * 3)
+        compressedData = self.compressor.compress(filteredRows.tobytes())
+
+        if compressedData:
+            self.writeChunk(b'IDAT', compressedData)
+
+        self.writtenRowNumber += pixelRows.shape[0]
+
+    def close(self):
+        '''
+        :raise ValueError: if less rows than the image height were written
+        '''
+        try:
+            if self.writtenRowNumber != self.height:
+                raise ValueError('{} rows written into {} instead of {}'.format(self.writtenRowNumber, self.filename, self.height))
+
+            self.writeChunk(b'IDAT', self.compressor.flush())
+            self.writeChunk(b'IEND', b'')
+        finally:
+            self.file.close()
+
+        os.replace(self.filename + '.tmp', self.filename)
+
+
+class GridRenderer():
+    '''
+    This class renders a zone of a cell grid exactly as the grid view would display it, with
+    the row/col number labels and the grid lines, but into an image file instead of a window.
+
+    The image is rendered tile by tile by a GridView drawing on an offscreen surface of the
+    tile size, the grid view offsets being set so that its cell zone displays the tile. The
+    labels, the border cells and the active cells are so drawn by the grid view code itself.
+    The label margins are only kept for the tiles of the first tile row and col.
+    '''
+    def __init__(self, configManager, cellGrid, cellSize=None, gridLineWidthTuple=None, tileSizePx=DEFAULT_RENDER_TILE_SIZE_PX,
+                 bandByteNumber=DEFAULT_RENDER_BAND_BYTE_NUMBER):
+        '''
+        :param configManager: ConfigurationManager providing the colors, the label font size
+                              and the default cell size and grid line width
+        :param cellGrid: CellGrid, ChunkedCellGrid, PackedCellGrid or HashLifeCellGrid
+        :param cellSize: cell size in pixels. If None, the configured cell size is used
+        :param gridLineWidthTuple: (grid line width, cell size offset) tuple. If None, the
+                                   configured grid line width tuple is used
+        :param tileSizePx: width and height in pixels of the rendered tiles
+        :param bandByteNumber: maximum size in bytes of the rendered band of image rows. The
+                               band contains at least one row of cell zone pixels whatever its
+                               size
+        '''
+        if not pg.font.get_init():
+            pg.font.init()
+
+        gridCoordMarginSize = configManager.gridCoordMarginSize
+        self.tileSizePx = tileSizePx
+        self.bandByteNumber = bandByteNumber
+        self.tileSurface = pg.Surface((tileSizePx + gridCoordMarginSize, tileSizePx + gridCoordMarginSize))
+        self.gridView = GridView(surface=self.tileSurface, configManager=configManager)
+        self.gridView.cellValueGrid = cellGrid
+        self.gridView.horizontalMaxManagedCellNumber = cellGrid.dimX
+        self.gridView.verticalMaxManagedCellNumber = cellGrid.dimY
+
+        if cellSize is not None:
+            self.gridView.cellSize = cellSize
+
+        if gridLineWidthTuple is not None:
+            self.gridView.gridLineWidth, self.gridView.cellSizeOffset = gridLineWidthTuple
+
+        if self.gridView.cellSize <= self.gridView.gridCoordMarginHideCellSizeLimit:
+            # like when the grid view is zoomed out, the labels would not fit the cells
+            self.gridView.drawAxisLabel = False
+            self.gridView.gridCoordMarginSize = 0
+
+        self.gridView.setGridDimension()
+
+    def computeImageSize(self, rowStart, rowEnd, colStart, colEnd):
+        '''
+        Returns the size of the image of the cell zone [rowStart, rowEnd[ x [colStart, colEnd[.
+        The zone is followed by its closing grid line.
+
+        :return: width, height tuple in pixels
+        '''
+        cellPlusLineSizePx = self.gridView.cellSize + self.gridView.gridLineWidth
+        gridCoordMarginSize = self.gridView.gridCoordMarginSize
+
+        return gridCoordMarginSize + (colEnd - colStart) * cellPlusLineSizePx + self.gridView.gridLineWidth, \
+               gridCoordMarginSize + (rowEnd - rowStart) * cellPlusLineSizePx + self.gridView.gridLineWidth
+
+    def iterImageRowBands(self, rowStart, rowEnd, colStart, colEnd):
+        '''
+        Renders the cell zone [rowStart, rowEnd[ x [colStart, colEnd[ band of tiles after band
+        of tiles. The tiles of a band are cut to the band height, which is at most the tile
+        size and is limited so that a band does not exceed self.bandByteNumber bytes.
+
+        :return: generator of (band row number, image width, 3) uint8 RGB arrays
+        '''
+        gridView = self.gridView
+        gridCoordMarginSize = gridView.gridCoordMarginSize
+        cellPlusLineSizePx = gridView.cellSize + gridView.gridLineWidth
+        imageWidth, imageHeight = self.computeImageSize(rowStart, rowEnd, colStart, colEnd)
+        cellZoneWidth = imageWidth - gridCoordMarginSize
+        cellZoneHeight = imageHeight - gridCoordMarginSize
+        bandRowNumber = max(1, self.bandByteNumber // (imageWidth * 3))
+        tileTop = 0
+
+        while tileTop < cellZoneHeight:
+            # the first band includes the col label margin, which takes its share of the band
+            # rows
+            bandTop = 0 if tileTop == 0 else gridCoordMarginSize
+            tileHeight = max(1, min(self.tileSizePx, bandRowNumber - gridCoordMarginSize + bandTop, cellZoneHeight - tileTop))
+            band = np.empty((gridCoordMarginSize + tileHeight - bandTop, imageWidth, 3), dtype=np.uint8)
+
+            for tileLeft in range(0, cellZoneWidth, self.tileSizePx):
+                tileWidth = min(self.tileSizePx, cellZoneWidth - tileLeft)
+                gridView.gridOffsetXPx = colStart * cellPlusLineSizePx + tileLeft
+                gridView.gridOffsetYPx = rowStart * cellPlusLineSizePx + tileTop
+                gridView.updateStartDrawColIndex()
+                gridView.updateStartDrawRowIndex()
+                gridView.drawGrid()
+
+                # the first tile of the band includes the row label margin. surfarray arrays
+                # are indexed [x, y], hence the transposition
+                tileSurfaceLeft = 0 if tileLeft == 0 else gridCoordMarginSize
+                tilePixels = pg.surfarray.pixels3d(self.tileSurface)
+                band[:, tileSurfaceLeft + tileLeft:gridCoordMarginSize + tileLeft + tileWidth] = \
+                    tilePixels[tileSurfaceLeft:gridCoordMarginSize + tileWidth, bandTop:gridCoordMarginSize + tileHeight].transpose(1, 0, 2)
+
+                # releasing the surface lock acquired by pixels3d()
+                del tilePixels
+
+            yield band
+
+            tileTop += tileHeight
+
+    def writePng(self, filename, rowStart=0, rowEnd=None, colStart=0, colEnd=None):
+        '''
+        Writes the image of the cell zone [rowStart, rowEnd[ x [colStart, colEnd[ into the
+        passed PNG file. By default, the zone is the grid data extent.
+        '''
+        dataDimX, dataDimY = self.gridView.cellValueGrid.getDataExtent()
+
+        if rowEnd is None:
+            rowEnd = dataDimY
+
+        if colEnd is None:
+            colEnd = dataDimX
+
+        pngWriter = PngWriter(filename, *self.computeImageSize(rowStart, rowEnd, colStart, colEnd))
+
+        for band in self.iterImageRowBands(rowStart, rowEnd, colStart, colEnd):
+            pngWriter.writeRows(band)
+
+        pngWriter.close()
+
+    def writeFrameSequence(self, filenameFormat, frameNumber, stepFunction, rowStart=0, rowEnd=None, colStart=0, colEnd=None):
+        '''
+        Writes frameNumber PNG images of the cell zone [rowStart, rowEnd[ x [colStart, colEnd[,
+        the passed function being called between two frames to advance the cells. The zone
+        is the grid data extent before the first frame if it is not passed, so that all the
+        frames have the same size.
+
+        :param filenameFormat: file name format receiving the 0 based frame index, like
+                               frame_{:05d}.png
+        :param stepFunction: function advancing the cells rendered by this renderer
+
+        :return: list of the written file names
+        '''
+        dataDimX, dataDimY = self.gridView.cellValueGrid.getDataExtent()
+
+        if rowEnd is None:
+            rowEnd = dataDimY
+
+        if colEnd is None:
+            colEnd = dataDimX
+
+        filenames = []
+
+        for frameIndex in range(frameNumber):
+            if frameIndex > 0:
+                stepFunction()
+
+            filename = filenameFormat.format(frameIndex)
+            self.writePng(filename, rowStart, rowEnd, colStart, colEnd)
+            filenames.append(filename)
+
+        return filenames
+
+
+def parseRegion(regionStr):
+    '''
+    Parses a region argument.
+
+    :param regionStr: <row start>,<row end>,<col start>,<col end>, the ends being excluded
+
+    :raise argparse.ArgumentTypeError: if the argument is invalid
+
+    :return: (rowStart, rowEnd, colStart, colEnd) tuple
+    '''
+    try:
+        rowStart, rowEnd, colStart, colEnd = (int(coord) for coord in regionStr.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError('invalid region {}. Expected format: 0,100,0,200'.format(regionStr))
+
+    if not (0 <= rowStart < rowEnd and 0 <= colStart < colEnd):
+        raise argparse.ArgumentTypeError('invalid region {}. The starts must be lower than the ends'.format(regionStr))
+
+    return rowStart, rowEnd, colStart, colEnd
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Renders a grid data file into a PNG image or a PNG frame sequence.')
+    parser.add_argument('gridDataFilename', metavar='GRID_DATA_FILE', help='.csv or .grid grid data file')
+    parser.add_argument('pngFilename', metavar='PNG_FILE',
+                        help='image file name or, with --frames, file name format like frame_{:05d}.png')
+    parser.add_argument('-c', '--config', default=DEFAULT_CONFIG_FILENAME,
+                        help='configuration file. Default: ' + DEFAULT_CONFIG_FILENAME)
+    parser.add_argument('-s', '--cell-size', type=int, help='cell size in pixels. Default: the configured cell size')
+    parser.add_argument('-l', '--grid-line-width', type=lambda tupleStr: tuple(int(value) for value in tupleStr.split(',')),
+                        help='grid line width tuple, like 3,1. Default: the configured tuple')
+    parser.add_argument('-r', '--region', type=parseRegion,
+                        help='rendered cells as <row start>,<row end>,<col start>,<col end>. Default: the grid data extent')
+    parser.add_argument('-f', '--frames', type=int, default=0,
+                        help='number of frames, the generations being computed between the frames')
+    parser.add_argument('-n', '--steps', type=int, default=1, help='number of generations between two frames')
+    args = parser.parse_args(argv)
+
+    gridBatch = GridBatch(ConfigurationManager(args.config))
+    gridDataMgr = GridDataManager(configManager=gridBatch.configMgr)
+    gridDataMgr.filename = args.gridDataFilename
+    cellGrid = gridBatch.loadGridData(gridDataMgr)
+    gridRenderer = GridRenderer(gridBatch.configMgr, cellGrid, args.cell_size, args.grid_line_width)
+    region = args.region if args.region is not None else (0, None, 0, None)
+
+    if args.frames <= 0:
+        gridRenderer.writePng(args.pngFilename, *region)
+        return 0
+
+    filenameFormat = args.pngFilename
+
+    if '{' not in filenameFormat:
+        # frame.png is written as frame_00000.png, frame_00001.png, ...
+        filenameRoot, extension = os.path.splitext(filenameFormat)
+        filenameFormat = filenameRoot + '_{:05d}' + extension
+
+    def stepCells():
+        # the HashLife engine replaces the rendered cell grid
+        gridRenderer.gridView.cellValueGrid = gridBatch.stepCells(gridRenderer.gridView.cellValueGrid, args.steps)
+
+    gridRenderer.writeFrameSequence(filenameFormat, args.frames, stepCells, *region)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
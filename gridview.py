@@ -1,11 +1,22 @@
+import os
+import threading
+import time
+
+import numpy as np
 import pygame as pg
 
+from activetilemap import ActiveTileMap
+from axislabelcache import AxisLabelCache
+from cellgrid import CellGrid, ChunkedCellGrid, PackedCellGrid, UNBOUNDED_CELL_NUMBER, CELL_STORAGE_DENSE, CELL_STORAGE_SPARSE, CELL_STORAGE_MAPPED
 from centercell import CenterCell
-from griddatamanager import GridDataManager
-from cell import Cell
+from griddatamanager import GridDataManager, JOURNAL_COMPACTION_RECORD_NUMBER
+from exectracer import ExecTracer
+from hashlife import HashLife, HashLifeCellGrid
+from lifeengine import LifeEngine, LIFE_EDGES_BOUNDED, LIFE_ENGINE_VECTORIZED, LIFE_ENGINE_HASHLIFE
 from bordercell import BorderCell
 
 GRID_LINE_COLOR_BLACK = (0, 0, 0)
+GRID_BACKGROUND_COLOR_WHITE = (255, 255, 255)
 
 # Since one cell can occupy a minimum of 1 px and the grid line width
 # is 1 px at the minimum, 2 cells will require at least 1 + 1 + 1 + 1 + 1 = 5 px.
@@ -14,6 +25,16 @@ GRID_LINE_COLOR_BLACK = (0, 0, 0)
 # cell constant SMALLEST_CELL_REQUIRED_PX_NUMBER is 2 pixels.
 SMALLEST_CELL_REQUIRED_PX_NUMBER = 2
 
+# Active cell rendering modes. In rect mode, each visible active cell is drawn with its own
+# pg.draw.rect call. In blit mode, the visible cell window is converted to pixels with NumPy
+# and written to the surface at once.
+CELL_DRAW_MODE_RECT = 'rect'
+CELL_DRAW_MODE_BLIT = 'blit'
+
+# max number of cells changed by a generation which are repainted individually by the next
+# draw. Above, repainting the whole surface is cheaper
+MAX_DIRTY_CELL_NUMBER = 4096
+
 class GridView():
 
     def __init__(self, surface, configManager):
@@ -37,14 +58,38 @@ class GridView():
 
         self.setGridDimension()
 
-        # the max horz and vert cell number is set as below
-        self.horizontalMaxManagedCellNumber = (surface.get_width())
-        self.verticalMaxManagedCellNumber = (surface.get_height())
+        # the max horz and vert cell number is set as below. A dense cell grid is sized to
+        # the surface pixel dimensions. A sparse cell grid only allocates the tiles which
+        # contain alive cells and so can be much larger or even unbounded. A mapped cell grid
+        # takes the dimensions of the grid file it maps (see loadGridData())
+        self.cellStorage = configManager.cellStorage
+
+        if self.cellStorage == CELL_STORAGE_SPARSE:
+            sparseGridCellNumber = configManager.sparseGridCellNumber
+
+            if sparseGridCellNumber <= 0:
+                sparseGridCellNumber = UNBOUNDED_CELL_NUMBER
+
+            self.horizontalMaxManagedCellNumber = sparseGridCellNumber
+            self.verticalMaxManagedCellNumber = sparseGridCellNumber
+        else:
+            self.horizontalMaxManagedCellNumber = (surface.get_width())
+            self.verticalMaxManagedCellNumber = (surface.get_height())
 
         self.cellValueGrid = None
 
-        self.font = pg.font.SysFont('arial', configManager.gridAxisFontSize, False)
-        self.drawAxisLabel = True
+        self.cellDrawMode = CELL_DRAW_MODE_BLIT
+
+        # the border cell computations are only traced if the execution trace is enabled in
+        # the configuration file. Otherwise, tracing costs a single None test
+        if configManager.execTrace:
+            self.execTracer = ExecTracer()
+        else:
+            self.execTracer = None
+
+        # the row/col number labels are rendered once and then reused from the cache
+        self.axisLabelCache = AxisLabelCache(configManager.gridAxisFontSize)
+        self.__drawAxisLabel = True
 
         # when opening the grid windows, the visible part of the cells is set at the very
         # left and very top. This means that the self.gridOffsetXPx and self.gridOffsetYPx
@@ -58,6 +103,105 @@ class GridView():
         self.startDrawRowIndex = 0
         self.startDrawColIndex = 0
 
+        # cached cell zone background on which the grid lines are drawn. The key stores the
+        # values the layer was generated for. See getGridLineLayer().
+        self.gridLineLayer = None
+        self.gridLineLayerKey = None
+
+        # horizontal and vertical grid offset change in pixels caused by the moves done since
+        # the last draw. If the grid view was not otherwise changed, the moves are drawn by
+        # scrolling the previously drawn frame by those offsets.
+        self.pendingScrollXPx = 0
+        self.pendingScrollYPx = 0
+
+        # (row, col) tuples of the cells toggled since the last draw. If the grid view was not
+        # otherwise changed, only those cells are repainted.
+        self.dirtyCells = []
+
+        # (tile row, tile col) tuples of the tiles changed by the generations computed since
+        # the last draw, when they changed too many cells to be repainted individually. If the
+        # grid view was not otherwise changed, only those tiles are repainted.
+        self.dirtyTiles = set()
+
+        # background grid data loading state. See startLoadGridData(). The event is set by
+        # the loading thread each time a batch of rows was loaded into the cell grid
+        self.gridDataLoadThread = None
+        self.gridDataLoadUpdated = threading.Event()
+        self.gridDataLoadProgressRatio = 0
+        self.gridDataLoadError = None
+
+        # background grid data saving state. See startSaveGridData(). The cell grid version is
+        # incremented each time a cell is modified, so that an unchanged grid is not autosaved
+        self.gridDataSaveThread = None
+        self.gridDataSaveError = None
+
+        # cell grid written by the saving thread, its target file name and True if the saved
+        # grid maps this file, which is then replaced by the main thread (see
+        # waitGridDataSaved())
+        self.gridDataSaveCellGrid = None
+        self.gridDataSaveFilename = None
+        self.mappedGridDataWritePending = False
+        self.autosaveInterval = configManager.autosaveInterval
+        self.lastAutosaveTime = time.monotonic()
+        self.cellGridVersion = 0
+        self.autosavedCellGridVersion = 0
+
+        # cell edits not yet appended to the edit journal. See flushEditJournal()
+        self.editJournal = configManager.editJournal
+        self.pendingJournalEdits = []
+
+        # True if the cells were changed by HashLife generations, which are not journaled
+        self.journalOutdated = False
+
+        # True once the cell grid was loaded from or saved into the grid data file. The edit
+        # journal applies to this file, so that the edits of a grid initialised with neutral
+        # data are not journaled, otherwise they would be merged into the file
+        self.gridDataFileLoaded = False
+
+        # the edges of an unbounded sparse grid can not be wrapped
+        lifeEdges = configManager.lifeEdges
+
+        if self.horizontalMaxManagedCellNumber >= UNBOUNDED_CELL_NUMBER:
+            lifeEdges = LIFE_EDGES_BOUNDED
+
+        self.lifeEngine = LifeEngine(configManager.lifeRule, lifeEdges, configManager.lifeWorkerNumber)
+
+        # tracks the tiles changed by the last generation or edited since, so that the next
+        # generation is only computed on them and their neighbor tiles
+        self.activeTileMap = ActiveTileMap()
+
+        # with the HashLife engine, the cell grid is imported into a HashLifeCellGrid at the
+        # first step. Then, the grid view draws and edits the quadtree directly
+        if configManager.lifeEngine == LIFE_ENGINE_HASHLIFE:
+            self.hashLife = HashLife(configManager.lifeRule)
+        else:
+            self.hashLife = None
+
+        self.hashLifeStepExponent = configManager.hashLifeStepExponent
+
+    @property
+    def drawAxisLabel(self):
+        return self.__drawAxisLabel
+
+    @drawAxisLabel.setter
+    def drawAxisLabel(self, doDrawAxisLabel):
+        if doDrawAxisLabel != self.__drawAxisLabel:
+            # the cached labels are released when the labels are hidden and rendered again
+            # when they are shown
+            self.axisLabelCache.clear()
+
+        self.__drawAxisLabel = doDrawAxisLabel
+
+    def setGridAxisFontSize(self, gridAxisFontSize):
+        '''
+        Changes the size of the font used to draw the row/col number labels. The label cache
+        is invalidated if the size changed.
+
+        :param gridAxisFontSize: new font size
+        '''
+        self.axisLabelCache.setFontSize(gridAxisFontSize)
+        self.changed = True
+
     def setStartPattern(self):
         pass
 
@@ -71,120 +215,441 @@ class GridView():
         self.gridViewDisplayableRowNb = (self.surface.get_height() - self.gridCoordMarginSize - self.gridLineWidth) // (self.cellSize + self.gridLineWidth)
 
     def draw(self):
-        drawnedRowNumber = self.gridViewDisplayableRowNb
-        row = 0
-        currentRowIndex = self.gridOffsetYPx // (self.cellSize + self.gridLineWidth)
-
-        # for all the lines, drawing the y axis line number label and the horizontal line itself
-
-        while row <= drawnedRowNumber:
-            drawnedRowYCoord = self.gridCoordMarginSize - self.gridOffsetYPx + (currentRowIndex * (self.cellSize + self.gridLineWidth))
-
-            if self.drawAxisLabel:
-                if drawnedRowYCoord < self.gridCoordMarginSize // 2:
-                    # this happens when the grid view is down shifted (down arrow or mouse down)
-                    # so that more than half of the top most cell row is hidden. in this case,
-                    # the row number is not written
-                    pass
-                else:
-                    if currentRowIndex < 10:
-                        ident = '  '
-                    elif currentRowIndex < 100:
-                        ident = ' '
-                    else:
-                        ident = ''
-
-                    rowNumberLabel = self.font.render(ident + str(currentRowIndex), 1, (0, 0, 0))
-                    self.surface.blit(rowNumberLabel, (0, drawnedRowYCoord))
-
-            row += 1
+        '''
+        Redraws what changed since the previous call. If the grid view was zoomed or reloaded
+        (self.changed is True), the whole surface is repainted. If it was only moved, the
+        previously drawn cell zone is scrolled and only the newly exposed strips and the grid
+        coord margins are drawn. Finally, the tiles and the cells changed since the
+        previous call are repainted.
+
+        :return: list of the pg.Rect's which were updated on the surface, to be passed to
+                 pg.display.update(). The list is empty if nothing was drawn.
+        '''
+        if self.gridDataLoadUpdated.is_set():
+            # the rows loaded by the loading thread since the previous call are drawn. The
+            # event is cleared before drawing so that the rows loaded meanwhile are drawn by
+            # the next call
+            self.gridDataLoadUpdated.clear()
+            self.raiseGridDataLoadError()
+            self.changed = True
+
+        if self.changed:
+            self.drawGrid()
+            updatedRects = [self.surface.get_rect()]
+        elif self.pendingScrollXPx != 0 or self.pendingScrollYPx != 0:
+            updatedRects = self.scrollGrid() + self.drawDirtyTiles() + self.drawDirtyCells()
+        else:
+            updatedRects = self.drawDirtyTiles() + self.drawDirtyCells()
+
+        self.dirtyCells = []
+        self.dirtyTiles = set()
+        self.pendingScrollXPx = 0
+        self.pendingScrollYPx = 0
+        self.changed = False
+
+        return updatedRects
+
+    def isDrawPending(self):
+        '''
+        Returns True if the grid view changed since the previous draw, i.e. if calling draw()
+        would update the surface.
+        '''
+        return self.changed or self.gridDataLoadUpdated.is_set() or \
+            self.pendingScrollXPx != 0 or self.pendingScrollYPx != 0 or \
+            bool(self.dirtyCells) or bool(self.dirtyTiles)
+
+    def drawGrid(self):
+        '''
+        Repaints the whole surface: the grid coord margin labels, the grid lines and the
+        active cells.
+        '''
+        self.surface.fill(GRID_BACKGROUND_COLOR_WHITE)
+        self.drawAxisLabels()
+        self.drawCellZone()
+
+    def scrollGrid(self):
+        '''
+        Reuses the previously drawn frame after the grid view was moved: the cell zone pixels
+        are shifted with Surface.scroll() by the pending scroll offset and only the strips
+        exposed by the move are drawn, followed by the grid coord margins. If the move is
+        larger than the cell zone, the whole surface is repainted.
+
+        :return: list of the updated pg.Rect's
+        '''
+        cellZoneRect = self.getCellZoneRect()
+
+        # a positive grid offset change moves the cells to the left or to the top
+        scrollXPx = -self.pendingScrollXPx
+        scrollYPx = -self.pendingScrollYPx
+
+        if abs(scrollXPx) >= cellZoneRect.width or abs(scrollYPx) >= cellZoneRect.height:
+            self.drawGrid()
+            return [self.surface.get_rect()]
+
+        self.surface.subsurface(cellZoneRect).scroll(scrollXPx, scrollYPx)
+
+        if scrollXPx > 0:
+            self.drawCellZone(pg.Rect(cellZoneRect.left, cellZoneRect.top, scrollXPx, cellZoneRect.height))
+        elif scrollXPx < 0:
+            self.drawCellZone(pg.Rect(cellZoneRect.right + scrollXPx, cellZoneRect.top, -scrollXPx, cellZoneRect.height))
+
+        if scrollYPx > 0:
+            self.drawCellZone(pg.Rect(cellZoneRect.left, cellZoneRect.top, cellZoneRect.width, scrollYPx))
+        elif scrollYPx < 0:
+            self.drawCellZone(pg.Rect(cellZoneRect.left, cellZoneRect.bottom + scrollYPx, cellZoneRect.width, -scrollYPx))
+
+        self.drawAxisLabels()
+
+        return [self.surface.get_rect()]
+
+    def getCellZoneRect(self):
+        '''
+        Returns the surface rectangle where the cells and the grid lines are drawn, i.e. the
+        surface without the grid coord margins.
+
+        :return: pg.Rect
+        '''
+        return pg.Rect(self.gridCoordMarginSize,
+                       self.gridCoordMarginSize,
+                       self.surface.get_width() - self.gridCoordMarginSize,
+                       self.surface.get_height() - self.gridCoordMarginSize)
+
+    def drawAxisLabels(self):
+        '''
+        Clears the grid coord margins and draws the row numbers in the left margin and the
+        col numbers in the top margin.
+        '''
+        if self.gridCoordMarginSize <= 0:
+            return
+
+        surfaceWidth = self.surface.get_width()
+        surfaceHeight = self.surface.get_height()
+
+        # the labels are clipped to their margin so that they never overwrite the cell zone
+        colLabelMarginRect = pg.Rect(0, 0, surfaceWidth, self.gridCoordMarginSize)
+        rowLabelMarginRect = pg.Rect(0, 0, self.gridCoordMarginSize, surfaceHeight)
+        self.surface.fill(GRID_BACKGROUND_COLOR_WHITE, colLabelMarginRect)
+        self.surface.fill(GRID_BACKGROUND_COLOR_WHITE, rowLabelMarginRect)
+
+        if not self.drawAxisLabel:
+            return
+
+        cellPlusLineSizePx = self.cellSize + self.gridLineWidth
+
+        # for all the rows, drawing the y axis row number label
+
+        self.surface.set_clip(rowLabelMarginRect)
+        currentRowIndex = self.gridOffsetYPx // cellPlusLineSizePx
+        drawnedRowYCoord = self.gridCoordMarginSize - self.gridOffsetYPx + (currentRowIndex * cellPlusLineSizePx)
+
+        while drawnedRowYCoord < surfaceHeight:
+            if drawnedRowYCoord < self.gridCoordMarginSize // 2:
+                # this happens when the grid view is down shifted (down arrow or mouse down)
+                # so that more than half of the top most cell row is hidden. in this case,
+                # the row number is not written
+                pass
+            else:
+                self.surface.blit(self.axisLabelCache.getLabel(currentRowIndex), (0, drawnedRowYCoord))
+
             currentRowIndex += 1
+            drawnedRowYCoord += cellPlusLineSizePx
 
-            # drawing the row horizontal line
+        # for all the columns, drawing the x axis column number label
 
-            if drawnedRowYCoord < self.gridCoordMarginSize:
-                # We do not draw the line if its y coordinate is less than the grid
-                # coordinates margin size. Since the line was skipped, it must be replaced
-                # by a supplementary line at the bottom of the grid
-                drawnedRowNumber += 1
-                continue
+        self.surface.set_clip(colLabelMarginRect)
+        currentColIndex = self.gridOffsetXPx // cellPlusLineSizePx
+        drawnedColXCoord = self.gridCoordMarginSize - self.gridOffsetXPx + currentColIndex * cellPlusLineSizePx
+
+        while drawnedColXCoord < surfaceWidth:
+            if drawnedColXCoord < self.gridCoordMarginSize // 2:
+                # this happens when the grid view is right shifted (right arrow or mouse)
+                # so that more than half of the left most cells is hidden. Then, the col
+                # number is not written
+                pass
             else:
-                pg.draw.line(self.surface, GRID_LINE_COLOR_BLACK, (self.gridCoordMarginSize, drawnedRowYCoord), (self.surface.get_width(), drawnedRowYCoord), self.gridLineWidth)
-
-        # for all the columns, drawing the x axis column label and the column vertical line itself
-
-        drawnedColNumber = self.gridViewDisplayableColNb
-        col = 0
-        currentColIndex = self.gridOffsetXPx // (self.cellSize + self.gridLineWidth)
-
-        while col <= drawnedColNumber:
-            drawnedColXCoord = self.gridCoordMarginSize - self.gridOffsetXPx + currentColIndex * (self.cellSize + self.gridLineWidth)
-
-            # handling column number label
-
-            if self.drawAxisLabel:
-                if drawnedColXCoord < self.gridCoordMarginSize // 2:
-                    # this happens when the grid view is right shifted (right arrow or mouse)
-                    # so that more than half of the left most cells is hidden. Then, the col
-                    # number is not written
-                    pass
-                else:
-                    if currentColIndex < 10:
-                        ident = '  '
-                    elif currentColIndex < 100:
-                        ident = ' '
-                    else:
-                        ident = ''
-                    colNumberLabel = self.font.render(ident + str(currentColIndex), 1, (0, 0, 0))
-                    self.surface.blit(colNumberLabel, (drawnedColXCoord, 1))
-
-            col += 1
+                self.surface.blit(self.axisLabelCache.getLabel(currentColIndex), (drawnedColXCoord, 1))
+
             currentColIndex += 1
+            drawnedColXCoord += cellPlusLineSizePx
+
+        self.surface.set_clip(None)
+
+    def drawCellZone(self, drawRect=None):
+        '''
+        Draws the white background, the grid lines and the active cells located in drawRect. Nothing is drawn
+        outside of drawRect.
+
+        :param drawRect: pg.Rect limiting the drawn zone or None to draw the whole cell
+                         display zone
+        '''
+        cellZoneRect = self.getCellZoneRect()
 
-            # drawing the column vertical line
+        if drawRect is not None:
+            cellZoneRect = cellZoneRect.clip(drawRect)
 
-            if drawnedColXCoord < self.gridCoordMarginSize:
-                # We do not draw the column line if its x coordinate is less than the grid
-                # coordinates margin size. Since the column was skipped, it must be replaced
-                # by a supplementary column at the very right of the grid
-                drawnedColNumber += 1
+        if cellZoneRect.width <= 0 or cellZoneRect.height <= 0:
+            return
+
+        self.surface.set_clip(cellZoneRect)
+
+        # drawing the white background and the grid lines by blitting the cached grid line
+        # layer, shifted according to the grid offset modulo the cell + grid line size
+        cellPlusLineSizePx = self.cellSize + self.gridLineWidth
+        self.surface.blit(self.getGridLineLayer(),
+                          (self.gridCoordMarginSize - cellPlusLineSizePx - self.gridOffsetXPx % cellPlusLineSizePx,
+                           self.gridCoordMarginSize - cellPlusLineSizePx - self.gridOffsetYPx % cellPlusLineSizePx))
+
+        # drawing active cells
+
+        if self.cellDrawMode == CELL_DRAW_MODE_BLIT:
+            self.blitActiveCells(cellZoneRect)
+        else:
+            self.drawActiveCellRects(cellZoneRect)
+
+        self.surface.set_clip(None)
+
+    def getGridLineLayer(self):
+        '''
+        Returns the background layer surface of the cell zone: a white surface on which the
+        horizontal and vertical grid lines are drawn every cell size + grid line width pixels.
+        Since the line pattern only depends on the cell size, the grid line width and the cell
+        zone size, the layer is generated once and regenerated only when one of them changed,
+        i.e. after a zoom or a grid coord margin change.
+
+        The layer is one cell + grid line size larger than the cell zone on each side, so that
+        it can be blitted at any offset modulo the cell + grid line size. Its first row and col
+        lines are located at one cell + grid line size from its top left corner.
+
+        :return: pg.Surface
+        '''
+        cellZoneRect = self.getCellZoneRect()
+        gridLineLayerKey = (self.cellSize, self.gridLineWidth, cellZoneRect.size)
+
+        if self.gridLineLayer is not None and self.gridLineLayerKey == gridLineLayerKey:
+            return self.gridLineLayer
+
+        cellPlusLineSizePx = self.cellSize + self.gridLineWidth
+        layerWidth = cellZoneRect.width + 2 * cellPlusLineSizePx
+        layerHeight = cellZoneRect.height + 2 * cellPlusLineSizePx
+
+        # creating the layer with the same pixel format as the surface makes blitting it a
+        # simple memory copy
+        gridLineLayer = pg.Surface((layerWidth, layerHeight), 0, self.surface)
+        gridLineLayer.fill(GRID_BACKGROUND_COLOR_WHITE)
+
+        for lineCoord in range(cellPlusLineSizePx, layerHeight, cellPlusLineSizePx):
+            pg.draw.line(gridLineLayer, GRID_LINE_COLOR_BLACK, (0, lineCoord), (layerWidth, lineCoord), self.gridLineWidth)
+
+        for lineCoord in range(cellPlusLineSizePx, layerWidth, cellPlusLineSizePx):
+            pg.draw.line(gridLineLayer, GRID_LINE_COLOR_BLACK, (lineCoord, 0), (lineCoord, layerHeight), self.gridLineWidth)
+
+        self.gridLineLayer = gridLineLayer
+        self.gridLineLayerKey = gridLineLayerKey
+
+        return gridLineLayer
+
+    def drawDirtyCells(self):
+        '''
+        Repaints only the cells toggled since the previous draw, leaving the rest of the surface
+        untouched.
+
+        :return: list of the updated pg.Rect's
+        '''
+        updatedRects = []
+
+        for row, col in self.dirtyCells:
+            cellRect = self.computeVisibleCellRect(row, col)
+
+            if cellRect is None:
                 continue
+
+            if self.cellValueGrid.getCell(row, col):
+                self.surface.fill(self.activeCellColor, cellRect)
             else:
-                pg.draw.line(self.surface, GRID_LINE_COLOR_BLACK, (drawnedColXCoord, self.gridCoordMarginSize), (drawnedColXCoord, self.surface.get_height()), self.gridLineWidth)
+                self.surface.fill(GRID_BACKGROUND_COLOR_WHITE, cellRect)
 
-        # drawing active cells
+            updatedRects.append(cellRect)
+
+        return updatedRects
+
+    def drawDirtyTiles(self):
+        '''
+        Repaints only the tiles changed by the generations computed since the previous draw,
+        leaving the rest of the surface untouched. The tiles located outside of the displayed
+        cell zone are skipped.
+
+        :return: list of the updated pg.Rect's
+        '''
+        updatedRects = []
+
+        if not self.dirtyTiles:
+            return updatedRects
+
+        tileSize = self.activeTileMap.tileSize
+        cellPlusLineSizePx = self.cellSize + self.gridLineWidth
+        tilePx = tileSize * cellPlusLineSizePx
+        firstCellXCoordPx = self.gridCoordMarginSize + self.gridLineWidth - self.cellSizeOffset - self.gridOffsetXPx
+        firstCellYCoordPx = self.gridCoordMarginSize + self.gridLineWidth - self.cellSizeOffset - self.gridOffsetYPx
+        cellZoneRect = self.getCellZoneRect()
+
+        for tileRow, tileCol in self.dirtyTiles:
+            # the tile coordinates are clipped to the cell zone before creating the pg.Rect,
+            # since the pixel coordinates of a far tile of a huge grid overflow pg.Rect
+            left = max(firstCellXCoordPx + tileCol * tilePx, cellZoneRect.left)
+            top = max(firstCellYCoordPx + tileRow * tilePx, cellZoneRect.top)
+            right = min(firstCellXCoordPx + (tileCol + 1) * tilePx, cellZoneRect.right)
+            bottom = min(firstCellYCoordPx + (tileRow + 1) * tilePx, cellZoneRect.bottom)
+
+            if right <= left or bottom <= top:
+                continue
+
+            tileRect = pg.Rect(left, top, right - left, bottom - top)
+            self.drawCellZone(tileRect)
+            updatedRects.append(tileRect)
 
+        return updatedRects
+
+    def computeVisibleCellRect(self, row, col):
+        '''
+        Computes the rectangle occupied on the surface by the visible part of the cell located
+        at row, col. The cell rectangle is clipped to the cell display zone so that neither the
+        grid coord margins nor pixels outside of the surface are included.
+
+        :return: pg.Rect or None if the cell is not visible
+        '''
+        cellPlusLineSizePx = self.cellSize + self.gridLineWidth
+        cellRect = pg.Rect(self.gridCoordMarginSize + self.gridLineWidth - self.cellSizeOffset - self.gridOffsetXPx + cellPlusLineSizePx * col,
+                           self.gridCoordMarginSize + self.gridLineWidth - self.cellSizeOffset - self.gridOffsetYPx + cellPlusLineSizePx * row,
+                           self.cellSize,
+                           self.cellSize)
+        cellZoneRect = self.getCellZoneRect()
+        cellRect = cellRect.clip(cellZoneRect)
+
+        if cellRect.width <= 0 or cellRect.height <= 0:
+            return None
+
+        return cellRect
+
+    def drawActiveCellRects(self, drawRect=None):
+        '''
+        Draws the active cells one by one, issuing one pg.draw.rect call per visible active
+        cell. This is the CELL_DRAW_MODE_RECT rendering mode.
+
+        The clipped top left coordinates and sizes of all the visible rows and cols are
+        computed once per call by BorderCell.computeCellCoordsAndSizes(), so that drawing
+        a cell only requires indexing the precomputed arrays.
+
+        :param drawRect: pg.Rect limiting the drawn zone or None to draw the whole cell display
+                         zone
+        '''
+        startDrawRowIndex = self.startDrawRowIndex
+        startDrawColIndex = self.startDrawColIndex
         maxDrawnedRowIndex = min(self.verticalMaxManagedCellNumber, self.gridViewDisplayableRowNb + self.startDrawRowIndex + 2)
         maxDrawnedColIndex = min(self.horizontalMaxManagedCellNumber, self.startDrawColIndex + self.gridViewDisplayableColNb + 2)
 
-        for row in range(self.startDrawRowIndex, maxDrawnedRowIndex):
-            for col in range(self.startDrawColIndex, maxDrawnedColIndex):
-                if self.cellValueGrid[row][col]:
-                    # calculating active cell top left x coord
-
-                    if col == self.startDrawColIndex or col == maxDrawnedColIndex - 1:
-                        # current active cell is at the left or right grid view border and
-                        # may have to be partially drawned
-                        drawnedCellXCoord, drawnedCellWidth = BorderCell.computeBorderCellCoordAndSize(self, col, doComputeX=True)
-                    else:
-                        drawnedCellXCoord, drawnedCellWidth = Cell.computeBorderIndependentCellXCoord(self, col), self.cellSize
-
-                    # calculating active cell top left y coord
-
-                    if row == self.startDrawRowIndex or row == maxDrawnedRowIndex - 1:
-                        # current active cell is at the top or bottom grid view border and
-                        # may have to be partially drawned
-                        drawnedCellYCoord, drawnedCellHeight = BorderCell.computeBorderCellCoordAndSize(self, row, doComputeX=False)
-                    else:
-                        drawnedCellYCoord, drawnedCellHeight = Cell.computeBorderIndependentCellYCoord(self, row), self.cellSize
-                    pg.draw.rect(self.surface,
-                                 self.activeCellColor,
-                                 [drawnedCellXCoord - self.cellSizeOffset,
-                                      drawnedCellYCoord - self.cellSizeOffset,
-                                      drawnedCellWidth,
-                                      drawnedCellHeight])
+        if drawRect is not None:
+            # only the rows and cols crossing drawRect are drawn
+            cellPlusLineSizePx = self.cellSize + self.gridLineWidth
+            firstCellXCoordPx = self.gridCoordMarginSize + self.gridLineWidth - self.cellSizeOffset - self.gridOffsetXPx
+            firstCellYCoordPx = self.gridCoordMarginSize + self.gridLineWidth - self.cellSizeOffset - self.gridOffsetYPx
+            startDrawColIndex = max(startDrawColIndex, (drawRect.left - firstCellXCoordPx) // cellPlusLineSizePx)
+            startDrawRowIndex = max(startDrawRowIndex, (drawRect.top - firstCellYCoordPx) // cellPlusLineSizePx)
+            maxDrawnedColIndex = min(maxDrawnedColIndex, (drawRect.right - firstCellXCoordPx) // cellPlusLineSizePx + 1)
+            maxDrawnedRowIndex = min(maxDrawnedRowIndex, (drawRect.bottom - firstCellYCoordPx) // cellPlusLineSizePx + 1)
+
+        if maxDrawnedRowIndex <= startDrawRowIndex or maxDrawnedColIndex <= startDrawColIndex:
+            return
 
-        self.changed = False
+        drawnedCellXCoords, drawnedCellWidths = BorderCell.computeCellCoordsAndSizes(self, startDrawColIndex, maxDrawnedColIndex, doComputeX=True)
+        drawnedCellYCoords, drawnedCellHeights = BorderCell.computeCellCoordsAndSizes(self, startDrawRowIndex, maxDrawnedRowIndex, doComputeX=False)
+        drawnedCellXCoords = drawnedCellXCoords.tolist()
+        drawnedCellWidths = drawnedCellWidths.tolist()
+        drawnedCellYCoords = drawnedCellYCoords.tolist()
+        drawnedCellHeights = drawnedCellHeights.tolist()
+
+        visibleCells = self.cellValueGrid.getWindow(startDrawRowIndex, maxDrawnedRowIndex, startDrawColIndex, maxDrawnedColIndex)
+        activeRowOffsets, activeColOffsets = np.nonzero(visibleCells)
+
+        for rowOffset, colOffset in zip(activeRowOffsets.tolist(), activeColOffsets.tolist()):
+            pg.draw.rect(self.surface,
+                         self.activeCellColor,
+                         [drawnedCellXCoords[colOffset],
+                          drawnedCellYCoords[rowOffset],
+                          drawnedCellWidths[colOffset],
+                          drawnedCellHeights[rowOffset]])
+
+    def blitActiveCells(self, drawRect=None):
+        '''
+        Draws the active cells located in drawRect in one shot. This is the CELL_DRAW_MODE_BLIT
+        rendering mode.
+
+        Instead of looping over the visible cells, the row and col index of every pixel of the
+        cell display zone is computed with NumPy. The visible window of the cell grid is then
+        scaled to pixel size by indexing it with those pixel row/col indexes, the pixels located
+        on the grid lines are masked out and the resulting mask is written at once in the surface
+        pixel array. The cost of a frame is so roughly independent of the number of active cells.
+
+        :param drawRect: pg.Rect limiting the drawn zone or None to draw the whole cell display
+                         zone
+        '''
+        cellZoneRect = self.getCellZoneRect()
+
+        if drawRect is not None:
+            cellZoneRect = cellZoneRect.clip(drawRect)
+
+        if cellZoneRect.width <= 0 or cellZoneRect.height <= 0:
+            return
+
+        colIndexes, isCellPxX = self.computePixelCellIndexes(cellZoneRect.left, cellZoneRect.right, self.gridOffsetXPx, self.horizontalMaxManagedCellNumber)
+        rowIndexes, isCellPxY = self.computePixelCellIndexes(cellZoneRect.top, cellZoneRect.bottom, self.gridOffsetYPx, self.verticalMaxManagedCellNumber)
+
+        if not isCellPxX.any() or not isCellPxY.any():
+            return
+
+        minCol = colIndexes[isCellPxX].min()
+        minRow = rowIndexes[isCellPxY].min()
+        visibleCells = self.cellValueGrid.getWindow(minRow, rowIndexes[isCellPxY].max() + 1, minCol, colIndexes[isCellPxX].max() + 1)
+
+        if not visibleCells.any():
+            return
+
+        # scaling the visible cell window to pixel size. The pixels which are not inside a
+        # cell (grid line pixels or pixels beyond the managed cells) are then masked out
+        activePxMask = visibleCells[np.ix_(np.clip(rowIndexes - minRow, 0, visibleCells.shape[0] - 1),
+                                           np.clip(colIndexes - minCol, 0, visibleCells.shape[1] - 1))].astype(bool)
+        activePxMask &= isCellPxY[:, np.newaxis]
+        activePxMask &= isCellPxX[np.newaxis, :]
+
+        # surfarray pixel arrays are indexed [x, y], hence the mask transposition
+        surfacePixels = pg.surfarray.pixels2d(self.surface)
+        surfacePixels[cellZoneRect.left:cellZoneRect.right, cellZoneRect.top:cellZoneRect.bottom][activePxMask.T] = self.surface.map_rgb(self.activeCellColor)
+
+        # releasing the surface lock acquired by pixels2d()
+        del surfacePixels
+
+    def computePixelCellIndexes(self, startCoordPx, endCoordPx, gridOffsetPx, maxManagedCellNumber):
+        '''
+        Computes for each pixel coordinate in [startCoordPx, endCoordPx[ the 0 based index of
+        the cell row or col it belongs to as well as a boolean telling if the pixel is located
+        inside the cell and not on a grid line or beyond the managed cells.
+
+        :param startCoordPx: first x or y pixel coordinate
+        :param endCoordPx: x or y pixel coordinate following the last one
+        :param gridOffsetPx: self.gridOffsetXPx or self.gridOffsetYPx
+        :param maxManagedCellNumber: horizontal or vertical max managed cell number
+
+        :return: cellIndexes int array, isCellPx bool array
+        '''
+        cellPlusLineSizePx = self.cellSize + self.gridLineWidth
+
+        # x or y pixel coordinate of the top left corner of the cell with index 0
+        firstCellCoordPx = self.gridCoordMarginSize + self.gridLineWidth - self.cellSizeOffset - gridOffsetPx
+
+        cellRelativeCoordPx = np.arange(startCoordPx, endCoordPx) - firstCellCoordPx
+        cellIndexes = cellRelativeCoordPx // cellPlusLineSizePx
+        isCellPx = (cellRelativeCoordPx % cellPlusLineSizePx < self.cellSize) & (cellIndexes >= 0) & (cellIndexes < maxManagedCellNumber)
+
+        return cellIndexes, isCellPx
 
     def zoomIn(self):
         midCellBeforeZoom = CenterCell(self)
@@ -211,7 +676,6 @@ class GridView():
         self.moveViewDown(-zoomYOffset)
 
         self.changed = True
-        print(self.cellSize)
 
     def zoomOut(self):
         midCellBeforeZoom = CenterCell(self)
@@ -272,9 +736,10 @@ class GridView():
             #for a cell outside of the internal cell value grid
             return
 
+        # the move is drawn by scrolling the previously drawn frame
+        self.pendingScrollYPx += newGridYOffset - self.gridOffsetYPx
         self.gridOffsetYPx = newGridYOffset
         self.updateStartDrawRowIndex()
-        self.changed = True
 
     def moveViewToTop(self):
         '''
@@ -285,6 +750,7 @@ class GridView():
         self.changed = True
 
     def moveViewUp(self, pixels):
+        previousGridOffsetYPx = self.gridOffsetYPx
         self.gridOffsetYPx -= pixels
         maxAllowedOffsetYPx = self.computeMaxAllowedVerticalOffsetPx()
 
@@ -294,8 +760,9 @@ class GridView():
             # this can happen when zooming out and recentring the displayed zone
             self.gridOffsetYPx = maxAllowedOffsetYPx
 
+        # the move is drawn by scrolling the previously drawn frame
+        self.pendingScrollYPx += self.gridOffsetYPx - previousGridOffsetYPx
         self.updateStartDrawRowIndex()
-        self.changed = True
 
     def moveViewToBottom(self):
         '''
@@ -314,9 +781,10 @@ class GridView():
             #for a cell outside of the internal cell value grid
             return
 
+        # the move is drawn by scrolling the previously drawn frame
+        self.pendingScrollXPx += newGridXOffsetPx - self.gridOffsetXPx
         self.gridOffsetXPx = newGridXOffsetPx
         self.updateStartDrawColIndex()
-        self.changed = True
 
     def moveViewToRightEnd(self):
         '''
@@ -374,6 +842,7 @@ class GridView():
         return int(maxAllowedVerticalOffsetPx)
 
     def moveViewLeft(self, pixels):
+        previousGridOffsetXPx = self.gridOffsetXPx
         self.gridOffsetXPx -= pixels
         maxAllowedOffsetXPx = self.computeMaxAllowedHorizontalOffsetPx()
 
@@ -383,8 +852,9 @@ class GridView():
             # this can happen when zooming out and recentring the displayed zone
             self.gridOffsetXPx = maxAllowedOffsetXPx
 
+        # the move is drawn by scrolling the previously drawn frame
+        self.pendingScrollXPx += self.gridOffsetXPx - previousGridOffsetXPx
         self.updateStartDrawColIndex()
-        self.changed = True
 
     def moveViewToLeftHome(self):
         '''
@@ -418,20 +888,316 @@ class GridView():
         '''
         self.startDrawRowIndex = self.gridOffsetYPx // (self.cellSize + self.gridLineWidth)
 
-    def toggleCell(self, xyMousePosTuple):
+    def computeCellRowCol(self, xyMousePosTuple):
+        '''
+        Returns the 0 based row and col index of the cell located at the passed mouse position.
+
+        :param xyMousePosTuple: x, y surface coordinates in pixels
+
+        :return: row, col tuple
+        '''
         x, y = xyMousePosTuple
         col = (x - self.gridCoordMarginSize - self.gridLineWidth + self.gridOffsetXPx) // (self.gridLineWidth + self.cellSize)
         row = (y - self.gridCoordMarginSize - self.gridLineWidth + self.gridOffsetYPx) // (self.gridLineWidth + self.cellSize)
 
-        if self.cellValueGrid[row][col]:
-            self.cellValueGrid[row][col] = 0
+        return row, col
+
+    def toggleCell(self, xyMousePosTuple):
+        if self.isCellGridLocked():
+            # the toggled cell could be overwritten by the rows being loaded or be missing
+            # from the mapped grid being saved
+            return
+
+        row, col = self.computeCellRowCol(xyMousePosTuple)
+
+        if row < 0 or col < 0 or row >= self.verticalMaxManagedCellNumber or col >= self.horizontalMaxManagedCellNumber:
+            # the mouse is located on the grid coord margins or beyond the last cell
+            return
+
+        if self.cellValueGrid.getCell(row, col):
+            self.cellValueGrid.setCell(row, col, 0)
         else:
-            self.cellValueGrid[row][col] = 1
+            self.cellValueGrid.setCell(row, col, 1)
 
-        self.changed = True
+        # only the toggled cell will be repainted by the next draw
+        self.dirtyCells.append((row, col))
+        self.activeTileMap.addChangedCells([row], [col])
+        self.cellGridVersion += 1
+
+        if self.editJournal:
+            self.pendingJournalEdits.append((row, col, int(self.cellValueGrid.getCell(row, col))))
 
     def saveGridData(self):
+        # saving a partially loaded grid would truncate the grid data file
+        self.waitGridDataLoaded()
+        self.waitGridDataSaved()
         self.gridDataMgr.writeGridData(self.cellValueGrid)
+        self.gridDataFileLoaded = True
+
+    def startSaveGridData(self, filename=None):
+        '''
+        Saves the grid data on a worker thread, so that saving a big grid does not stall the
+        game loop. The worker thread writes a copy of the cell grid, which can so be modified
+        while it is saved. The file is written under a temporary name and then renamed, so that
+        it is never left half written.
+
+        A memory mapped grid is not copied, since this would read the whole file into memory.
+        The worker thread writes the mapped grid itself, whose cells can not be modified until
+        the save is completed (see isCellGridLocked()).
+
+        :param filename: if not None, the grid data are saved into this file instead of the
+                         loadatstartpathfilename file
+        '''
+        # saving a partially loaded grid would truncate the grid data file and two saves
+        # must not write the same file simultaneously
+        self.waitGridDataLoaded()
+        self.waitGridDataSaved()
+
+        if isinstance(self.cellValueGrid, PackedCellGrid) and self.cellValueGrid.isMapped():
+            cellGridSnapshot = self.cellValueGrid
+        else:
+            cellGridSnapshot = self.cellValueGrid.copy()
+
+        if filename is None:
+            self.gridDataFileLoaded = True
+
+        self.gridDataSaveCellGrid = cellGridSnapshot
+        self.gridDataSaveFilename = filename
+        self.gridDataSaveThread = threading.Thread(target=self.saveGridDataInBackground,
+                                                   args=(cellGridSnapshot, filename))
+        self.gridDataSaveThread.start()
+
+    def saveGridDataInBackground(self, cellGridSnapshot, filename):
+        '''
+        Saving thread target. A save error is stored and raised again in the main thread by
+        waitGridDataSaved().
+        '''
+        try:
+            # the map of the mapped grid must not be dropped while the main thread draws it
+            self.mappedGridDataWritePending = self.gridDataMgr.writeGridData(cellGridSnapshot, filename, replaceMappedFile=False)
+        except Exception as e:
+            self.gridDataSaveError = e
+
+    def isSavingGridData(self):
+        '''
+        Returns True while the grid data are saved. Once the saving thread ended, the save is
+        completed by waitGridDataSaved(), which raises the save error, if any.
+        '''
+        if self.gridDataSaveThread is None:
+            return False
+
+        if self.gridDataSaveThread.is_alive():
+            return True
+
+        self.waitGridDataSaved()
+
+        return False
+
+    def isCellGridLocked(self):
+        '''
+        Returns True while the cells must not be modified, i.e. while the grid data are loaded
+        into them or while the mapped cell grid itself is saved.
+        '''
+        return self.isLoadingGridData() or (self.isSavingGridData() and self.gridDataSaveCellGrid is self.cellValueGrid)
+
+    def waitGridDataSaved(self):
+        '''
+        Waits until the grid data saving started by startSaveGridData(), if any, is completed.
+        The file a saved mapped grid maps is replaced here, in the main thread.
+        '''
+        if self.gridDataSaveThread is not None:
+            self.gridDataSaveThread.join()
+            self.gridDataSaveThread = None
+
+            if self.mappedGridDataWritePending:
+                self.mappedGridDataWritePending = False
+                self.gridDataMgr.completeMappedGridDataWrite(self.gridDataSaveCellGrid, self.gridDataSaveFilename)
+
+            self.gridDataSaveCellGrid = None
+
+        if self.gridDataSaveError is not None:
+            gridDataSaveError = self.gridDataSaveError
+            self.gridDataSaveError = None
+
+            raise gridDataSaveError
+
+    def autosaveGridDataIfDue(self, currentTime=None):
+        '''
+        Starts saving the grid data into the autosave file if the configured autosave interval
+        elapsed since the previous autosave and if cells were modified meanwhile. The autosave
+        is postponed while grid data are loaded or saved.
+
+        :param currentTime: time.monotonic() value. If None, the current time is used
+
+        :return: True if an autosave was started, False otherwise
+        '''
+        if self.autosaveInterval <= 0 or self.cellValueGrid is None:
+            return False
+
+        if currentTime is None:
+            currentTime = time.monotonic()
+
+        if currentTime - self.lastAutosaveTime < self.autosaveInterval or \
+                self.cellGridVersion == self.autosavedCellGridVersion or \
+                self.isLoadingGridData() or self.isSavingGridData():
+            return False
+
+        self.lastAutosaveTime = currentTime
+        self.autosavedCellGridVersion = self.cellGridVersion
+        self.startSaveGridData(self.gridDataMgr.getAutosaveFilename())
+
+        return True
+
+    def stampGridPattern(self, gridPattern, xyMousePosTuple):
+        '''
+        Copies the passed pattern into the cell grid, its top left cell being written on the
+        cell located at the passed mouse position. The part of the pattern which falls outside
+        of the grid is ignored.
+
+        :param gridPattern: 2 dimensions list or array
+        :param xyMousePosTuple: x, y surface coordinates in pixels
+        '''
+        if self.isCellGridLocked():
+            # the stamped cells could be overwritten by the rows being loaded or be missing
+            # from the mapped grid being saved
+            return
+
+        row, col = self.computeCellRowCol(xyMousePosTuple)
+
+        if row < 0 or col < 0:
+            # the mouse is located on the grid coord margins
+            return
+
+        gridPattern = np.asarray(gridPattern, dtype=np.uint8)
+
+        if self.editJournal:
+            previousCells = self.cellValueGrid.getWindow(row, row + gridPattern.shape[0], col, col + gridPattern.shape[1]).copy()
+
+        self.gridDataMgr.insertGridPatternToGridData(gridPattern, self.cellValueGrid, col, row, doOverwrite=True)
+        self.activeTileMap.addChangedWindow(row, row + gridPattern.shape[0], col, col + gridPattern.shape[1])
+        self.cellGridVersion += 1
+        self.changed = True
+
+        if self.editJournal:
+            # only the cells changed by the pattern are journaled
+            stampedCells = self.cellValueGrid.getWindow(row, row + gridPattern.shape[0], col, col + gridPattern.shape[1])
+            changedRows, changedCols = np.nonzero(stampedCells != previousCells)
+            self.pendingJournalEdits.extend(zip((changedRows + row).tolist(),
+                                                (changedCols + col).tolist(),
+                                                stampedCells[changedRows, changedCols].tolist()))
+
+    def stepCells(self):
+        '''
+        Replaces the cells by their next generation, computed by the life engine on the active
+        tiles only. If only a few cells changed, only them will be repainted by the next draw.
+        Else, only the changed tiles will be.
+
+        :return: True if cells changed
+        '''
+        if self.isCellGridLocked():
+            # the rows being loaded would be mixed with computed rows and the mapped grid
+            # being saved must not change
+            return False
+
+        if self.hashLife is not None:
+            return self.stepCellsWithHashLife()
+
+        changedRows, changedCols, changedValues = self.lifeEngine.step(self.cellValueGrid, self.activeTileMap)
+
+        if changedRows.size == 0:
+            return False
+
+        self.cellGridVersion += 1
+
+        if len(self.dirtyCells) + changedRows.size <= MAX_DIRTY_CELL_NUMBER:
+            # several generations can be computed between two draws
+            self.dirtyCells.extend(zip(changedRows.tolist(), changedCols.tolist()))
+        else:
+            self.dirtyTiles.update(self.activeTileMap.changedTiles)
+
+        if self.editJournal:
+            self.pendingJournalEdits.extend(zip(changedRows.tolist(), changedCols.tolist(), changedValues.tolist()))
+
+        return True
+
+    def stepCellsWithHashLife(self):
+        '''
+        Advances the cells by 2 ** self.hashLifeStepExponent generations with the HashLife
+        engine. The changed cells are not known individually, so that the whole surface is
+        repainted and the edit journal is outdated until the grid data are saved.
+
+        :return: True if cells changed
+        '''
+        if not isinstance(self.cellValueGrid, HashLifeCellGrid):
+            self.cellValueGrid = HashLifeCellGrid.fromCellGrid(self.cellValueGrid, self.hashLife)
+
+        previousCellGrid = self.cellValueGrid.copy()
+        self.cellValueGrid.advance(1 << self.hashLifeStepExponent)
+
+        if (self.cellValueGrid.root, self.cellValueGrid.originRow, self.cellValueGrid.originCol) == \
+                (previousCellGrid.root, previousCellGrid.originRow, previousCellGrid.originCol):
+            # the nodes being canonical, the cells are unchanged
+            return False
+
+        self.cellGridVersion += 1
+        self.changed = True
+
+        if self.editJournal:
+            self.journalOutdated = True
+
+        return True
+
+    def flushEditJournal(self):
+        '''
+        Appends the cell edits done since the previous call to the edit journal. While grid
+        data are saved, the edits remain pending since writing the grid data file deletes the
+        journal. The edits done before the save was started are in the saved grid data and
+        replaying them again later is harmless since a journal record stores the new cell value.
+        The edits of a grid which was not loaded from the grid data file are discarded. So are
+        the edits done after HashLife generations, which the journal can not replay on the
+        grid data file. They are saved with the whole grid by the next compactEditJournal().
+        '''
+        if not self.gridDataFileLoaded or self.journalOutdated:
+            self.pendingJournalEdits = []
+            return
+
+        if not self.pendingJournalEdits or self.isSavingGridData():
+            return
+
+        self.gridDataMgr.appendJournal(self.pendingJournalEdits)
+        self.pendingJournalEdits = []
+
+    def compactEditJournal(self):
+        '''
+        Merges the edit journal into the grid data file by saving the grid data in the
+        background, if the journal or the pending edits contain edits. Nothing is done if the
+        grid was not loaded from the grid data file, which must then not be overwritten.
+
+        :return: True if a save was started, False otherwise
+        '''
+        if not self.gridDataFileLoaded:
+            return False
+
+        if not self.pendingJournalEdits and self.gridDataMgr.journalRecordNumber == 0 and not self.journalOutdated:
+            return False
+
+        self.startSaveGridData()
+        self.journalOutdated = False
+
+        return True
+
+    def compactEditJournalIfDue(self):
+        '''
+        Merges the edit journal into the grid data file once it contains too many records,
+        unless grid data are being loaded or saved.
+
+        :return: True if a save was started, False otherwise
+        '''
+        if self.gridDataMgr.journalRecordNumber < JOURNAL_COMPACTION_RECORD_NUMBER or \
+                self.isLoadingGridData() or self.isSavingGridData():
+            return False
+
+        return self.compactEditJournal()
 
     def loadGridData(self):
         '''
@@ -440,14 +1206,107 @@ class GridView():
 
         :return: None if ok, missing file name if not.
         '''
+        if self.cellStorage == CELL_STORAGE_MAPPED:
+            gridTable, fileNotFoundName = self.gridDataMgr.mapGridData()
+
+            if gridTable is not None:
+                # the grid view navigates over the whole mapped grid
+                self.horizontalMaxManagedCellNumber = gridTable.dimX
+                self.verticalMaxManagedCellNumber = gridTable.dimY
+                self.cellValueGrid = gridTable
+
+                # the view must not remain moved beyond the cells of a smaller mapped grid
+                self.gridOffsetXPx = max(min(self.gridOffsetXPx, self.computeMaxAllowedHorizontalOffsetPx()), 0)
+                self.gridOffsetYPx = max(min(self.gridOffsetYPx, self.computeMaxAllowedVerticalOffsetPx()), 0)
+                self.updateStartDrawColIndex()
+                self.updateStartDrawRowIndex()
+                self.activeTileMap.reset()
+                self.gridDataFileLoaded = True
+                self.changed = True
+
+            return fileNotFoundName
+
         gridTable, fileNotFoundName = self.gridDataMgr.readGridData(requiredDimX=self.horizontalMaxManagedCellNumber,
-                                                                    requiredDimY=self.verticalMaxManagedCellNumber)
+                                                                    requiredDimY=self.verticalMaxManagedCellNumber,
+                                                                    cellGrid=self.createCellGrid())
 
-        if gridTable:
+        if gridTable is not None:
             self.cellValueGrid = gridTable
+            self.activeTileMap.reset()
+            self.gridDataFileLoaded = True
 
         return fileNotFoundName
 
+    def startLoadGridData(self):
+        '''
+        Starts loading the grid data on a worker thread, so that the grid view remains
+        responsive while a big grid data file is loaded. The rows are loaded by batches into
+        the displayed cell grid and draw() redraws the grid view each time a batch was loaded.
+        Since mapping a grid file is immediate, a mapped grid is loaded synchronously.
+
+        :return: None if the loading was started, missing file name if the file was not found.
+        '''
+        if self.cellStorage == CELL_STORAGE_MAPPED:
+            return self.loadGridData()
+
+        if not os.path.isfile(self.gridDataMgr.filename):
+            return self.gridDataMgr.filename
+
+        self.cellValueGrid = self.createCellGrid()
+        self.activeTileMap.reset()
+        self.gridDataFileLoaded = True
+        self.gridDataLoadProgressRatio = 0
+        self.gridDataLoadError = None
+        self.changed = True
+        self.gridDataLoadThread = threading.Thread(target=self.loadGridDataInBackground,
+                                                   args=(self.cellValueGrid,),
+                                                   daemon=True)
+        self.gridDataLoadThread.start()
+
+        return None
+
+    def loadGridDataInBackground(self, cellGrid):
+        '''
+        Loading thread target. Since it is raised in the loading thread, a load error is
+        stored and raised again in the main thread by draw() or waitGridDataLoaded().
+
+        :param cellGrid: displayed cell grid the rows are loaded into
+        '''
+        try:
+            self.gridDataMgr.readGridData(requiredDimX=self.horizontalMaxManagedCellNumber,
+                                          requiredDimY=self.verticalMaxManagedCellNumber,
+                                          cellGrid=cellGrid,
+                                          progressCallback=self.notifyGridDataLoadProgress)
+        except Exception as e:
+            self.gridDataLoadError = e
+        finally:
+            self.gridDataLoadUpdated.set()
+
+    def notifyGridDataLoadProgress(self, progressRatio):
+        self.gridDataLoadProgressRatio = progressRatio
+        self.gridDataLoadUpdated.set()
+
+    def isLoadingGridData(self):
+        return self.gridDataLoadThread is not None and self.gridDataLoadThread.is_alive()
+
+    def waitGridDataLoaded(self):
+        '''
+        Waits until the grid data loading started by startLoadGridData(), if any, is
+        completed.
+        '''
+        if self.gridDataLoadThread is not None:
+            self.gridDataLoadThread.join()
+            self.gridDataLoadThread = None
+
+        self.raiseGridDataLoadError()
+
+    def raiseGridDataLoadError(self):
+        if self.gridDataLoadError is not None:
+            gridDataLoadError = self.gridDataLoadError
+            self.gridDataLoadError = None
+
+            raise gridDataLoadError
+
     def initialiseCellsToValue(self, value=0):
         '''
         Sets all cells of the internal cell value grid to the initial value defined at GFrid
@@ -455,5 +1314,36 @@ class GridView():
         :param value: must be 0 (dead) or 1 (alive)
         '''
         self.initCellValue = value
-        self.cellValueGrid = [[value for i in range(self.horizontalMaxManagedCellNumber)] for j in range(self.verticalMaxManagedCellNumber)]
 
+        # the edits pending for the previous grid are dropped. The journal is kept, since its
+        # edits apply to the grid data file, which the new grid does not replace
+        self.pendingJournalEdits = []
+        self.gridDataFileLoaded = False
+
+        if self.cellValueGrid is not None and \
+                (self.cellValueGrid.dimX, self.cellValueGrid.dimY) == (self.horizontalMaxManagedCellNumber, self.verticalMaxManagedCellNumber):
+            # reusing the existing storage avoids reallocating the whole grid
+            self.cellValueGrid.fill(value)
+        else:
+            self.cellValueGrid = self.createCellGrid(value)
+
+        self.activeTileMap.reset()
+        self.changed = True
+
+    def createCellGrid(self, value=0):
+        '''
+        Creates an empty internal cell value grid according to the configured cell storage:
+        a dense CellGrid or a sparse ChunkedCellGrid. In mapped storage mode, a dense CellGrid
+        is used as long as no grid file is mapped.
+
+        :param value: must be 0 (dead) or 1 (alive). A sparse grid can only be created with 0
+
+        :return: CellGrid or ChunkedCellGrid
+        '''
+        if self.cellStorage == CELL_STORAGE_SPARSE:
+            cellGrid = ChunkedCellGrid(self.horizontalMaxManagedCellNumber, self.verticalMaxManagedCellNumber)
+            cellGrid.fill(value)
+
+            return cellGrid
+
+        return CellGrid(self.horizontalMaxManagedCellNumber, self.verticalMaxManagedCellNumber, value)
@@ -0,0 +1,676 @@
+import numpy as np
+
+from lifeengine import LifeEngine, DEFAULT_LIFE_RULE
+
+# max number of canonical nodes kept in the node table. Once a step left more nodes in the
+# table, the nodes which are not part of the current universe are collected
+DEFAULT_MAX_NODE_NUMBER = 2 ** 19
+
+# level of the largest nodes whose cells are cached as an array. Drawing and exporting the
+# universe descend to those nodes and not to the individual cells
+CACHED_CELLS_MAX_LEVEL = 4
+
+# level of the square blocks of cells converted at once into a node when cells are written
+# into the universe
+WRITTEN_BLOCK_LEVEL = 8
+
+# min level of the universe root node
+MIN_ROOT_LEVEL = 3
+
+# max number of cells of the band of rows exported at once into a cell grid
+EXPORTED_BAND_CELL_NUMBER = 2 ** 22
+
+class HashLifeNode():
+    '''
+    Node of the HashLife quadtree. A node of level n is a square of 2^n x 2^n cells made of
+    4 nodes of level n - 1: nw (north west), ne, sw and se. A level 0 node is a single cell.
+
+    The nodes are canonical: two nodes containing the same cells are the same object (see
+    HashLife.join()), so that nodes are compared by identity and their computed successors
+    can be memoized.
+    '''
+    __slots__ = ('level', 'nw', 'ne', 'sw', 'se', 'population', 'cells')
+
+    def __init__(self, level, nw, ne, sw, se, population, cells=None):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+        # cell array, only set on the nodes up to CACHED_CELLS_MAX_LEVEL once it was
+        # requested. See HashLife.getNodeCells()
+        self.cells = cells
+
+
+class HashLife():
+    '''
+    This class implements the HashLife algorithm, which computes the generations of a Life like
+    cellular automaton on a quadtree of canonical nodes. Since a node successor, i.e. the center
+    half of the node 2^k generations later, only depends on the node, the successors are
+    memoized. Repetitive patterns are so evolved millions of generations at the cost of a few
+    node computations.
+
+    The canonical nodes are kept in a table keyed by their 4 child nodes (hash consing). The
+    table is bounded: when it exceeds maxNodeNumber nodes, the nodes which are not reachable
+    from the live universes are removed and the memoized successors are forgotten.
+    '''
+    def __init__(self, rule=DEFAULT_LIFE_RULE, maxNodeNumber=DEFAULT_MAX_NODE_NUMBER):
+        '''
+        :param rule: B/S notation rule, like B3/S23
+
+        :raise ValueError: if the rule is invalid
+        '''
+        # the life engine rule table is used to compute the successors of the level 2 nodes
+        self.lifeEngine = LifeEngine(rule)
+        self.maxNodeNumber = maxNodeNumber
+        self.deadLeaf = HashLifeNode(0, None, None, None, None, 0, np.zeros((1, 1), dtype=np.uint8))
+        self.aliveLeaf = HashLifeNode(0, None, None, None, None, 1, np.ones((1, 1), dtype=np.uint8))
+        self.leaves = np.empty(2, dtype=object)
+        self.leaves[:] = [self.deadLeaf, self.aliveLeaf]
+        self.nodes = {}
+        self.emptyNodes = [self.deadLeaf]
+
+        # memoized successors keyed by (node, generation exponent)
+        self.successors = {}
+
+        # the 4 x 4 cells of a level 2 node are encoded as a 16 bits row major code whose most
+        # significant bit is the top left cell. The successor of each code is precomputed
+        self.level2SuccessorCodes = self.computeLevel2SuccessorCodes()
+
+    def computeLevel2SuccessorCodes(self):
+        '''
+        Computes at once the successors of all the possible level 2 nodes.
+
+        :return: 65536 uint8 array indexed by the level 2 node code, containing the 4 bits
+                 row major code of the 2 x 2 successor
+        '''
+        codes = np.arange(1 << 16, dtype=np.uint32)
+        cells = ((codes[:, np.newaxis] >> np.arange(15, -1, -1, dtype=np.uint32)) & 1).astype(np.uint8).reshape(-1, 4, 4)
+        successorCodes = np.zeros(1 << 16, dtype=np.uint8)
+
+        for successorRow in range(2):
+            for successorCol in range(2):
+                # the cell is counted with its neighbors, as in LifeEngine.computeNextCells()
+                blockSums = cells[:, successorRow:successorRow + 3, successorCol:successorCol + 3].sum(axis=(1, 2))
+                centerCells = cells[:, successorRow + 1, successorCol + 1]
+                successorCells = self.lifeEngine.nextCellValues.take(2 * blockSums + centerCells)
+                successorCodes |= successorCells << (3 - 2 * successorRow - successorCol)
+
+        return successorCodes
+
+    def computeLevel2Code(self, node):
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+
+        return (nw.nw.population << 15 | nw.ne.population << 14 | ne.nw.population << 13 | ne.ne.population << 12 |
+                nw.sw.population << 11 | nw.se.population << 10 | ne.sw.population << 9 | ne.se.population << 8 |
+                sw.nw.population << 7 | sw.ne.population << 6 | se.nw.population << 5 | se.ne.population << 4 |
+                sw.sw.population << 3 | sw.se.population << 2 | se.sw.population << 1 | se.se.population)
+
+    def join(self, nw, ne, sw, se):
+        '''
+        Returns the canonical node made of the 4 passed nodes of the same level.
+        '''
+        nodeKey = (nw, ne, sw, se)
+        node = self.nodes.get(nodeKey)
+
+        if node is None:
+            node = HashLifeNode(nw.level + 1, nw, ne, sw, se, nw.population + ne.population + sw.population + se.population)
+            self.nodes[nodeKey] = node
+
+        return node
+
+    def getEmptyNode(self, level):
+        while len(self.emptyNodes) <= level:
+            emptyNode = self.emptyNodes[-1]
+            self.emptyNodes.append(self.join(emptyNode, emptyNode, emptyNode, emptyNode))
+
+        return self.emptyNodes[level]
+
+    def getLeaf(self, value):
+        return self.aliveLeaf if value else self.deadLeaf
+
+    def getNodeCells(self, node):
+        '''
+        Returns the cells of the passed node, whose level must not exceed CACHED_CELLS_MAX_LEVEL.
+        The cell array is computed once and cached on the node.
+
+        :return: (2^level, 2^level) uint8 array which must not be modified
+        '''
+        if node.cells is None:
+            node.cells = np.block([[self.getNodeCells(node.nw), self.getNodeCells(node.ne)],
+                                   [self.getNodeCells(node.sw), self.getNodeCells(node.se)]])
+
+        return node.cells
+
+    def buildNode(self, cells):
+        '''
+        Returns the canonical node containing the passed cells. The nodes of each level are
+        built from the nodes of the level below at once.
+
+        :param cells: (2^level, 2^level) uint8 array, level being at least 1
+
+        :return: HashLifeNode
+        '''
+        join = np.frompyfunc(self.join, 4, 1)
+        nodes = self.leaves[cells]
+
+        while nodes.shape[0] > 1:
+            nodes = join(nodes[0::2, 0::2], nodes[0::2, 1::2], nodes[1::2, 0::2], nodes[1::2, 1::2])
+
+        return nodes[0, 0]
+
+    def getCell(self, node, row, col):
+        '''
+        Returns the value of the cell located at row, col relative to the top left cell of the
+        passed node.
+        '''
+        while node.level > 0:
+            if node.population == 0:
+                return 0
+
+            half = 1 << (node.level - 1)
+
+            if row < half:
+                node = node.nw if col < half else node.ne
+            else:
+                node = node.sw if col < half else node.se
+
+            row &= half - 1
+            col &= half - 1
+
+        return node.population
+
+    def setNode(self, node, row, col, subNode):
+        '''
+        Returns the passed node in which the node located at row, col relative to its top left
+        cell is replaced by subNode.
+
+        :param node: HashLifeNode
+        :param row: 0 based row index, multiple of 2^subNode.level
+        :param col: 0 based col index, multiple of 2^subNode.level
+        :param subNode: HashLifeNode whose level does not exceed the node level
+
+        :return: HashLifeNode
+        '''
+        if node.level == subNode.level:
+            return subNode
+
+        half = 1 << (node.level - 1)
+        nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+
+        if row < half:
+            if col < half:
+                nw = self.setNode(nw, row, col, subNode)
+            else:
+                ne = self.setNode(ne, row, col - half, subNode)
+        elif col < half:
+            sw = self.setNode(sw, row - half, col, subNode)
+        else:
+            se = self.setNode(se, row - half, col - half, subNode)
+
+        return self.join(nw, ne, sw, se)
+
+    def paintCells(self, node, nodeRow, nodeCol, cells, rowStart, colStart):
+        '''
+        Copies the cells of the passed node which are located in the zone of the passed cell
+        array. The empty nodes are skipped.
+
+        :param node: HashLifeNode
+        :param nodeRow: row index of the node top left cell
+        :param nodeCol: col index of the node top left cell
+        :param cells: 2 dimensions uint8 array of 0 values receiving the node cells
+        :param rowStart: row index of the cell array top left cell
+        :param colStart: col index of the cell array top left cell
+        '''
+        if node.population == 0:
+            return
+
+        nodeSize = 1 << node.level
+        copyRowStart = max(nodeRow, rowStart)
+        copyRowEnd = min(nodeRow + nodeSize, rowStart + cells.shape[0])
+        copyColStart = max(nodeCol, colStart)
+        copyColEnd = min(nodeCol + nodeSize, colStart + cells.shape[1])
+
+        if copyRowEnd <= copyRowStart or copyColEnd <= copyColStart:
+            return
+
+        if node.level <= CACHED_CELLS_MAX_LEVEL:
+            cells[copyRowStart - rowStart:copyRowEnd - rowStart, copyColStart - colStart:copyColEnd - colStart] = \
+                self.getNodeCells(node)[copyRowStart - nodeRow:copyRowEnd - nodeRow, copyColStart - nodeCol:copyColEnd - nodeCol]
+            return
+
+        half = nodeSize >> 1
+        self.paintCells(node.nw, nodeRow, nodeCol, cells, rowStart, colStart)
+        self.paintCells(node.ne, nodeRow, nodeCol + half, cells, rowStart, colStart)
+        self.paintCells(node.sw, nodeRow + half, nodeCol, cells, rowStart, colStart)
+        self.paintCells(node.se, nodeRow + half, nodeCol + half, cells, rowStart, colStart)
+
+    def centre(self, node):
+        '''
+        Returns the node of the next level whose center half is the passed node, the border
+        being empty.
+        '''
+        emptyNode = self.getEmptyNode(node.level - 1)
+
+        return self.join(self.join(emptyNode, emptyNode, emptyNode, node.nw),
+                         self.join(emptyNode, emptyNode, node.ne, emptyNode),
+                         self.join(emptyNode, node.sw, emptyNode, emptyNode),
+                         self.join(node.se, emptyNode, emptyNode, emptyNode))
+
+    def getCenterNode(self, node):
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def isPadded(self, node):
+        '''
+        Returns True if all the alive cells of the passed node, whose level must be at least 3,
+        are located in its central square of 2^(level - 2) x 2^(level - 2) cells.
+        '''
+        return node.nw.se.se.population + node.ne.sw.sw.population + \
+               node.sw.ne.ne.population + node.se.nw.nw.population == node.population
+
+    def computeSuccessor(self, node, generationExponent):
+        '''
+        Returns the center half of the passed node 2^generationExponent generations later,
+        assuming the cells outside of the node are dead.
+
+        :param node: HashLifeNode whose level is at least 2
+        :param generationExponent: integer from 0 up to node level - 2
+
+        :return: HashLifeNode of level node level - 1
+        '''
+        if node.population == 0:
+            return node.nw
+
+        successorKey = (node, generationExponent)
+        successor = self.successors.get(successorKey)
+
+        if successor is not None:
+            return successor
+
+        if node.level == 2:
+            # the 2 x 2 center of a 4 x 4 node one generation later
+            successorCode = self.level2SuccessorCodes[self.computeLevel2Code(node)]
+            leaves = self.leaves
+            successor = self.join(leaves[successorCode >> 3], leaves[(successorCode >> 2) & 1],
+                                  leaves[(successorCode >> 1) & 1], leaves[successorCode & 1])
+        else:
+            # the 9 overlapping nodes of level - 1 are advanced, which gives the 3 x 3 nodes
+            # of level - 2 covering the center of the node. A node of level - 1 can be advanced
+            # by at most 2^(level - 3) generations
+            join = self.join
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            firstGenerationExponent = min(generationExponent, node.level - 3)
+            n00 = self.computeSuccessor(nw, firstGenerationExponent)
+            n01 = self.computeSuccessor(join(nw.ne, ne.nw, nw.se, ne.sw), firstGenerationExponent)
+            n02 = self.computeSuccessor(ne, firstGenerationExponent)
+            n10 = self.computeSuccessor(join(nw.sw, nw.se, sw.nw, sw.ne), firstGenerationExponent)
+            n11 = self.computeSuccessor(join(nw.se, ne.sw, sw.ne, se.nw), firstGenerationExponent)
+            n12 = self.computeSuccessor(join(ne.sw, ne.se, se.nw, se.ne), firstGenerationExponent)
+            n20 = self.computeSuccessor(sw, firstGenerationExponent)
+            n21 = self.computeSuccessor(join(sw.ne, se.nw, sw.se, se.sw), firstGenerationExponent)
+            n22 = self.computeSuccessor(se, firstGenerationExponent)
+
+            if generationExponent < node.level - 2:
+                # the 9 nodes are already 2^generationExponent generations later. Only their
+                # centers are assembled
+                successor = join(join(n00.se, n01.sw, n10.ne, n11.nw),
+                                 join(n01.se, n02.sw, n11.ne, n12.nw),
+                                 join(n10.se, n11.sw, n20.ne, n21.nw),
+                                 join(n11.se, n12.sw, n21.ne, n22.nw))
+            else:
+                # the 4 nodes assembled from the 9 nodes are advanced by the remaining
+                # 2^(level - 3) generations
+                successor = join(self.computeSuccessor(join(n00, n01, n10, n11), generationExponent - 1),
+                                 self.computeSuccessor(join(n01, n02, n11, n12), generationExponent - 1),
+                                 self.computeSuccessor(join(n10, n11, n20, n21), generationExponent - 1),
+                                 self.computeSuccessor(join(n11, n12, n21, n22), generationExponent - 1))
+
+        self.successors[successorKey] = successor
+
+        return successor
+
+    def collectGarbage(self, rootNodes):
+        '''
+        Removes from the node table the nodes which can not be reached from the passed root
+        nodes and forgets the memoized successors. The removed nodes remain valid, but are no
+        longer canonical.
+
+        :param rootNodes: iterable of HashLifeNode
+        '''
+        self.successors.clear()
+        liveNodes = {}
+        pendingNodes = list(rootNodes) + self.emptyNodes
+
+        while pendingNodes:
+            node = pendingNodes.pop()
+
+            if node.level == 0:
+                continue
+
+            nodeKey = (node.nw, node.ne, node.sw, node.se)
+
+            if nodeKey not in liveNodes:
+                liveNodes[nodeKey] = node
+                pendingNodes.extend(nodeKey)
+
+        self.nodes = liveNodes
+
+
+class HashLifeCellGrid():
+    '''
+    This class is a cell storage whose cells are the universe of a HashLife quadtree. It offers
+    the interface of CellGrid, so that the GridView draws and edits the quadtree directly: the
+    drawn window is painted from the nodes, the empty nodes being skipped at once.
+
+    The root node covers the zone of 2^level x 2^level cells whose top left cell is located at
+    originRow, originCol. The universe is unbounded: the cells which leave the grid dimensions
+    keep evolving, but they are neither drawn nor saved.
+
+    Since the nodes are immutable, copying the grid costs nothing.
+    '''
+    def __init__(self, dimX, dimY, hashLife=None, root=None, originRow=0, originCol=0):
+        '''
+        :param dimX: 1 based horizontal dimension (col number) of the grid
+        :param dimY: 1 based vertical dimension (row number) of the grid
+        :param hashLife: HashLife managing the nodes. If None, a B3/S23 HashLife is created
+        :param root: root node of the universe. If None, the universe is empty
+        '''
+        self.dimX = dimX
+        self.dimY = dimY
+        self.hashLife = hashLife if hashLife is not None else HashLife()
+        self.root = root if root is not None else self.hashLife.getEmptyNode(MIN_ROOT_LEVEL)
+        self.originRow = originRow
+        self.originCol = originCol
+        self.generation = 0
+
+    @staticmethod
+    def fromCellGrid(cellGrid, hashLife=None):
+        '''
+        Imports the data zone of the passed cell grid into a new HashLifeCellGrid. The grid is
+        read by blocks and the empty blocks are skipped.
+
+        :param cellGrid: CellGrid, ChunkedCellGrid or PackedCellGrid
+
+        :return: HashLifeCellGrid with the cell grid dimensions
+        '''
+        hashLifeCellGrid = HashLifeCellGrid(cellGrid.dimX, cellGrid.dimY, hashLife)
+        dataDimX, dataDimY = cellGrid.getDataExtent()
+        blockSize = 1 << WRITTEN_BLOCK_LEVEL
+
+        for blockRowStart in range(0, dataDimY, blockSize):
+            for blockColStart in range(0, dataDimX, blockSize):
+                cells = cellGrid.getWindow(blockRowStart, blockRowStart + blockSize, blockColStart, blockColStart + blockSize)
+
+                if cells.any():
+                    hashLifeCellGrid.setWindow(blockRowStart, blockColStart, cells)
+
+        return hashLifeCellGrid
+
+    def exportToCellGrid(self, cellGrid):
+        '''
+        Replaces the cells of the passed cell grid by the cells of the universe located inside
+        the grid dimensions.
+
+        :param cellGrid: CellGrid, ChunkedCellGrid or PackedCellGrid having the same dimensions
+        '''
+        cellGrid.clear()
+        dataDimX, dataDimY = self.getDataExtent()
+        bandRowNumber = max(EXPORTED_BAND_CELL_NUMBER // max(dataDimX, 1), 1)
+
+        for bandRowStart in range(max(self.originRow, 0), dataDimY, bandRowNumber):
+            cells = self.getWindow(bandRowStart, bandRowStart + bandRowNumber, 0, dataDimX)
+
+            if cells.any():
+                cellGrid.setWindow(bandRowStart, 0, cells)
+
+    def getDataExtent(self):
+        '''
+        Returns the dimensions of the zone of the grid covered by the root node, outside of
+        which all cells are 0.
+
+        :return: dimX, dimY tuple
+        '''
+        if self.root.population == 0:
+            return 0, 0
+
+        rootSize = 1 << self.root.level
+
+        return min(max(self.originCol + rootSize, 0), self.dimX), min(max(self.originRow + rootSize, 0), self.dimY)
+
+    def getPopulatedZones(self, zoneSize):
+        '''
+        Returns the zones of the universe containing alive cells, i.e. the populated nodes of
+        zoneSize x zoneSize cells, or the root node if it is smaller. The empty nodes are
+        skipped at once.
+
+        :param zoneSize: power of 2 zone size in cells
+
+        :return: list of (row start, col start, zone size) tuples
+        '''
+        zoneLevel = min(zoneSize.bit_length() - 1, self.root.level)
+        populatedZones = []
+        nodes = [(self.root, self.originRow, self.originCol)]
+
+        while nodes:
+            node, nodeRow, nodeCol = nodes.pop()
+
+            if node.population == 0:
+                continue
+
+            if node.level == zoneLevel:
+                populatedZones.append((nodeRow, nodeCol, 1 << zoneLevel))
+                continue
+
+            halfSize = 1 << (node.level - 1)
+            nodes.extend(((node.nw, nodeRow, nodeCol), (node.ne, nodeRow, nodeCol + halfSize),
+                          (node.sw, nodeRow + halfSize, nodeCol), (node.se, nodeRow + halfSize, nodeCol + halfSize)))
+
+        return populatedZones
+
+    def containsCell(self, row, col):
+        rootSize = 1 << self.root.level
+
+        return self.originRow <= row < self.originRow + rootSize and self.originCol <= col < self.originCol + rootSize
+
+    def getCell(self, row, col):
+        if not self.containsCell(row, col):
+            return 0
+
+        return self.hashLife.getCell(self.root, row - self.originRow, col - self.originCol)
+
+    def setCell(self, row, col, value):
+        if not (0 <= row < self.dimY and 0 <= col < self.dimX):
+            raise IndexError('cell ({}, {}) is outside of the {} x {} grid'.format(row, col, self.dimX, self.dimY))
+
+        self.expandRoot(row, row + 1, col, col + 1)
+        self.root = self.hashLife.setNode(self.root, row - self.originRow, col - self.originCol, self.hashLife.getLeaf(value))
+
+    def fill(self, value):
+        '''
+        Sets all the cells of the grid to 0.
+
+        :param value: must be 0
+
+        :raise ValueError: if value is not 0, since the universe is unbounded
+        '''
+        if value != 0:
+            raise ValueError('a HashLifeCellGrid can only be filled with 0')
+
+        self.root = self.hashLife.getEmptyNode(MIN_ROOT_LEVEL)
+        self.originRow = 0
+        self.originCol = 0
+
+    def clear(self):
+        self.fill(0)
+
+    def expandRoot(self, rowStart, rowEnd, colStart, colEnd):
+        '''
+        Centres the root node into bigger nodes until it covers the passed zone.
+        '''
+        while not (self.containsCell(rowStart, colStart) and self.containsCell(rowEnd - 1, colEnd - 1)):
+            self.centreRoot()
+
+    def centreRoot(self):
+        self.originRow -= 1 << (self.root.level - 1)
+        self.originCol -= 1 << (self.root.level - 1)
+        self.root = self.hashLife.centre(self.root)
+
+    def shrinkRoot(self):
+        '''
+        Replaces the root node by its center node as long as its border is empty.
+        '''
+        while self.root.level > MIN_ROOT_LEVEL and self.hashLife.getCenterNode(self.root).population == self.root.population:
+            self.originRow += 1 << (self.root.level - 2)
+            self.originCol += 1 << (self.root.level - 2)
+            self.root = self.hashLife.getCenterNode(self.root)
+
+    def getWindow(self, rowStart, rowEnd, colStart, colEnd):
+        '''
+        Returns the cell values of the rectangular zone [rowStart, rowEnd[ x [colStart, colEnd[
+        as a new two dimensional array, painted from the nodes. The zone is clipped to the grid
+        dimensions.
+
+        :return: 2 dimensions uint8 array
+        '''
+        rowStart = max(rowStart, 0)
+        colStart = max(colStart, 0)
+        rowEnd = max(min(rowEnd, self.dimY), rowStart)
+        colEnd = max(min(colEnd, self.dimX), colStart)
+        cells = np.zeros((rowEnd - rowStart, colEnd - colStart), dtype=np.uint8)
+        self.hashLife.paintCells(self.root, self.originRow, self.originCol, cells, rowStart, colStart)
+
+        return cells
+
+    def setWindow(self, rowStart, colStart, data):
+        '''
+        Copies the passed two dimensional data into the grid, its top left cell being written
+        at position rowStart, colStart. The part of the data which falls outside of the grid
+        is ignored. The written zone is converted into nodes by square blocks aligned on the
+        root node.
+
+        :param rowStart: 0 based row index of the top left written cell
+        :param colStart: 0 based col index of the top left written cell
+        :param data: 2 dimensions list or array
+        '''
+        data = np.asarray(data, dtype=np.uint8)
+        rowEnd = min(rowStart + data.shape[0], self.dimY)
+        colEnd = min(colStart + data.shape[1], self.dimX)
+
+        if rowEnd <= rowStart or colEnd <= colStart:
+            return
+
+        # small zones are written by small blocks
+        blockLevel = min(max((max(rowEnd - rowStart, colEnd - colStart) - 1).bit_length(), 1), WRITTEN_BLOCK_LEVEL)
+        blockSize = 1 << blockLevel
+        self.expandRoot(rowStart, rowEnd, colStart, colEnd)
+
+        while self.root.level < blockLevel:
+            self.centreRoot()
+
+        for blockRowStart in range(self.originRow + (rowStart - self.originRow) // blockSize * blockSize, rowEnd, blockSize):
+            for blockColStart in range(self.originCol + (colStart - self.originCol) // blockSize * blockSize, colEnd, blockSize):
+                blockCells = np.zeros((blockSize, blockSize), dtype=np.uint8)
+                self.hashLife.paintCells(self.root, self.originRow, self.originCol, blockCells, blockRowStart, blockColStart)
+                copyRowStart = max(rowStart, blockRowStart)
+                copyRowEnd = min(rowEnd, blockRowStart + blockSize)
+                copyColStart = max(colStart, blockColStart)
+                copyColEnd = min(colEnd, blockColStart + blockSize)
+                blockCells[copyRowStart - blockRowStart:copyRowEnd - blockRowStart, copyColStart - blockColStart:copyColEnd - blockColStart] = \
+                    data[copyRowStart - rowStart:copyRowEnd - rowStart, copyColStart - colStart:copyColEnd - colStart]
+                self.root = self.hashLife.setNode(self.root, blockRowStart - self.originRow, blockColStart - self.originCol,
+                                                  self.hashLife.buildNode(blockCells))
+
+    def advance(self, generationNumber):
+        '''
+        Advances the universe by the passed number of generations, each power of 2 of the
+        generation number being computed by a single node successor.
+
+        :param generationNumber: positive integer
+        '''
+        generationExponent = 0
+        remainingGenerationNumber = generationNumber
+
+        while remainingGenerationNumber > 0:
+            if remainingGenerationNumber & 1:
+                self.advanceByPowerOfTwo(generationExponent)
+
+            remainingGenerationNumber >>= 1
+            generationExponent += 1
+
+        self.generation += generationNumber
+        self.shrinkRoot()
+
+        if len(self.hashLife.nodes) > self.hashLife.maxNodeNumber:
+            self.hashLife.collectGarbage([self.root])
+
+    def advanceByPowerOfTwo(self, generationExponent):
+        '''
+        Advances the universe by 2^generationExponent generations. The root node is first
+        centred until the alive cells can not move out of its successor.
+        '''
+        while self.root.level < generationExponent + 3 or not self.hashLife.isPadded(self.root):
+            self.centreRoot()
+
+        self.originRow += 1 << (self.root.level - 2)
+        self.originCol += 1 << (self.root.level - 2)
+        self.root = self.hashLife.computeSuccessor(self.root, generationExponent)
+
+    def copy(self):
+        hashLifeCellGrid = HashLifeCellGrid(self.dimX, self.dimY, self.hashLife, self.root, self.originRow, self.originCol)
+        hashLifeCellGrid.generation = self.generation
+
+        return hashLifeCellGrid
+
+    def tolist(self):
+        return np.asarray(self).tolist()
+
+    def __array__(self, dtype=None, copy=None):
+        '''
+        Returns the data zone of the grid (see getDataExtent()) as a dense array.
+        '''
+        dataDimX, dataDimY = self.getDataExtent()
+        cells = self.getWindow(0, dataDimY, 0, dataDimX)
+
+        if dtype is None:
+            return cells
+
+        return cells.astype(dtype)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            row, col = key
+            return self.getCell(row, col)
+
+        return self.getWindow(key, key + 1, 0, self.getDataExtent()[0])[0]
+
+    def __setitem__(self, key, value):
+        row, col = key
+        self.setCell(row, col, value)
+
+    def __len__(self):
+        return self.dimY
+
+    def __eq__(self, other):
+        try:
+            otherCells = np.asarray(other)
+        except ValueError:
+            return False
+
+        if otherCells.ndim != 2:
+            return False
+
+        # the cells outside of the other matrix must all be 0
+        dataDimX, dataDimY = self.getDataExtent()
+        compareDimX = max(dataDimX, otherCells.shape[1])
+        compareDimY = max(dataDimY, otherCells.shape[0])
+        paddedOtherCells = np.zeros((compareDimY, compareDimX), dtype=np.uint8)
+        paddedOtherCells[:otherCells.shape[0], :otherCells.shape[1]] = otherCells
+
+        return bool(np.array_equal(self.getWindow(0, compareDimY, 0, compareDimX), paddedOtherCells))
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'HashLifeCellGrid(dimX={}, dimY={}, level={}, population={})'.format(self.dimX, self.dimY, self.root.level, self.root.population)
@@ -0,0 +1,387 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from cellgrid import UNBOUNDED_CELL_NUMBER
+
+# Conway's Game of Life rule: a dead cell with 3 alive neighbors is born, an alive cell with
+# 2 or 3 alive neighbors survives
+DEFAULT_LIFE_RULE = 'B3/S23'
+
+# bounded: the cells outside of the grid are dead. wrap: the grid is a torus, the cells of the
+# last row/col being the neighbors of the cells of the first row/col
+LIFE_EDGES_BOUNDED = 'bounded'
+LIFE_EDGES_WRAP = 'wrap'
+
+# Life engine alternatives, set by the 'Life engine' configuration setting. The HashLife
+# engine is implemented in hashlife.py
+LIFE_ENGINE_VECTORIZED = 'vectorized'
+LIFE_ENGINE_HASHLIFE = 'hashlife'
+
+# max number of cells of the band of rows computed at once, so that stepping a memory mapped
+# grid does not require loading it entirely in memory
+STEP_BAND_CELL_NUMBER = 2 ** 22
+
+# above this ratio of active tiles in the step region, computing the region by bands of rows
+# is faster than computing the active tiles one by one
+MAX_ACTIVE_TILE_RATIO = 0.5
+
+# min number of rows of the bands computed by distinct workers. Below, dispatching a band to
+# a worker costs more than computing it
+MIN_WORKER_BAND_ROW_NUMBER = 64
+
+class LifeEngine():
+    '''
+    This class computes the generations of a Life like cellular automaton on the cell storage
+    of the GridView (CellGrid, ChunkedCellGrid or PackedCellGrid).
+
+    The rule is expressed in the B/S notation: B3/S23 means that a dead cell with 3 alive
+    neighbors becomes alive and that an alive cell with 2 or 3 alive neighbors stays alive.
+    All the other cells die or stay dead.
+
+    The alive neighbors of all the cells are counted at once by adding shifted views of the
+    cell array, without any Python loop over the cells. The next cell values are then looked
+    up in a table indexed by the neighbor count and the current cell value.
+
+    With several workers, the bands of rows are computed simultaneously by a thread pool.
+    Threads are sufficient since NumPy releases the GIL while adding and looking up the cell
+    arrays, and they read the cell storage directly instead of copying it to worker
+    processes.
+    '''
+    def __init__(self, rule=DEFAULT_LIFE_RULE, edges=LIFE_EDGES_BOUNDED, workerNumber=1):
+        '''
+        :param rule: B/S notation rule, like B3/S23
+        :param edges: LIFE_EDGES_BOUNDED or LIFE_EDGES_WRAP
+        :param workerNumber: number of threads computing the bands of rows. 0 means one
+                             thread per CPU core
+
+        :raise ValueError: if the rule or the edges value is invalid
+        '''
+        if edges not in (LIFE_EDGES_BOUNDED, LIFE_EDGES_WRAP):
+            raise ValueError('invalid life edges {}. Must be {} or {}'.format(edges, LIFE_EDGES_BOUNDED, LIFE_EDGES_WRAP))
+
+        self.rule = rule
+        self.edges = edges
+        self.workerNumber = workerNumber if workerNumber > 0 else os.cpu_count() or 1
+
+        # created at the first step computed by several workers
+        self.executor = None
+        self.birthNeighborCounts, self.survivalNeighborCounts = self.parseRule(rule)
+
+        # next cell value indexed by 2 * (alive neighbor number + cell value) + cell value. The
+        # cell is counted with its neighbors since this spares subtracting it from the sum
+        self.nextCellValues = np.zeros(20, dtype=np.uint8)
+
+        for neighborCount in self.birthNeighborCounts:
+            self.nextCellValues[2 * neighborCount] = 1
+
+        for neighborCount in self.survivalNeighborCounts:
+            self.nextCellValues[2 * (neighborCount + 1) + 1] = 1
+
+    @staticmethod
+    def parseRule(rule):
+        '''
+        Parses the passed B/S notation rule. The B and S parts can be in any order and are
+        case insensitive. B0 rules, where cells are born without any live neighbor, are
+        rejected since the step region and HashLife rely on dead zones staying dead.
+
+        :param rule: rule string, like B3/S23 or B36/S23
+
+        :raise ValueError: if the rule is invalid
+
+        :return: birth neighbor counts, survival neighbor counts tuple of frozensets
+        '''
+        match = re.fullmatch(r'\s*B([0-8]*)\s*/\s*S([0-8]*)\s*|\s*S([0-8]*)\s*/\s*B([0-8]*)\s*', rule, re.IGNORECASE)
+
+        if match is None:
+            raise ValueError('invalid life rule {}. Expected format: B3/S23'.format(rule))
+
+        if match.group(1) is not None:
+            birthDigits, survivalDigits = match.group(1), match.group(2)
+        else:
+            survivalDigits, birthDigits = match.group(3), match.group(4)
+
+        if '0' in birthDigits:
+            raise ValueError('unsupported life rule {}. Rules with births on 0 neighbor (B0) are not supported'.format(rule))
+
+        return frozenset(int(digit) for digit in birthDigits), frozenset(int(digit) for digit in survivalDigits)
+
+    def computeStepRegion(self, cellGrid):
+        '''
+        Returns the region of the cell grid which can change during the next generation. With
+        wrapped edges, this is the whole grid. With bounded edges, all the cells outside of the
+        grid data extent are dead, so that the cells can only be born up to one row/col beyond
+        the extent.
+
+        :param cellGrid: CellGrid, ChunkedCellGrid or PackedCellGrid
+
+        :return: rowEnd, colEnd tuple, the region being [0, rowEnd[ x [0, colEnd[
+        '''
+        if self.edges == LIFE_EDGES_WRAP:
+            return cellGrid.dimY, cellGrid.dimX
+
+        dataDimX, dataDimY = cellGrid.getDataExtent()
+
+        return min(dataDimY + 1, cellGrid.dimY), min(dataDimX + 1, cellGrid.dimX)
+
+    def step(self, cellGrid, activeTileMap=None):
+        '''
+        Replaces the cells of the passed cell grid by their next generation. If the passed
+        active tile map knows which tiles changed during the previous generation or can find
+        the tiles containing alive cells (see ActiveTileMap.startTracking()), only the active
+        tiles are computed. Otherwise, the whole step region is computed. The active tile map
+        is then updated with the tiles changed by this generation.
+
+        :param cellGrid: CellGrid, ChunkedCellGrid or PackedCellGrid
+        :param activeTileMap: ActiveTileMap or None
+
+        :raise ValueError: if the edges are wrapped on an unbounded grid
+
+        :return: changed cell row indexes, changed cell col indexes, new values of the changed
+                 cells tuple of 1 dimension arrays
+        '''
+        if self.edges == LIFE_EDGES_WRAP and max(cellGrid.dimX, cellGrid.dimY) >= UNBOUNDED_CELL_NUMBER:
+            raise ValueError('the edges of an unbounded grid can not be wrapped')
+
+        if activeTileMap is not None and activeTileMap.startTracking(cellGrid):
+            tileSize = activeTileMap.tileSize
+            activeTiles = activeTileMap.computeActiveTiles(-(-cellGrid.dimY // tileSize), -(-cellGrid.dimX // tileSize), self.edges == LIFE_EDGES_WRAP)
+            rowEnd, colEnd = self.computeStepRegion(cellGrid)
+
+            if len(activeTiles) <= MAX_ACTIVE_TILE_RATIO * -(-rowEnd // tileSize) * -(-colEnd // tileSize):
+                changedCells, changedTiles = self.stepActiveTiles(cellGrid, activeTiles, tileSize)
+                activeTileMap.setChangedTiles(changedTiles)
+
+                return changedCells
+
+        changedCells = self.stepRegion(cellGrid)
+
+        if activeTileMap is not None:
+            activeTileMap.setChangedTiles(set())
+            activeTileMap.addChangedCells(changedCells[0], changedCells[1])
+
+        return changedCells
+
+    def stepRegion(self, cellGrid):
+        '''
+        Computes the next generation of the step region band of rows by band of rows. Each band
+        is read with the row above and the row below it (the halo rows), so that the neighbors
+        of all the band cells are known.
+
+        The bands are computed by waves of one band per worker. The bands of a wave are read
+        and computed simultaneously and are then written in row order, so that the result does
+        not depend on the worker scheduling. The last band of a wave is written only once the
+        next wave was read, since its last row is the upper halo row of the next band.
+
+        :param cellGrid: CellGrid, ChunkedCellGrid or PackedCellGrid
+
+        :return: changed cell row indexes, changed cell col indexes, new values of the changed
+                 cells tuple of 1 dimension arrays
+        '''
+        rowEnd, colEnd = self.computeStepRegion(cellGrid)
+        changedCells = []
+
+        if rowEnd == 0 or colEnd == 0:
+            return self.concatenateChangedCells(changedCells)
+
+        wrapEdges = self.edges == LIFE_EDGES_WRAP
+
+        if wrapEdges:
+            # the first and last rows are the halo rows of the last and first bands. They are
+            # read before any band is written
+            firstRow = cellGrid.getWindow(0, 1, 0, colEnd).copy()
+            lastRow = cellGrid.getWindow(rowEnd - 1, rowEnd, 0, colEnd).copy()
+        else:
+            firstRow = lastRow = np.zeros((1, colEnd), dtype=np.uint8)
+
+        bandRowNumber = max(STEP_BAND_CELL_NUMBER // colEnd, 1)
+
+        if self.workerNumber > 1:
+            # spreading the region over the workers
+            bandRowNumber = min(bandRowNumber, max(-(-rowEnd // self.workerNumber), MIN_WORKER_BAND_ROW_NUMBER))
+
+        bandRowStarts = range(0, rowEnd, bandRowNumber)
+        pendingBand = None
+
+        for waveStart in range(0, len(bandRowStarts), self.workerNumber):
+            waveBands = [(bandRowStart, min(bandRowStart + bandRowNumber, rowEnd)) for bandRowStart in bandRowStarts[waveStart:waveStart + self.workerNumber]]
+
+            def computeBand(band):
+                bandRowStart, bandRowEnd = band
+                cells = self.readBandWithHaloRows(cellGrid, bandRowStart, bandRowEnd, rowEnd, colEnd, firstRow, lastRow)
+                nextCells = self.computeNextCells(cells, wrapCols=wrapEdges)
+                changedRows, changedCols = np.nonzero(nextCells != cells[1:-1])
+
+                return bandRowStart, nextCells, (changedRows + bandRowStart, changedCols, nextCells[changedRows, changedCols])
+
+            if len(waveBands) == 1:
+                computedBands = [computeBand(waveBands[0])]
+            else:
+                # the results are returned in the band order
+                computedBands = list(self.getExecutor().map(computeBand, waveBands))
+
+            if pendingBand is not None:
+                cellGrid.setWindow(pendingBand[0], 0, pendingBand[1])
+
+            for bandRowStart, nextCells, bandChangedCells in computedBands[:-1]:
+                cellGrid.setWindow(bandRowStart, 0, nextCells)
+                changedCells.append(bandChangedCells)
+
+            bandRowStart, nextCells, bandChangedCells = computedBands[-1]
+            changedCells.append(bandChangedCells)
+            pendingBand = (bandRowStart, nextCells)
+
+        cellGrid.setWindow(pendingBand[0], 0, pendingBand[1])
+
+        return self.concatenateChangedCells(changedCells)
+
+    def getExecutor(self):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workerNumber)
+
+        return self.executor
+
+    def close(self):
+        '''
+        Stops the worker threads, if any. The life engine can still be used afterwards.
+        '''
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+    def stepActiveTiles(self, cellGrid, activeTiles, tileSize):
+        '''
+        Computes the next generation of the active tiles only, the other tiles being unable to
+        change. Each tile is read with a 1 cell halo. The computed tiles are written once all
+        the tiles were computed, since the tiles are the halos of their neighbors.
+
+        :param cellGrid: CellGrid, ChunkedCellGrid or PackedCellGrid
+        :param activeTiles: set of (tile row, tile col) tuples (see ActiveTileMap)
+        :param tileSize: tile size in cells
+
+        :return: 2 elements tuple: changed cell row indexes, changed cell col indexes, new
+                 values of the changed cells tuple of 1 dimension arrays and the set of the
+                 changed tiles
+        '''
+        wrapEdges = self.edges == LIFE_EDGES_WRAP
+        changedCells = []
+        changedTileCells = []
+        changedTiles = set()
+
+        # the tiles are computed in a fixed order, so that the changed cells are returned in
+        # the same order whatever the set order
+        for tileRow, tileCol in sorted(activeTiles):
+            tileRowStart = tileRow * tileSize
+            tileColStart = tileCol * tileSize
+            tileRowEnd = min(tileRowStart + tileSize, cellGrid.dimY)
+            tileColEnd = min(tileColStart + tileSize, cellGrid.dimX)
+            cells = self.readZoneWithHalo(cellGrid, tileRowStart, tileRowEnd, tileColStart, tileColEnd, wrapEdges)
+            nextCells = self.computeNextPaddedCells(cells)
+            changedRows, changedCols = np.nonzero(nextCells != cells[1:-1, 1:-1])
+
+            if changedRows.size > 0:
+                changedCells.append((changedRows + tileRowStart, changedCols + tileColStart, nextCells[changedRows, changedCols]))
+                changedTileCells.append((tileRowStart, tileColStart, nextCells))
+                changedTiles.add((tileRow, tileCol))
+
+        for tileRowStart, tileColStart, nextCells in changedTileCells:
+            cellGrid.setWindow(tileRowStart, tileColStart, nextCells)
+
+        return self.concatenateChangedCells(changedCells), changedTiles
+
+    @staticmethod
+    def readZoneWithHalo(cellGrid, rowStart, rowEnd, colStart, colEnd, wrapEdges):
+        '''
+        Returns the cells of the zone [rowStart - 1, rowEnd + 1[ x [colStart - 1, colEnd + 1[.
+        The halo cells outside of the grid are dead or, if the edges are wrapped, are read
+        from the opposite edge.
+
+        :return: (rowEnd - rowStart + 2, colEnd - colStart + 2) uint8 array
+        '''
+        cells = np.zeros((rowEnd - rowStart + 2, colEnd - colStart + 2), dtype=np.uint8)
+
+        for readRowStart, readRowEnd, rowOffset in LifeEngine.splitHaloRange(rowStart - 1, rowEnd + 1, cellGrid.dimY, wrapEdges):
+            for readColStart, readColEnd, colOffset in LifeEngine.splitHaloRange(colStart - 1, colEnd + 1, cellGrid.dimX, wrapEdges):
+                cells[rowOffset:rowOffset + readRowEnd - readRowStart, colOffset:colOffset + readColEnd - readColStart] = \
+                    cellGrid.getWindow(readRowStart, readRowEnd, readColStart, readColEnd)
+
+        return cells
+
+    @staticmethod
+    def splitHaloRange(start, end, dim, wrapEdges):
+        '''
+        Splits the row or col range [start, end[, which can exceed the grid by one row or col
+        on each side, into the ranges to read from the grid.
+
+        :return: list of (read start, read end, offset of the read start in the range) tuples
+        '''
+        readRanges = [(max(start, 0), min(end, dim), max(start, 0) - start)]
+
+        if wrapEdges:
+            if start < 0:
+                readRanges.append((dim + start, dim, 0))
+
+            if end > dim:
+                readRanges.append((0, end - dim, dim - start))
+
+        return readRanges
+
+    @staticmethod
+    def readBandWithHaloRows(cellGrid, bandRowStart, bandRowEnd, rowEnd, colEnd, firstRow, lastRow):
+        '''
+        Returns the cells of the rows [bandRowStart - 1, bandRowEnd + 1[. The halo rows outside
+        of the step region are replaced by the passed lastRow (above the first row) and firstRow
+        (below the last row).
+
+        :return: (bandRowEnd - bandRowStart + 2, colEnd) uint8 array
+        '''
+        cells = np.empty((bandRowEnd - bandRowStart + 2, colEnd), dtype=np.uint8)
+        cells[1:-1] = cellGrid.getWindow(bandRowStart, bandRowEnd, 0, colEnd)
+        cells[0] = cellGrid.getWindow(bandRowStart - 1, bandRowStart, 0, colEnd) if bandRowStart > 0 else lastRow
+        cells[-1] = cellGrid.getWindow(bandRowEnd, bandRowEnd + 1, 0, colEnd) if bandRowEnd < rowEnd else firstRow
+
+        return cells
+
+    def computeNextCells(self, cells, wrapCols=False):
+        '''
+        Computes the next generation of the passed band of cells.
+
+        :param cells: (row number + 2, col number) uint8 array whose first and last rows are
+                      the halo rows
+        :param wrapCols: if True, the first and last cols are neighbors. Else, the cells left
+                         of the first col and right of the last col are dead
+
+        :return: (row number, col number) uint8 array
+        '''
+        if wrapCols:
+            paddedCells = np.concatenate((cells[:, -1:], cells, cells[:, :1]), axis=1)
+        else:
+            paddedCells = np.pad(cells, ((0, 0), (1, 1)))
+
+        return self.computeNextPaddedCells(paddedCells)
+
+    def computeNextPaddedCells(self, paddedCells):
+        '''
+        Computes the next generation of the passed cells surrounded by a 1 cell halo.
+
+        :param paddedCells: (row number + 2, col number + 2) uint8 array
+
+        :return: (row number, col number) uint8 array
+        '''
+        # alive cell number of the 3 x 3 block centered on each cell, computed as the sum of
+        # the vertical 3 cell sums
+        verticalSums = paddedCells[:-2] + paddedCells[1:-1] + paddedCells[2:]
+        blockSums = verticalSums[:, :-2] + verticalSums[:, 1:-1] + verticalSums[:, 2:]
+
+        centerCells = paddedCells[1:-1, 1:-1]
+
+        return self.nextCellValues.take(2 * blockSums + centerCells)
+
+    @staticmethod
+    def concatenateChangedCells(changedCells):
+        if not changedCells:
+            return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.uint8)
+
+        return tuple(np.concatenate(changedCellArrays) for changedCellArrays in zip(*changedCells))
@@ -9,12 +9,14 @@ from tkinter import *
 from tkinter import messagebox
 
 from configurationmanager import ConfigurationManager
+from gridpatternlibrary import GridPatternLibrary
 from gridview import GridView
+from simulationscheduler import SimulationScheduler
 import os
 
 
 EVENT_BUTTON_ONE = 1
-WHITE = (255, 255, 255)
+EVENT_BUTTON_THREE = 3
 
 class GridViewController:
     def __init__(self):
@@ -31,6 +33,7 @@ class GridViewController:
         pg.display.set_caption(self.configMgr.windowTitle)
         self.clock = pg.time.Clock()
         self.running = True
+        self.loadingCaptionDisplayed = False
 
         self.gridView = GridView(surface=self.screen, configManager=self.configMgr)
         self.buttonDownPressed = False
@@ -40,6 +43,15 @@ class GridViewController:
         self.mouse_x_end = 0
         self.mouse_y_end = 0
 
+        # the patterns are parsed only when they are stamped for the first time
+        self.gridPatternLibrary = GridPatternLibrary(self.configMgr.patternDirectory)
+        self.selectedPatternName = None
+
+        # True while the cells evolve. The number of generations computed at each update
+        # is decided by the simulation scheduler, independently of the frame rate
+        self.evolving = False
+        self.simulationScheduler = SimulationScheduler(self.configMgr.fps, self.configMgr.simulationStepRate)
+
     def new(self):
         '''
         Starts a new game.
@@ -54,6 +66,8 @@ class GridViewController:
         fps = self.configMgr.fps
 
         while self.playing:
+            # the frame rate only paces the drawing. If an iteration lasted longer than a
+            # frame, tick() does not wait and the missed frames are dropped
             self.clock.tick(fps)
             self.handleEvents()
             self.update()
@@ -72,14 +86,29 @@ class GridViewController:
                     self.playing = False
                     self.running = False
                     Tk().wm_withdraw()  # to hide the main window
-                    if messagebox.askquestion(None,'Do you want to save grid data ?') == 'yes':
-                        self.gridView.saveGridData()
+                    if self.gridView.editJournal and self.gridView.gridDataFileLoaded:
+                        # the edits of the loaded grid were persisted in the edit journal,
+                        # which is merged into the grid data file without asking
+                        self.gridView.compactEditJournal()
+                    elif messagebox.askquestion(None,'Do you want to save grid data ?') == 'yes':
+                        # the grid data are saved in the background while the window closes
+                        self.gridView.startSaveGridData()
 
             # handling mouse grid move
             elif event.type == pg.MOUSEBUTTONDOWN:
                 if event.button == EVENT_BUTTON_ONE:
                     self.buttonDownPressed = True
                     self.mouse_x_beg, self.mouse_y_beg = event.pos
+                elif event.button == EVENT_BUTTON_THREE and self.selectedPatternName is not None:
+                    self.stampSelectedPattern(event.pos)
+            elif event.type == pg.KEYDOWN:
+                if event.key == pg.K_p:
+                    self.selectNextPattern()
+                elif event.key == pg.K_SPACE:
+                    self.evolving = not self.evolving
+                    self.simulationScheduler.reset()
+                elif event.key == pg.K_n and not self.evolving:
+                    self.gridView.stepCells()
             elif event.type == pg.MOUSEBUTTONUP:
                 if event.button == EVENT_BUTTON_ONE:
                     self.buttonDownPressed = False
@@ -135,23 +164,76 @@ class GridViewController:
             if keys[pg.K_LEFT]:
                 self.gridView.moveViewLeft(moveIncrementPx)
 
+    def selectNextPattern(self):
+        '''
+        Selects the pattern following the currently selected one in the pattern library
+        and displays its name in the window title.
+        '''
+        patternNames = self.gridPatternLibrary.scan()
+
+        if not patternNames:
+            return
+
+        if self.selectedPatternName in patternNames:
+            self.selectedPatternName = patternNames[(patternNames.index(self.selectedPatternName) + 1) % len(patternNames)]
+        else:
+            self.selectedPatternName = patternNames[0]
+
+        pg.display.set_caption('{} - pattern {}'.format(self.configMgr.windowTitle, self.selectedPatternName))
+
+    def stampSelectedPattern(self, xyMousePosTuple):
+        '''
+        Stamps the selected pattern at the passed mouse position. If the pattern file was
+        deleted or is invalid, the error is displayed in the window title and the pattern
+        library is scanned again, the pattern being unselected if its file was deleted.
+        '''
+        try:
+            gridPattern = self.gridPatternLibrary.getPattern(self.selectedPatternName)
+        except (KeyError, FileNotFoundError, ValueError) as e:
+            errorMessage = 'file not found' if isinstance(e, (KeyError, FileNotFoundError)) else str(e)
+            pg.display.set_caption('{} - pattern {} error: {}'.format(self.configMgr.windowTitle, self.selectedPatternName, errorMessage))
+
+            if self.selectedPatternName not in self.gridPatternLibrary.scan():
+                self.selectedPatternName = None
+
+            return
+
+        self.gridView.stampGridPattern(gridPattern, xyMousePosTuple)
+
     def update(self):
         '''
         Updates all game objects.
         '''
-        pass
+        if self.evolving:
+            self.simulationScheduler.runSteps(self.gridView.stepCells)
+
+        self.gridView.flushEditJournal()
+        self.gridView.compactEditJournalIfDue()
+        self.gridView.autosaveGridDataIfDue()
+
+        # while the grid data are loaded in the background, the loading progress is
+        # displayed in the window title
+        if self.gridView.isLoadingGridData():
+            pg.display.set_caption('{} - loading {:.0%}'.format(self.configMgr.windowTitle, self.gridView.gridDataLoadProgressRatio))
+            self.loadingCaptionDisplayed = True
+        elif self.loadingCaptionDisplayed:
+            pg.display.set_caption(self.configMgr.windowTitle)
+            self.loadingCaptionDisplayed = False
 
     def draw(self):
         '''
         Redraws all game objects. Thw actual drawing is delegated to the GridView class.
         '''
-        if self.gridView.changed:
-            # optimization: the grid is only drawned if something changed on it
-            self.screen.fill(WHITE)
-            self.gridView.draw()
+        if not self.gridView.isDrawPending():
+            return
+
+        # optimization: the grid view only redraws what changed on it and returns the
+        # updated rectangles
+        updatedRects = self.gridView.draw()
 
-            # *after* drawing everything, flip the display
-            pg.display.flip()
+        if updatedRects:
+            # *after* drawing everything, update the changed part of the display
+            pg.display.update(updatedRects)
 
     def show_start_screen(self):
         '''
@@ -161,8 +243,15 @@ class GridViewController:
         if messagebox.askquestion(None, 'Do you want to load existing grid data ?') == 'yes':
             # here, we ask the GridView to load the grid data from the file specified in the gridview.ini
             # configuration file (loadatstartpathfilename setting). In case the grid data file is not found,
-            # an error msg box informs the user.
-            fileNotFoundName = self.gridView.loadGridData()
+            # an error msg box informs the user. The grid data are loaded in the background and
+            # displayed progressively by the game loop.
+            try:
+                fileNotFoundName = self.gridView.startLoadGridData()
+            except ValueError as e:
+                # for example, a csv or a compressed grid file can not be memory mapped
+                messagebox.showerror(None, str(e) + '. Grid initialized with neutral data !')
+                self.gridView.initialiseCellsToValue(0)
+                return
             if fileNotFoundName:
                 messagebox.showerror(None, fileNotFoundName + ' not found. Grid initialized with neutral data !')
                 self.gridView.initialiseCellsToValue(0)
@@ -183,4 +272,7 @@ while g.running:
     g.run()
     g.show_go_screen()
 
-pg.quit()
\ No newline at end of file
+pg.quit()
+
+# the window is closed, but the process must not exit before the grid data are saved
+g.gridView.waitGridDataSaved()
\ No newline at end of file
@@ -0,0 +1,90 @@
+import time
+
+# part of the frame interval which can be spent computing generations. The rest of the frame
+# interval is left for handling the events and drawing
+SIMULATION_FRAME_BUDGET_RATIO = 0.75
+
+class SimulationScheduler():
+    '''
+    This class decides how many generations are computed during each frame of the game loop,
+    so that the simulation rate does not depend on the display frame rate.
+
+    With a step rate, the generations are computed on a fixed timestep: the time elapsed since
+    the previous frame is accumulated and one generation is computed per 1 / step rate second
+    of accumulated time, i.e. step rate / fps generations per frame. Without step rate, as many
+    generations as fit in the simulation budget of the frame are computed.
+
+    In both cases, the generations of a frame are computed at most during the simulation
+    budget, so that the events are still handled and the grid view still drawn under load.
+    The accumulated time which could not be simulated within the budget is dropped instead of
+    being carried over, otherwise the backlog would grow frame after frame.
+    '''
+    def __init__(self, fps, stepRate=0, clock=time.perf_counter):
+        '''
+        :param fps: display frame rate
+        :param stepRate: generations per second. 0 means as many generations as fit in the
+                         simulation budget of each frame
+        :param clock: function returning the current time in seconds
+        '''
+        self.stepRate = stepRate
+        self.simulationBudget = SIMULATION_FRAME_BUDGET_RATIO / fps
+        self.clock = clock
+        self.pendingStepTime = 0
+        self.lastRunTime = None
+
+        # statistics, displayable by the game loop
+        self.stepNumber = 0
+        self.droppedStepNumber = 0
+
+    def reset(self):
+        '''
+        Forgets the accumulated time, for example when the evolution is resumed, so that the
+        time elapsed while it was paused is not simulated.
+        '''
+        self.pendingStepTime = 0
+        self.lastRunTime = None
+
+    def runSteps(self, stepFunction):
+        '''
+        Computes the generations due for the current frame.
+
+        :param stepFunction: function computing one generation and returning False if the
+                             cells did not change, in which case the next generations would
+                             not change them either and the frame steps are stopped
+
+        :return: number of generations computed
+        '''
+        frameStartTime = self.clock()
+
+        if self.stepRate > 0:
+            if self.lastRunTime is not None:
+                self.pendingStepTime += frameStartTime - self.lastRunTime
+
+            self.lastRunTime = frameStartTime
+            stepDuration = 1 / self.stepRate
+            dueStepNumber = int(self.pendingStepTime / stepDuration)
+            self.pendingStepTime -= dueStepNumber * stepDuration
+
+            if self.pendingStepTime < 0:
+                self.pendingStepTime = 0
+        else:
+            dueStepNumber = None
+
+        frameStepNumber = 0
+
+        while dueStepNumber is None or frameStepNumber < dueStepNumber:
+            frameStepNumber += 1
+
+            if not stepFunction():
+                break
+
+            if self.clock() - frameStartTime >= self.simulationBudget:
+                if dueStepNumber is not None:
+                    # the steps which did not fit in the budget are dropped
+                    self.droppedStepNumber += dueStepNumber - frameStepNumber
+
+                break
+
+        self.stepNumber += frameStepNumber
+
+        return frameStepNumber
@@ -0,0 +1,67 @@
+import unittest
+import os, sys, inspect
+
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, parentdir)
+
+from activetilemap import ActiveTileMap
+from cellgrid import CellGrid, ChunkedCellGrid, UNBOUNDED_CELL_NUMBER
+from hashlife import HashLifeCellGrid
+
+
+class TestActiveTileMap(unittest.TestCase):
+    def testAddChangedCells(self):
+        activeTileMap = ActiveTileMap(tileSize=8)
+
+        # the changed tiles are unknown until a generation was computed
+        activeTileMap.addChangedCells([3], [5])
+        self.assertFalse(activeTileMap.isTracking())
+
+        activeTileMap.setChangedTiles(set())
+        activeTileMap.addChangedCells([3, 4, 17], [5, 6, 40])
+        self.assertEqual({(0, 0), (2, 5)}, activeTileMap.changedTiles)
+
+        # cells scattered over a huge zone
+        activeTileMap.addChangedCells([0, 2 ** 40], [2 ** 40, 0])
+        self.assertEqual({(0, 0), (2, 5), (0, 2 ** 37), (2 ** 37, 0)}, activeTileMap.changedTiles)
+
+        activeTileMap.reset()
+        self.assertFalse(activeTileMap.isTracking())
+
+    def testStartTracking(self):
+        # the tiles containing alive cells of a dense grid can not be found without reading it
+        cellGrid = CellGrid(40, 40)
+        activeTileMap = ActiveTileMap(tileSize=8)
+        self.assertFalse(activeTileMap.startTracking(cellGrid))
+
+        # empty grid
+        self.assertTrue(activeTileMap.startTracking(CellGrid(0, 0)))
+        self.assertEqual(set(), activeTileMap.changedTiles)
+
+        # allocated tiles far from the origin, smaller than the map tiles
+        cellGrid = ChunkedCellGrid(UNBOUNDED_CELL_NUMBER, UNBOUNDED_CELL_NUMBER, tileSize=4)
+        cellGrid.setCell(2 ** 39 + 5, 2 ** 39, 1)
+        cellGrid.setCell(3, 9, 1)
+        activeTileMap = ActiveTileMap(tileSize=8)
+        self.assertTrue(activeTileMap.startTracking(cellGrid))
+        self.assertEqual({(2 ** 36, 2 ** 36), (0, 1)}, activeTileMap.changedTiles)
+
+        # populated HashLife node, which is not aligned on the map tiles
+        cellGrid = HashLifeCellGrid(UNBOUNDED_CELL_NUMBER, UNBOUNDED_CELL_NUMBER)
+        cellGrid.setCell(2 ** 20 + 3, 2 ** 20 + 70, 1)
+        activeTileMap = ActiveTileMap(tileSize=64)
+        self.assertTrue(activeTileMap.startTracking(cellGrid))
+        self.assertIn((2 ** 14, 2 ** 14 + 1), activeTileMap.changedTiles)
+        self.assertLessEqual(len(activeTileMap.changedTiles), 4)
+
+    def testComputeActiveTiles(self):
+        activeTileMap = ActiveTileMap(tileSize=8)
+        activeTileMap.setChangedTiles({(0, 0)})
+
+        self.assertEqual({(0, 0), (0, 1), (1, 0), (1, 1)}, activeTileMap.computeActiveTiles(4, 4))
+        self.assertEqual({(row, col) for row in (3, 0, 1) for col in (3, 0, 1)}, activeTileMap.computeActiveTiles(4, 4, wrapEdges=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import os, sys, inspect
+
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, parentdir)
+
+import pygame as pg
+
+from axislabelcache import AxisLabelCache
+
+
+class TestAxisLabelCache(unittest.TestCase):
+    def setUp(self):
+        pg.font.init()
+
+    def testGetLabelReturnsCachedSurface(self):
+        '''
+        Ensures a label is rendered only once and then returned from the cache.
+        '''
+        axisLabelCache = AxisLabelCache(fontSize=12)
+        label = axisLabelCache.getLabel(17)
+
+        self.assertIs(label, axisLabelCache.getLabel(17))
+        self.assertEqual(1, len(axisLabelCache.labels))
+
+    def testLeastRecentlyUsedLabelEvicted(self):
+        '''
+        Ensures that when the cache is full, the least recently used label is evicted.
+        '''
+        axisLabelCache = AxisLabelCache(fontSize=12, maxCachedLabelNumber=2)
+        axisLabelCache.getLabel(1)
+        axisLabelCache.getLabel(2)
+        axisLabelCache.getLabel(1)
+        axisLabelCache.getLabel(3)
+
+        self.assertEqual([(1, 12), (3, 12)], list(axisLabelCache.labels.keys()))
+
+    def testSetFontSizeInvalidatesCache(self):
+        axisLabelCache = AxisLabelCache(fontSize=12)
+        axisLabelCache.getLabel(1)
+        axisLabelCache.setFontSize(12)
+
+        self.assertEqual(1, len(axisLabelCache.labels))
+
+        axisLabelCache.setFontSize(14)
+
+        self.assertEqual(0, len(axisLabelCache.labels))
+        axisLabelCache.getLabel(1)
+        self.assertEqual([(1, 14)], list(axisLabelCache.labels.keys()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+import unittest
+import os, sys, inspect
+import threading
+
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, parentdir)
+
+import numpy as np
+
+from cellgrid import CellGrid, ChunkedCellGrid, PackedCellGrid, UNBOUNDED_CELL_NUMBER
+
+
+class TestCellGrid(unittest.TestCase):
+    def testCellGridInstanciation(self):
+        '''
+        Ensures the grid has the required dimensions, is filled with the passed value and
+        is stored as a one byte per cell array.
+        '''
+        cellGrid = CellGrid(dimX=4, dimY=3, value=1)
+
+        self.assertEqual(4, cellGrid.dimX)
+        self.assertEqual(3, cellGrid.dimY)
+        self.assertEqual(3, len(cellGrid))
+        self.assertEqual(np.uint8, cellGrid.cells.dtype)
+        self.assertEqual([[1, 1, 1, 1], [1, 1, 1, 1], [1, 1, 1, 1]], cellGrid)
+
+    def testRowColAccess(self):
+        '''
+        Ensures the grid[row][col] access semantics of the former list of list matrix is
+        preserved and is consistent with getCell(), setCell() and grid[row, col].
+        '''
+        cellGrid = CellGrid(dimX=4, dimY=3)
+        cellGrid.setCell(row=2, col=1, value=1)
+
+        self.assertEqual(1, cellGrid[2][1])
+        self.assertEqual(1, cellGrid[2, 1])
+        self.assertEqual(1, cellGrid.getCell(2, 1))
+        self.assertEqual(0, cellGrid[1][2])
+
+        cellGrid[0, 3] = 1
+        self.assertEqual([[0, 0, 0, 1], [0, 0, 0, 0], [0, 1, 0, 0]], cellGrid)
+
+    def testFromMatrixTruncateAndComplete(self):
+        '''
+        Ensures a list of list matrix is truncated horizontally and completed vertically
+        with 0 values to fit the required dimensions.
+        '''
+        cellGrid = CellGrid.fromMatrix([[1, 1, 0],
+                                        [1, 0, 1]], requiredDimX=2, requiredDimY=3)
+
+        self.assertEqual([[1, 1], [1, 0], [0, 0]], cellGrid)
+
+    def testFillAndClear(self):
+        cellGrid = CellGrid(dimX=3, dimY=2)
+        cellGrid.fill(1)
+
+        self.assertEqual([[1, 1, 1], [1, 1, 1]], cellGrid)
+
+        cellGrid.clear()
+        self.assertEqual([[0, 0, 0], [0, 0, 0]], cellGrid)
+
+    def testGetAndSetWindow(self):
+        '''
+        Ensures a window is clipped to the grid dimensions when read or written.
+        '''
+        cellGrid = CellGrid(dimX=4, dimY=4)
+        cellGrid.setWindow(2, 2, [[1, 1, 1],
+                                  [1, 0, 1],
+                                  [1, 1, 1]])
+
+        self.assertEqual([[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 1, 1], [0, 0, 1, 0]], cellGrid)
+        self.assertEqual([[1, 1], [1, 0]], cellGrid.getWindow(2, 6, 2, 6).tolist())
+
+    def testCopyIsIndependent(self):
+        cellGrid = CellGrid(dimX=2, dimY=2)
+        cellGridCopy = cellGrid.copy()
+        cellGridCopy.setCell(0, 0, 1)
+
+        self.assertEqual([[0, 0], [0, 0]], cellGrid)
+        self.assertEqual([[1, 0], [0, 0]], cellGridCopy)
+
+
+class TestChunkedCellGrid(unittest.TestCase):
+    def testTilesAllocatedOnFirstWrite(self):
+        '''
+        Ensures a tile is only allocated when a non 0 value is written into it, even on an
+        unbounded grid.
+        '''
+        cellGrid = ChunkedCellGrid(tileSize=4)
+
+        self.assertEqual(UNBOUNDED_CELL_NUMBER, cellGrid.dimX)
+        self.assertEqual(0, len(cellGrid.tiles))
+
+        cellGrid.setCell(row=10 ** 9, col=10 ** 10, value=0)
+        self.assertEqual(0, len(cellGrid.tiles))
+
+        cellGrid.setCell(row=10 ** 9, col=10 ** 10, value=1)
+        self.assertEqual(1, len(cellGrid.tiles))
+        self.assertEqual(1, cellGrid.getCell(10 ** 9, 10 ** 10))
+        self.assertEqual(0, cellGrid.getCell(10 ** 9, 10 ** 10 + 1))
+
+    def testGetAndSetWindowAcrossTiles(self):
+        cellGrid = ChunkedCellGrid(dimX=10, dimY=10, tileSize=4)
+        cellGrid.setWindow(3, 3, [[1, 1, 1],
+                                  [1, 0, 1],
+                                  [1, 1, 1]])
+
+        self.assertEqual(4, len(cellGrid.tiles))
+        self.assertEqual([[0, 0, 0, 0], [0, 1, 1, 1], [0, 1, 0, 1], [0, 1, 1, 1]], cellGrid.getWindow(2, 6, 2, 6).tolist())
+        self.assertEqual((8, 8), cellGrid.getDataExtent())
+
+    def testGetWindowWhileTilesAreAdded(self):
+        '''
+        Ensures the grid can be read while another thread adds tiles to it, which is what the
+        grid view does while loading the grid data in the background.
+        '''
+        cellGrid = ChunkedCellGrid(dimX=500, dimY=500, tileSize=2)
+        readErrors = []
+        writeDone = threading.Event()
+        savedSwitchInterval = sys.getswitchinterval()
+
+        def readCells():
+            try:
+                while not writeDone.is_set():
+                    cellGrid.getDataExtent()
+                    cellGrid.iterTileKeys(0, 500, 0, 500)
+            except RuntimeError as e:
+                readErrors.append(e)
+
+        try:
+            sys.setswitchinterval(1e-6)
+            readThread = threading.Thread(target=readCells)
+            readThread.start()
+
+            for row in range(0, 500, 2):
+                cellGrid.setWindow(row, 0, np.ones((1, 500), dtype=np.uint8))
+
+            writeDone.set()
+            readThread.join()
+        finally:
+            sys.setswitchinterval(savedSwitchInterval)
+
+        self.assertEqual([], readErrors)
+
+    def testEqualsDenseGrid(self):
+        '''
+        Ensures a sparse grid compares equal to the dense grid containing the same cells.
+        '''
+        chunkedCellGrid = ChunkedCellGrid(dimX=5, dimY=3, tileSize=2)
+        cellGrid = CellGrid(dimX=5, dimY=3)
+
+        for row, col in ((0, 4), (2, 1)):
+            chunkedCellGrid.setCell(row, col, 1)
+            cellGrid.setCell(row, col, 1)
+
+        self.assertEqual(chunkedCellGrid, cellGrid.cells)
+        self.assertEqual(cellGrid.tolist(), chunkedCellGrid.tolist())
+
+    def testSetCellOutsideGridRaisesIndexError(self):
+        cellGrid = ChunkedCellGrid(dimX=5, dimY=5)
+
+        with self.assertRaises(IndexError):
+            cellGrid.setCell(5, 0, 1)
+
+
+class TestPackedCellGrid(unittest.TestCase):
+    def testGetAndSetWindowAcrossBytes(self):
+        '''
+        Ensures windows which do not start or end on a packed byte boundary are read and
+        written like on a dense grid, the cells around the written zone being preserved.
+        '''
+        cells = (np.arange(13 * 21).reshape(13, 21) % 3 == 0).astype(np.uint8)
+        packedCellGrid = PackedCellGrid(dimX=21, dimY=13, packedRows=np.packbits(cells, axis=1))
+        pattern = np.ones((4, 11), dtype=np.uint8)
+        packedCellGrid.setWindow(3, 5, pattern)
+        cells[3:7, 5:16] = pattern
+
+        self.assertEqual(3, packedCellGrid.packedRows.shape[1])
+        self.assertEqual(packedCellGrid, cells)
+        self.assertEqual(cells[2:9, 3:19].tolist(), packedCellGrid.getWindow(2, 9, 3, 19).tolist())
+
+    def testSetCell(self):
+        packedCellGrid = PackedCellGrid(dimX=10, dimY=2)
+        packedCellGrid.setCell(1, 9, 1)
+        packedCellGrid[0, 7] = 1
+
+        self.assertEqual([[0, 0, 0, 0, 0, 0, 0, 1, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 1]], packedCellGrid)
+
+        packedCellGrid.setCell(0, 7, 0)
+        self.assertEqual(0, packedCellGrid.getCell(0, 7))
+
+        with self.assertRaises(IndexError):
+            packedCellGrid.setCell(0, 10, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -40,6 +40,8 @@ class TestConfigurationManager(unittest.TestCase):
         self.assertEqual(self.configMgr.gridCoordMarginSize, 20)
         self.assertEqual(self.configMgr.gridAxisFontSize, 12)
         self.assertEqual(self.configMgr.gridMoveIncrement, 1)
+        self.assertFalse(self.configMgr.execTrace)
+        self.assertEqual(self.configMgr.autosaveInterval, 300)
 
 
     def testConfigurationManagerInstanciationNoConfigFile(self):
@@ -0,0 +1,104 @@
+import unittest
+import os, sys, inspect
+import subprocess
+import tempfile
+
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, parentdir)
+
+import numpy as np
+
+from cellgrid import ChunkedCellGrid, UNBOUNDED_CELL_NUMBER
+from configurationmanager import ConfigurationManager
+from griddatamanager import GridDataManager
+from gridbatch import GridBatch, main, parsePatternInsert
+
+
+class TestGridBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.configFilename = os.path.join(self.tmpDir.name, 'gridbatch_test.ini')
+
+        # an unbounded sparse grid is written up to its data extent only
+        configMgr = ConfigurationManager(self.configFilename)
+        configMgr.cellStorage = 'sparse'
+        configMgr.sparseGridCellNumber = '0'
+        configMgr.patternDirectory = self.tmpDir.name
+        configMgr.storeConfig()
+        self.configMgr = configMgr
+
+        with open(os.path.join(self.tmpDir.name, 'pattern_blinker.csv'), 'w') as file:
+            file.write('1\t1\t1\n')
+
+    def tearDown(self):
+        self.tmpDir.cleanup()
+
+    def writeGridData(self, filename, cells):
+        gridDataMgr = GridDataManager(configManager=self.configMgr)
+        pathname = os.path.join(self.tmpDir.name, filename)
+        gridDataMgr.writeGridData(np.array(cells, dtype=np.uint8), pathname)
+
+        return pathname
+
+    def readGridData(self, pathname):
+        gridDataMgr = GridDataManager(configManager=self.configMgr)
+        gridDataMgr.filename = pathname
+        cellGrid, _ = gridDataMgr.readGridData(7, 5)
+
+        return cellGrid.tolist()
+
+    def testInsertPatternAndStep(self):
+        '''
+        Ensures the patterns are inserted before the generations are computed and that the
+        result is written in the output directory, in the requested format.
+        '''
+        inputFilenames = [self.writeGridData(filename, [[0, 0, 0, 0, 0, 0, 1]]) for filename in ('a.csv', 'b.csv')]
+        outputDir = os.path.join(self.tmpDir.name, 'out')
+
+        exitCode = main(['-c', self.configFilename, '-n', '3', '-p', 'blinker@2,1', '-o', outputDir, '-e', '.grid', '-j', '2'] + inputFilenames)
+
+        self.assertEqual(0, exitCode)
+
+        for filename in ('a.grid', 'b.grid'):
+            # the single cell died and the blinker is vertical after an odd number of generations
+            self.assertEqual([[0, 0, 0, 0, 0, 0, 0],
+                              [0, 0, 1, 0, 0, 0, 0],
+                              [0, 0, 1, 0, 0, 0, 0],
+                              [0, 0, 1, 0, 0, 0, 0],
+                              [0, 0, 0, 0, 0, 0, 0]],
+                             self.readGridData(os.path.join(outputDir, filename)))
+
+    def testStepFarCells(self):
+        '''
+        Ensures that the generations of cells far from the origin are computed on their tiles
+        only, not on the whole data extent of the unbounded grid.
+        '''
+        cellGrid = ChunkedCellGrid(UNBOUNDED_CELL_NUMBER, UNBOUNDED_CELL_NUMBER)
+        cellGrid.setWindow(2 ** 39, 2 ** 39, [[1, 1, 1]])
+
+        cellGrid = GridBatch(self.configMgr).stepCells(cellGrid, 3)
+
+        np.testing.assert_array_equal([[0, 1, 0], [0, 1, 0], [0, 1, 0]], cellGrid.getWindow(2 ** 39 - 1, 2 ** 39 + 2, 2 ** 39, 2 ** 39 + 3))
+
+    def testMissingFileReported(self):
+        exitCode = main(['-c', self.configFilename, '-n', '1', os.path.join(self.tmpDir.name, 'missing.csv')])
+
+        self.assertEqual(1, exitCode)
+
+    def testParsePatternInsert(self):
+        self.assertEqual(('glider', 10, 20), parsePatternInsert('glider@10,20'))
+
+        with self.assertRaises(Exception):
+            parsePatternInsert('glider@10')
+
+    def testPygameAndTkinterNotImported(self):
+        importedModules = subprocess.run([sys.executable, '-c', 'import sys, gridbatch; print(sorted(sys.modules))'],
+                                         cwd=parentdir, capture_output=True, text=True, check=True).stdout
+
+        self.assertNotIn("'pygame'", importedModules)
+        self.assertNotIn("'tkinter'", importedModules)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+import json
+import os, sys, inspect
+
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, parentdir)
+
+import pygame as pg
+
+from gridbenchmark import GridViewBenchmark, BENCHMARK_OPERATIONS
+
+
+class TestGridBenchmark(unittest.TestCase):
+    def testRunAllCombinations(self):
+        '''
+        Ensures a result is computed for each combination of the benchmarked parameters. The
+        benchmark draws on an offscreen surface, so that the display of the other tests is
+        not replaced.
+        '''
+        pg.font.init()
+        gridViewBenchmark = GridViewBenchmark(os.path.join(currentdir, 'TestGridView_config.ini'), pg.Surface((300, 200)), repeatNumber=2)
+
+        results = gridViewBenchmark.run([2, 40], [0.5], ['1, 0', '3, 1'])
+
+        self.assertEqual(2 * 2 * len(BENCHMARK_OPERATIONS), len(results))
+        self.assertEqual({2, 40}, {result['cellSize'] for result in results})
+        self.assertEqual({'1, 0', '3, 1'}, {result['gridLineWidthTuple'] for result in results})
+        self.assertTrue(all(result['repeatNumber'] == 2 and 0 <= result['minMs'] <= result['maxMs'] for result in results))
+        self.assertEqual(results, json.loads(json.dumps(results)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,11 @@ currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentfram
 parentdir = os.path.dirname(currentdir)
 sys.path.insert(0,parentdir)
 
+import numpy as np
+
+from binarygridfile import BinaryGridFile, BINARY_GRID_FILE_HEADER_SIZE
+from cellgrid import CellGrid, ChunkedCellGrid, PackedCellGrid
+import griddatamanager
 from griddatamanager import GridDataManager
 
 class TestGridDataManager(unittest.TestCase):
@@ -332,5 +337,244 @@ class TestGridDataManager(unittest.TestCase):
 
         os.remove(csvFileName)
 
+    def testWriteReadBinaryGridData(self):
+        '''
+        This test case ensures that a grid written into a .grid binary file is read back unchanged,
+        the excess data being ignored and the missing data completed with 0 values as for a csv
+        file. The cells of a row are bit packed, 10 cells requiring 2 bytes.
+        '''
+        binaryFileName = "test.grid"
+        self.gridDataMgr.filename = binaryFileName
+        gridData = [[1, 1, 0, 0, 1, 0, 0, 0, 1, 1],
+                    [1, 0, 1, 1, 0, 0, 0, 0, 0, 1],
+                    [0, 0, 1, 1, 0, 1, 0, 1, 0, 0]]
+        self.gridDataMgr.writeGridData(gridData)
+
+        self.assertEqual(BINARY_GRID_FILE_HEADER_SIZE + 3 * 2, os.path.getsize(binaryFileName))
+
+        readGridData, fileNotFoundName = self.gridDataMgr.readGridData(requiredDimX=10, requiredDimY=3)
+
+        self.assertEqual(gridData, readGridData)
+        self.assertIsNone(fileNotFoundName)
+
+        readGridData, fileNotFoundName = self.gridDataMgr.readGridData(requiredDimX=12, requiredDimY=2)
+
+        self.assertEqual([[1, 1, 0, 0, 1, 0, 0, 0, 1, 1, 0, 0],[1, 0, 1, 1, 0, 0, 0, 0, 0, 1, 0, 0]], readGridData)
+
+        os.remove(binaryFileName)
+
+    def testWriteReadCompressedBinaryGridData(self):
+        compressedFileName = "test.gridz"
+        self.gridDataMgr.filename = compressedFileName
+        gridData = np.zeros((200, 300), dtype=np.uint8)
+        gridData[100, 10:20] = 1
+        self.gridDataMgr.writeGridData(gridData)
+
+        self.assertLess(os.path.getsize(compressedFileName), 200 * 300 // 8)
+
+        readGridData, fileNotFoundName = self.gridDataMgr.readGridData(requiredDimX=300, requiredDimY=200)
+
+        self.assertEqual(readGridData, gridData)
+        self.assertIsNone(fileNotFoundName)
+
+        os.remove(compressedFileName)
+
+    def testReadBinaryGridDataFileNotFound(self):
+        self.gridDataMgr.filename = "not_exist.gridz"
+
+        gridData, fileNotFoundName = self.gridDataMgr.readGridData(requiredDimX=3, requiredDimY=3)
+
+        self.assertIsNone(gridData)
+        self.assertEqual("not_exist.gridz", fileNotFoundName)
+
+    def testReadInvalidBinaryGridDataRaisesValueError(self):
+        binaryFileName = "test.grid"
+        self.gridDataMgr.filename = binaryFileName
+
+        with open(binaryFileName, 'w') as file:
+            file.write('\t0\t1\n0\t1\t0\n')
+
+        with self.assertRaises(ValueError):
+            self.gridDataMgr.readGridData(requiredDimX=2, requiredDimY=1)
+
+        os.remove(binaryFileName)
+
+    def testMapGridDataKeepsFileUnchangedUntilSaved(self):
+        '''
+        This test case ensures that a memory mapped .grid file has the file dimensions, that the
+        cell modifications are not written into the file until the grid is saved and that the
+        grid can be saved into the file it maps.
+        '''
+        binaryFileName = "test.grid"
+        self.gridDataMgr.filename = binaryFileName
+        gridData = [[1, 1, 0, 0, 1, 0, 0, 0, 1, 1],
+                    [1, 0, 1, 1, 0, 0, 0, 0, 0, 1]]
+        self.gridDataMgr.writeGridData(gridData)
+
+        mappedGridData, fileNotFoundName = self.gridDataMgr.mapGridData()
+
+        self.assertIsInstance(mappedGridData, PackedCellGrid)
+        self.assertEqual(gridData, mappedGridData)
+        self.assertIsNone(fileNotFoundName)
+
+        mappedGridData.setCell(1, 1, 1)
+
+        self.assertEqual(gridData, self.gridDataMgr.readGridData(requiredDimX=10, requiredDimY=2)[0])
+
+        self.gridDataMgr.writeGridData(mappedGridData)
+        gridData[1][1] = 1
+
+        self.assertEqual(gridData, self.gridDataMgr.readGridData(requiredDimX=10, requiredDimY=2)[0])
+        self.assertEqual(gridData, mappedGridData)
+
+        # the grid maps the new file, the map of the replaced file having been dropped
+        self.assertTrue(BinaryGridFile.isMappedFile(mappedGridData.packedRows, binaryFileName))
+        self.assertFalse(os.path.exists(binaryFileName + '.tmp'))
+
+        del mappedGridData
+        os.remove(binaryFileName)
+
+    def testMapCompressedGridDataRaisesValueError(self):
+        compressedFileName = "test.gridz"
+        self.gridDataMgr.filename = compressedFileName
+        self.gridDataMgr.writeGridData([[1, 0], [0, 1]])
+
+        with self.assertRaises(ValueError):
+            self.gridDataMgr.mapGridData()
+
+        os.remove(compressedFileName)
+
+    def testReadWriteCsvGridDataByRowBatches(self):
+        '''
+        This test case ensures that reading and writing a csv file by batches of rows smaller than
+        the grid gives the same result as processing the grid at once and that the progress
+        callback reports a growing ratio ending with 1.
+        '''
+        csvFileName = "test.csv"
+        gridData = (np.arange(7 * 5).reshape(7, 5) % 4 == 1).astype(np.uint8)
+        savedRowBatchCellNumber = griddatamanager.ROW_BATCH_CELL_NUMBER
+        progressRatios = []
+
+        try:
+            # 2 rows per batch
+            griddatamanager.ROW_BATCH_CELL_NUMBER = 12
+            self.gridDataMgr.writeGridData(gridData)
+            readGridData, fileNotFoundName = self.gridDataMgr.readGridData(requiredDimX=6, requiredDimY=6,
+                                                                           progressCallback=progressRatios.append)
+        finally:
+            griddatamanager.ROW_BATCH_CELL_NUMBER = savedRowBatchCellNumber
+
+        expectedGridData = np.zeros((6, 6), dtype=np.uint8)
+        expectedGridData[:, :5] = gridData[:6]
+
+        self.assertEqual(readGridData, expectedGridData)
+        self.assertEqual(4, len(progressRatios))
+        self.assertEqual(sorted(progressRatios), progressRatios)
+        self.assertEqual(1.0, progressRatios[-1])
+
+        os.remove(csvFileName)
+
+    def testReadCsvGridDataWithMultiDigitValues(self):
+        '''
+        This test case ensures that csv rows which are not made of one digit values separated by
+        single tabs, like the rows written by other tools, are correctly parsed.
+        '''
+        csvFileName = "test.csv"
+
+        with open(csvFileName, 'w') as file:
+            file.write('\t0\t1\t2\n0\t1\t10\t0\r\n\n1\t0\t1\t1\n')
+
+        gridData, fileNotFoundName = self.gridDataMgr.readGridData(requiredDimX=3, requiredDimY=3)
+
+        self.assertEqual([[1, 10, 0], [0, 1, 1], [0, 0, 0]], gridData)
+
+        os.remove(csvFileName)
+
+    def testConvertCsvGridDataToBinaryGridData(self):
+        csvFileName = "test.csv"
+        compressedFileName = "test.gridz"
+        gridData = [[1, 1, 0, 0, 1, 0, 0, 0, 1],
+                    [1, 0, 1, 1, 0, 0, 0, 0, 0]]
+        self.gridDataMgr.writeGridData(gridData)
+
+        self.gridDataMgr.convertGridData(compressedFileName)
+        self.gridDataMgr.filename = compressedFileName
+        convertedGridData, fileNotFoundName = self.gridDataMgr.readGridData(requiredDimX=9, requiredDimY=2)
+
+        self.assertEqual(gridData, convertedGridData)
+
+        os.remove(csvFileName)
+        os.remove(compressedFileName)
+
+    def testJournalReplayedOnLoadAndDeletedOnWrite(self):
+        '''
+        This test case ensures that the journaled cell edits are replayed in order when the grid
+        data are loaded, that a partially written last record and the edits outside of the grid
+        are ignored and that writing the grid data file deletes the journal.
+        '''
+        csvFileName = "test.csv"
+        gridData = [[1, 1, 0],
+                    [1, 0, 1]]
+        self.gridDataMgr.writeGridData(gridData)
+        self.gridDataMgr.appendJournal([(0, 0, 0), (1, 1, 1)])
+        self.gridDataMgr.appendJournal([(1, 1, 0), (0, 2, 1), (5, 0, 1)])
+
+        with open(self.gridDataMgr.getJournalFilename(), 'ab') as file:
+            file.write(b'\x01\x00')
+
+        self.assertEqual(5, self.gridDataMgr.journalRecordNumber)
+
+        readGridData, _ = self.gridDataMgr.readGridData(requiredDimX=3, requiredDimY=2)
+
+        self.assertEqual([[0, 1, 1], [1, 0, 1]], readGridData)
+        self.assertEqual(5, self.gridDataMgr.journalRecordNumber)
+
+        self.gridDataMgr.writeGridData(readGridData)
+
+        self.assertFalse(os.path.exists(self.gridDataMgr.getJournalFilename()))
+        self.assertEqual(0, self.gridDataMgr.journalRecordNumber)
+        self.assertEqual([[0, 1, 1], [1, 0, 1]], self.gridDataMgr.readGridData(requiredDimX=3, requiredDimY=2)[0])
+
+        os.remove(csvFileName)
+
+    def testInsertGridPatternToGridDataOverwrite(self):
+        '''
+        This test case ensures that in overwrite mode, the pattern overwrites the grid data
+        without changing the grid size, the pattern part outside of the grid being ignored.
+        '''
+        gridData = CellGrid(dimX=4, dimY=3, value=1)
+        gridPattern = [[0, 1],
+                       [1, 0]]
+
+        insertedGridData = self.gridDataMgr.insertGridPatternToGridData(gridPattern, gridData, 3, 0)
+
+        self.assertIs(gridData, insertedGridData)
+        self.assertEqual([[1, 1, 1, 0], [1, 1, 1, 1], [1, 1, 1, 1]], insertedGridData)
+
+        insertedGridData = self.gridDataMgr.insertGridPatternToGridData([[1, 0], [0, 1]], gridData, -1, 2)
+
+        self.assertEqual([[1, 1, 1, 0], [1, 1, 1, 1], [0, 1, 1, 1]], insertedGridData)
+
+    def testInsertGridPatternToGridDataExpand(self):
+        '''
+        This test case ensures that in expand mode, rows and cols are added to the grid data to
+        make room to the inserted pattern, the existing data being moved right and down.
+        '''
+        gridData = [[1, 2, 3],
+                    [4, 5, 6]]
+        gridPattern = [[7, 7],
+                       [7, 7]]
+
+        insertedGridData = self.gridDataMgr.insertGridPatternToGridData(gridPattern, gridData, 1, 1, doOverwrite=False)
+
+        self.assertEqual([[1, 0, 0, 2, 3],
+                          [0, 7, 7, 0, 0],
+                          [0, 7, 7, 0, 0],
+                          [4, 0, 0, 5, 6]], insertedGridData)
+
+        with self.assertRaises(ValueError):
+            self.gridDataMgr.insertGridPatternToGridData(gridPattern, ChunkedCellGrid(dimX=3, dimY=2), 1, 1, doOverwrite=False)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
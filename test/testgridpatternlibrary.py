@@ -0,0 +1,89 @@
+import unittest
+import os, sys, inspect
+import tempfile
+
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, parentdir)
+
+import numpy as np
+
+from gridpatternlibrary import GridPatternLibrary
+
+
+class TestGridPatternLibrary(unittest.TestCase):
+    def setUp(self):
+        self.patternDir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.patternDir.cleanup()
+
+    def writePatternFile(self, filename, content):
+        pathname = os.path.join(self.patternDir.name, filename)
+
+        with open(pathname, 'w') as file:
+            file.write(content)
+
+        return pathname
+
+    def testScanIndexesPatternFilesOnly(self):
+        self.writePatternFile('pattern_glider.csv', '0\t1\t0\n0\t0\t1\n1\t1\t1\n')
+        self.writePatternFile('pattern_block.CSV', '1\t1\n1\t1\n')
+        self.writePatternFile('griddata.csv', '\t0\t1\n0\t0\t1\n')
+        gridPatternLibrary = GridPatternLibrary(self.patternDir.name)
+
+        self.assertEqual(['block', 'glider'], gridPatternLibrary.getPatternNames())
+        self.assertEqual(0, len(gridPatternLibrary.patterns))
+
+    def testGetPatternReturnsCachedPattern(self):
+        '''
+        Ensures a pattern file is parsed only once and that the parsed pattern can not be
+        modified by the caller.
+        '''
+        self.writePatternFile('pattern_glider.csv', '0\t1\t0\r\n0\t0\t1\r\n1\t1\t1\r\n')
+        gridPatternLibrary = GridPatternLibrary(self.patternDir.name)
+        pattern = gridPatternLibrary.getPattern('glider')
+
+        np.testing.assert_array_equal([[0, 1, 0], [0, 0, 1], [1, 1, 1]], pattern)
+        self.assertIs(pattern, gridPatternLibrary.getPattern('glider'))
+        self.assertFalse(pattern.flags.writeable)
+
+    def testModifiedPatternFileParsedAgain(self):
+        pathname = self.writePatternFile('pattern_line.csv', '1\t1\t1\n')
+        gridPatternLibrary = GridPatternLibrary(self.patternDir.name)
+        gridPatternLibrary.getPattern('line')
+        self.writePatternFile('pattern_line.csv', '1\n1\n1\n')
+        pathnameStat = os.stat(pathname)
+        os.utime(pathname, ns=(pathnameStat.st_atime_ns, pathnameStat.st_mtime_ns + 10 ** 9))
+
+        np.testing.assert_array_equal([[1], [1], [1]], gridPatternLibrary.getPattern('line'))
+        self.assertEqual(1, len(gridPatternLibrary.patterns))
+
+    def testLeastRecentlyUsedPatternEvicted(self):
+        for patternName in ('a', 'b', 'c'):
+            self.writePatternFile('pattern_' + patternName + '.csv', '1\n')
+
+        gridPatternLibrary = GridPatternLibrary(self.patternDir.name, maxCachedPatternNumber=2)
+        gridPatternLibrary.getPattern('a')
+        gridPatternLibrary.getPattern('b')
+        gridPatternLibrary.getPattern('a')
+        gridPatternLibrary.getPattern('c')
+
+        self.assertEqual(['pattern_a.csv', 'pattern_c.csv'], [os.path.basename(pathname) for pathname, mtime in gridPatternLibrary.patterns])
+
+    def testGetUnknownPatternRaisesKeyError(self):
+        gridPatternLibrary = GridPatternLibrary(self.patternDir.name)
+
+        with self.assertRaises(KeyError):
+            gridPatternLibrary.getPattern('glider')
+
+    def testParseCirclePatternFile(self):
+        pattern = GridPatternLibrary.parsePatternFile(os.path.join(parentdir, 'pattern_circle.csv'))
+
+        self.assertEqual((7, 7), pattern.shape)
+        np.testing.assert_array_equal([0, 0, 0, 1, 0, 0, 0], pattern[0])
+        np.testing.assert_array_equal(pattern, pattern.T)
+
+
+if __name__ == '__main__':
+    unittest.main()
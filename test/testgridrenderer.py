@@ -0,0 +1,89 @@
+import unittest
+import os, sys, inspect
+import tempfile
+
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, parentdir)
+
+import numpy as np
+import pygame as pg
+
+from cellgrid import CellGrid, ChunkedCellGrid
+from configurationmanager import ConfigurationManager
+from gridrenderer import GridRenderer, PngWriter
+from lifeengine import LifeEngine
+
+
+class TestGridRenderer(unittest.TestCase):
+    def setUp(self):
+        self.tmpDir = tempfile.TemporaryDirectory()
+        self.configMgr = ConfigurationManager(os.path.join(currentdir, 'TestGridView_config.ini'))
+        self.cellGrid = CellGrid(23, 17)
+        self.cellGrid.setWindow(0, 0, (np.random.default_rng(0).random((17, 23)) < 0.3).astype(np.uint8))
+
+    def tearDown(self):
+        self.tmpDir.cleanup()
+
+    def loadPng(self, filename):
+        # surfarray arrays are indexed [x, y]
+        return pg.surfarray.array3d(pg.image.load(filename)).transpose(1, 0, 2)
+
+    def testPngWriter(self):
+        filename = os.path.join(self.tmpDir.name, 'test.png')
+        pixels = np.random.default_rng(1).integers(0, 256, (5, 7, 3), dtype=np.uint8)
+        pngWriter = PngWriter(filename, 7, 5)
+        pngWriter.writeRows(pixels[:2])
+        pngWriter.writeRows(pixels[2:])
+        pngWriter.close()
+
+        np.testing.assert_array_equal(pixels, self.loadPng(filename))
+
+    def testTiledImageIdenticalToSingleTileImage(self):
+        '''
+        Ensures that the image rendered by small tiles, whose label margins are removed
+        except on the first tile row and col, is identical to the image rendered in one tile.
+        '''
+        images = []
+
+        for tileSizePx in (1024, 50):
+            filename = os.path.join(self.tmpDir.name, 'grid{}.png'.format(tileSizePx))
+            GridRenderer(self.configMgr, self.cellGrid, cellSize=9, gridLineWidthTuple=(2, 0), tileSizePx=tileSizePx).writePng(filename, 2, 15, 3, 20)
+            images.append(self.loadPng(filename))
+
+        gridRenderer = GridRenderer(self.configMgr, self.cellGrid, cellSize=9, gridLineWidthTuple=(2, 0))
+        self.assertEqual(gridRenderer.computeImageSize(2, 15, 3, 20), (images[0].shape[1], images[0].shape[0]))
+        np.testing.assert_array_equal(images[0], images[1])
+
+    def testBandsLimitedToByteNumber(self):
+        '''
+        Ensures that the bands are thinner than the tiles when a tile row would exceed the
+        band byte number, and that the image is not changed by the thinner bands.
+        '''
+        gridRenderer = GridRenderer(self.configMgr, self.cellGrid, cellSize=9, gridLineWidthTuple=(2, 0))
+        imageWidth, imageHeight = gridRenderer.computeImageSize(2, 15, 3, 20)
+        thinGridRenderer = GridRenderer(self.configMgr, self.cellGrid, cellSize=9, gridLineWidthTuple=(2, 0),
+                                        bandByteNumber=imageWidth * 3 * 7)
+        bands = list(gridRenderer.iterImageRowBands(2, 15, 3, 20))
+        thinBands = list(thinGridRenderer.iterImageRowBands(2, 15, 3, 20))
+
+        self.assertEqual(1, len(bands))
+        self.assertTrue(all(thinBand.shape[0] <= 7 for thinBand in thinBands))
+        self.assertEqual(imageHeight, sum(thinBand.shape[0] for thinBand in thinBands))
+        np.testing.assert_array_equal(bands[0], np.concatenate(thinBands))
+
+    def testWriteFrameSequence(self):
+        cellGrid = ChunkedCellGrid(100, 100, tileSize=8)
+        cellGrid.setWindow(0, 0, [[0, 1, 0], [0, 0, 1], [1, 1, 1]])
+        gridRenderer = GridRenderer(self.configMgr, cellGrid, cellSize=4, tileSizePx=16)
+        lifeEngine = LifeEngine()
+
+        filenames = gridRenderer.writeFrameSequence(os.path.join(self.tmpDir.name, 'frame_{:03d}.png'), 3,
+                                                    lambda: lifeEngine.step(cellGrid), 0, 6, 0, 6)
+
+        self.assertEqual(['frame_000.png', 'frame_001.png', 'frame_002.png'], [os.path.basename(filename) for filename in filenames])
+        self.assertFalse(np.array_equal(self.loadPng(filenames[0]), self.loadPng(filenames[1])))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,14 +1,22 @@
 import unittest
+import io
+import threading
 import os, sys, inspect
 
 currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
 parentdir = os.path.dirname(currentdir)
 sys.path.insert(0, parentdir)
 
+import numpy as np
 import pygame as pg
 
+import gridview
 from configurationmanager import ConfigurationManager
-from gridview import GridView
+from gridview import GridView, CELL_DRAW_MODE_RECT, CELL_DRAW_MODE_BLIT
+from binarygridfile import BinaryGridFile
+from bordercell import BorderCell
+from cellgrid import ChunkedCellGrid, UNBOUNDED_CELL_NUMBER
+from hashlife import HashLifeCellGrid
 
 
 class TestGridView(unittest.TestCase):
@@ -55,6 +63,567 @@ class TestGridView(unittest.TestCase):
 
         self.assertEqual(fileNotFoundName, 'gridview_test_griddata_not_exist.csv')
 
+    def testBlitAndRectCellDrawModesRenderIdentically(self):
+        '''
+        Ensures the vectorized blit rendering mode draws exactly the same pixels as the per cell
+        rect rendering mode, including partially visible border cells of a shifted grid view.
+        '''
+        configMgr = ConfigurationManager(self.configFilePath)
+
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        gridView.initialiseCellsToValue(0)
+        gridView.cellValueGrid.setWindow(0, 0, np.random.default_rng(0).integers(0, 2, size=(60, 60)))
+        gridView.move(-7, -5)
+
+        gridView.cellDrawMode = CELL_DRAW_MODE_RECT
+        gridView.changed = True
+        gridView.draw()
+        rectDrawnPixels = pg.surfarray.array2d(self.screen)
+
+        gridView.cellDrawMode = CELL_DRAW_MODE_BLIT
+        gridView.changed = True
+        gridView.draw()
+        blitDrawnPixels = pg.surfarray.array2d(self.screen)
+
+        self.assertTrue(np.array_equal(rectDrawnPixels, blitDrawnPixels))
+
+    def testToggleCellRedrawsOnlyTheToggledCell(self):
+        '''
+        Ensures that toggling a cell of an otherwise unchanged grid view only repaints the
+        toggled cell and returns its rectangle as the single updated rectangle.
+        '''
+        configMgr = ConfigurationManager(self.configFilePath)
+
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        gridView.initialiseCellsToValue(0)
+        self.assertEqual([self.screen.get_rect()], gridView.draw())
+        self.assertEqual([], gridView.draw())
+
+        fullyDrawnPixels = pg.surfarray.array2d(self.screen)
+        cellPlusLineSizePx = gridView.cellSize + gridView.gridLineWidth
+        cellRect = pg.Rect(gridView.gridCoordMarginSize + gridView.gridLineWidth + cellPlusLineSizePx * 2,
+                           gridView.gridCoordMarginSize + gridView.gridLineWidth + cellPlusLineSizePx * 1,
+                           gridView.cellSize,
+                           gridView.cellSize)
+        gridView.toggleCell(cellRect.center)
+
+        self.assertEqual(1, gridView.cellValueGrid[1][2])
+        self.assertEqual([cellRect], gridView.draw())
+
+        toggledDrawnPixels = pg.surfarray.array2d(self.screen)
+        changedPixels = (fullyDrawnPixels != toggledDrawnPixels)
+        self.assertEqual(cellRect.width * cellRect.height, changedPixels.sum())
+        self.assertTrue(changedPixels[cellRect.left:cellRect.right, cellRect.top:cellRect.bottom].all())
+
+    def testScrolledMoveDrawsLikeFullRedraw(self):
+        '''
+        Ensures that drawing a grid view move by scrolling the previous frame and drawing only
+        the exposed strips produces the same pixels as repainting the whole surface.
+        '''
+        configMgr = ConfigurationManager(self.configFilePath)
+
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        gridView.initialiseCellsToValue(0)
+        gridView.cellValueGrid.setWindow(0, 0, np.random.default_rng(0).integers(0, 2, size=(100, 100)))
+        gridView.draw()
+
+        for xOffset, yOffset in [(-3, 0), (0, -5), (-20, -17), (4, 3)]:
+            gridView.move(xOffset, yOffset)
+
+            self.assertFalse(gridView.changed)
+            self.assertEqual([self.screen.get_rect()], gridView.draw())
+            scrolledPixels = pg.surfarray.array2d(self.screen)
+
+            gridView.changed = True
+            gridView.draw()
+
+            self.assertTrue(np.array_equal(scrolledPixels, pg.surfarray.array2d(self.screen)))
+
+    def testGridLineLayerRegeneratedOnlyOnZoom(self):
+        '''
+        Ensures the cached grid line layer is reused when the grid view is moved and is
+        regenerated when the cell size changes.
+        '''
+        configMgr = ConfigurationManager(self.configFilePath)
+
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        gridView.initialiseCellsToValue(0)
+        gridView.draw()
+        gridLineLayer = gridView.gridLineLayer
+
+        gridView.move(-5, -3)
+        gridView.draw()
+        self.assertIs(gridLineLayer, gridView.gridLineLayer)
+
+        gridView.zoomIn()
+        gridView.draw()
+        self.assertIsNot(gridLineLayer, gridView.gridLineLayer)
+
+    def testExecTraceDisabledByDefault(self):
+        '''
+        Ensures border cell computations are only traced if the execution trace is enabled
+        in the configuration.
+        '''
+        configMgr = ConfigurationManager(self.configFilePath)
+
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        self.assertIsNone(gridView.execTracer)
+
+        configMgr.execTrace = True
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        traceOutput = io.StringIO()
+        gridView.execTracer.output = traceOutput
+        gridView.initialiseCellsToValue(1)
+        gridView.cellDrawMode = CELL_DRAW_MODE_RECT
+        gridView.move(-3, -3)
+        gridView.changed = True
+        gridView.draw()
+        configMgr.execTrace = False
+        configMgr.storeConfig()
+
+        self.assertIn("'gridOffsetXPx: 3', 'gridOffsetYPx: 3'", traceOutput.getvalue())
+        self.assertIn('bordercell.py', traceOutput.getvalue())
+
+    def testComputeCellCoordsAndSizesClipsBorderCells(self):
+        '''
+        Ensures the batch border cell computation clips the cells partially hidden behind
+        the grid coord margin and gives a 0 size to the cells which are entirely hidden.
+        '''
+        configMgr = ConfigurationManager(self.configFilePath)
+
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        cellSize = gridView.cellSize
+        marginSize = gridView.gridCoordMarginSize
+        gridView.moveViewRight(cellSize + gridView.gridLineWidth + 3)
+
+        xCoords, widths = BorderCell.computeCellCoordsAndSizes(gridView, 0, 3, doComputeX=True)
+
+        self.assertEqual([marginSize, marginSize, marginSize + cellSize - 1], xCoords.tolist())
+        self.assertEqual([0, cellSize - 2, cellSize], widths.tolist())
+
+        yCoords, heights = BorderCell.computeCellCoordsAndSizes(gridView, 0, 2, doComputeX=False)
+
+        self.assertEqual([marginSize + 1, marginSize + cellSize + 2], yCoords.tolist())
+        self.assertEqual([cellSize, cellSize], heights.tolist())
+
+    def testSparseUnboundedGridNavigation(self):
+        '''
+        Ensures the view can be moved to the end of an unbounded sparse grid and that drawing
+        and toggling cells there only allocates the tile containing the alive cell.
+        '''
+        configMgr = ConfigurationManager(self.configFilePath)
+        configMgr.cellStorage = 'sparse'
+        configMgr.sparseGridCellNumber = 0
+
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        gridView.initialiseCellsToValue(0)
+
+        self.assertIsInstance(gridView.cellValueGrid, ChunkedCellGrid)
+        self.assertEqual(UNBOUNDED_CELL_NUMBER, gridView.horizontalMaxManagedCellNumber)
+
+        gridView.moveViewToRightEnd()
+        gridView.moveViewToBottom()
+        gridView.draw()
+        self.assertGreater(gridView.startDrawColIndex, UNBOUNDED_CELL_NUMBER - self.screen.get_width())
+
+        cellZoneRect = gridView.getCellZoneRect()
+        gridView.toggleCell(cellZoneRect.center)
+        gridView.draw()
+
+        self.assertEqual(1, len(gridView.cellValueGrid.tiles))
+        self.assertEqual(self.screen.map_rgb(gridView.activeCellColor), self.screen.get_at_mapped(cellZoneRect.center))
+
+    def testToggleCellOnGridCoordMarginIgnored(self):
+        '''
+        Ensures that a click on the row or col label margin of a sparse grid, which is located
+        before the first cell, neither raises an error nor edits cells.
+        '''
+        configMgr = ConfigurationManager(self.configFilePath)
+        configMgr.cellStorage = 'sparse'
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        gridView.initialiseCellsToValue(0)
+        gridView.draw()
+        cellZoneRect = gridView.getCellZoneRect()
+
+        gridView.toggleCell((cellZoneRect.left - 1, cellZoneRect.top + 1))
+        gridView.toggleCell((cellZoneRect.left + 1, cellZoneRect.top - 1))
+
+        self.assertEqual({}, gridView.cellValueGrid.tiles)
+        self.assertEqual([], gridView.dirtyCells)
+
+    def testToggleCellOnGridCoordMarginIgnoredForAllStoragesAndEngines(self):
+        '''
+        Ensures that a click on the row or col label margin is ignored whatever the cell
+        storage and the Life engine, the HashLife engine replacing the cell storage by a
+        HashLifeCellGrid at the first step.
+        '''
+        gridFileName = 'test_margin_click.grid'
+
+        for cellStorage in ('dense', 'sparse', 'mapped'):
+            for lifeEngine in ('vectorized', 'hashlife'):
+                with self.subTest(cellStorage=cellStorage, lifeEngine=lifeEngine):
+                    configMgr = ConfigurationManager(self.configFilePath)
+                    configMgr.cellStorage = cellStorage
+                    configMgr.lifeEngine = lifeEngine
+                    configMgr.loadAtStartPathFilename = gridFileName
+                    gridView = GridView(surface=self.screen, configManager=configMgr)
+
+                    if cellStorage == 'mapped':
+                        gridView.gridDataMgr.writeGridData(np.zeros((20, 30), dtype=np.uint8))
+                        self.assertIsNone(gridView.loadGridData())
+                    else:
+                        gridView.initialiseCellsToValue(0)
+
+                    gridView.cellValueGrid.setWindow(1, 0, [[1, 1, 1]])
+                    self.assertTrue(gridView.stepCells())
+
+                    if lifeEngine == 'hashlife':
+                        self.assertIsInstance(gridView.cellValueGrid, HashLifeCellGrid)
+
+                    gridView.draw()
+                    cellGridVersion = gridView.cellGridVersion
+                    cells = gridView.cellValueGrid.getWindow(0, 4, 0, 4).copy()
+                    cellZoneRect = gridView.getCellZoneRect()
+
+                    gridView.toggleCell((cellZoneRect.left - 1, cellZoneRect.top + 1))
+                    gridView.toggleCell((cellZoneRect.left + 1, cellZoneRect.top - 1))
+                    gridView.toggleCell((cellZoneRect.left - 1, cellZoneRect.top - 1))
+
+                    np.testing.assert_array_equal(cells, gridView.cellValueGrid.getWindow(0, 4, 0, 4))
+                    self.assertEqual(cellGridVersion, gridView.cellGridVersion)
+                    self.assertEqual([], gridView.dirtyCells)
+
+        os.remove(gridFileName)
+
+    def testToggleCellBeyondMappedGridIgnored(self):
+        '''
+        Ensures that, once a .grid file smaller than the window was mapped, the view is moved
+        back over the mapped cells and that a click beyond them is ignored.
+        '''
+        gridFileName = 'test_small_mapped.grid'
+        configMgr = ConfigurationManager(self.configFilePath)
+        configMgr.cellStorage = 'mapped'
+        configMgr.loadAtStartPathFilename = gridFileName
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        gridView.gridDataMgr.writeGridData(np.ones((10, 12), dtype=np.uint8))
+        gridView.initialiseCellsToValue(0)
+        gridView.move(-300, -300)
+
+        self.assertIsNone(gridView.loadGridData())
+        self.assertEqual((0, 0), (gridView.startDrawRowIndex, gridView.startDrawColIndex))
+
+        cellZoneRect = gridView.getCellZoneRect()
+        gridView.toggleCell((cellZoneRect.right - 1, cellZoneRect.bottom - 1))
+        gridView.draw()
+
+        self.assertEqual(120, int(np.array(gridView.cellValueGrid).sum()))
+
+        os.remove(gridFileName)
+
+    def testStartLoadGridDataLoadsInBackground(self):
+        '''
+        Ensures the grid data loaded by the loading thread are the same as the ones loaded
+        synchronously, that draw() redraws the grid view once rows were loaded and that the
+        missing file name is returned without starting a loading thread.
+        '''
+        csvFileName = 'test_background_load.csv'
+        configMgr = ConfigurationManager(self.configFilePath)
+        configMgr.loadAtStartPathFilename = csvFileName
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        gridData = np.zeros((gridView.verticalMaxManagedCellNumber, gridView.horizontalMaxManagedCellNumber), dtype=np.uint8)
+        gridData[1, 2:5] = 1
+        gridView.gridDataMgr.writeGridData(gridData)
+
+        self.assertIsNone(gridView.startLoadGridData())
+
+        gridView.waitGridDataLoaded()
+        gridView.changed = False
+
+        self.assertFalse(gridView.isLoadingGridData())
+        self.assertEqual(gridView.cellValueGrid, gridData)
+        self.assertEqual(1.0, gridView.gridDataLoadProgressRatio)
+        self.assertEqual([self.screen.get_rect()], gridView.draw())
+
+        os.remove(csvFileName)
+
+        self.assertEqual(csvFileName, gridView.startLoadGridData())
+        self.assertIsNone(gridView.gridDataLoadThread)
+
+    def testStartSaveGridDataSavesSnapshot(self):
+        '''
+        Ensures the grid data saved in the background are the ones of the time the save was
+        started, even if cells are toggled while saving.
+        '''
+        csvFileName = 'test_background_save.csv'
+        configMgr = ConfigurationManager(self.configFilePath)
+        configMgr.loadAtStartPathFilename = csvFileName
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        gridView.initialiseCellsToValue(0)
+        cellPlusLineSizePx = gridView.cellSize + gridView.gridLineWidth
+        cellZoneRect = gridView.getCellZoneRect()
+        gridView.toggleCell((cellZoneRect.left + 1, cellZoneRect.top + 1))
+
+        gridView.startSaveGridData()
+        gridView.toggleCell((cellZoneRect.left + cellPlusLineSizePx + 1, cellZoneRect.top + 1))
+        gridView.waitGridDataSaved()
+
+        savedGridData, _ = gridView.gridDataMgr.readGridData(requiredDimX=2, requiredDimY=1)
+
+        self.assertEqual([[1, 0]], savedGridData)
+        self.assertEqual([1, 1], gridView.cellValueGrid.getWindow(0, 1, 0, 2).tolist()[0])
+        self.assertFalse(os.path.exists(csvFileName + '.tmp'))
+
+        os.remove(csvFileName)
+
+    def testStartSaveMappedGridDataWithoutCopy(self):
+        '''
+        Ensures that a mapped grid is saved without being copied in memory, that its cells can
+        not be modified while it is saved and that it maps the saved file once the save is
+        completed.
+        '''
+        gridFileName = 'test_save_mapped.grid'
+        configMgr = ConfigurationManager(self.configFilePath)
+        configMgr.cellStorage = 'mapped'
+        configMgr.loadAtStartPathFilename = gridFileName
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        gridView.gridDataMgr.writeGridData(np.zeros((10, 12), dtype=np.uint8))
+        gridView.loadGridData()
+        cellZoneRect = gridView.getCellZoneRect()
+        gridView.toggleCell((cellZoneRect.left + 1, cellZoneRect.top + 1))
+        mappedCellGrid = gridView.cellValueGrid
+        writeGridData = gridView.gridDataMgr.writeGridData
+        writeAllowed = threading.Event()
+
+        def waitAndWriteGridData(*args, **kwargs):
+            writeAllowed.wait()
+            return writeGridData(*args, **kwargs)
+
+        gridView.gridDataMgr.writeGridData = waitAndWriteGridData
+        gridView.startSaveGridData()
+
+        self.assertIs(mappedCellGrid, gridView.gridDataSaveCellGrid)
+        self.assertTrue(gridView.isCellGridLocked())
+
+        gridView.toggleCell((cellZoneRect.left + 1, cellZoneRect.top + 1))
+        self.assertFalse(gridView.stepCells())
+        self.assertEqual(1, gridView.cellValueGrid.getCell(0, 0))
+
+        writeAllowed.set()
+        gridView.waitGridDataSaved()
+
+        self.assertFalse(gridView.isCellGridLocked())
+        self.assertTrue(BinaryGridFile.isMappedFile(gridView.cellValueGrid.packedRows, gridFileName))
+        self.assertEqual(1, gridView.gridDataMgr.readGridData(requiredDimX=1, requiredDimY=1)[0].getCell(0, 0))
+
+        os.remove(gridFileName)
+
+    def testAutosaveGridDataIfDue(self):
+        '''
+        Ensures the grid data are autosaved into the autosave file once the autosave interval
+        elapsed, only if cells were modified since the previous autosave.
+        '''
+        configMgr = ConfigurationManager(self.configFilePath)
+        configMgr.loadAtStartPathFilename = 'test_autosave.grid'
+        configMgr.autosaveInterval = '60'
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        gridView.initialiseCellsToValue(0)
+        startTime = gridView.lastAutosaveTime
+        cellZoneRect = gridView.getCellZoneRect()
+
+        self.assertFalse(gridView.autosaveGridDataIfDue(startTime + 61))
+
+        gridView.toggleCell((cellZoneRect.left + 1, cellZoneRect.top + 1))
+
+        self.assertFalse(gridView.autosaveGridDataIfDue(startTime + 59))
+        self.assertTrue(gridView.autosaveGridDataIfDue(startTime + 61))
+
+        gridView.waitGridDataSaved()
+
+        self.assertFalse(gridView.autosaveGridDataIfDue(startTime + 200))
+        self.assertEqual('test_autosave_autosave.grid', gridView.gridDataMgr.getAutosaveFilename())
+        self.assertFalse(os.path.exists('test_autosave.grid'))
+
+        gridView.gridDataMgr.filename = gridView.gridDataMgr.getAutosaveFilename()
+        autosavedGridData, _ = gridView.gridDataMgr.readGridData(requiredDimX=2, requiredDimY=2)
+
+        self.assertEqual([[1, 0], [0, 0]], autosavedGridData)
+
+        os.remove('test_autosave_autosave.grid')
+
+    def testEditJournalPersistsToggledCells(self):
+        '''
+        Ensures the toggled cells are appended to the edit journal when it is flushed, that they
+        are replayed by a new grid view loading the grid data and that compacting the journal
+        merges it into the grid data file.
+        '''
+        gridFileName = 'test_journal.grid'
+        configMgr = ConfigurationManager(self.configFilePath)
+        configMgr.loadAtStartPathFilename = gridFileName
+        configMgr.editJournal = 'True'
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        gridView.initialiseCellsToValue(0)
+        gridView.saveGridData()
+        cellZoneRect = gridView.getCellZoneRect()
+        gridView.toggleCell((cellZoneRect.left + 1, cellZoneRect.top + 1))
+        gridView.flushEditJournal()
+
+        self.assertEqual([], gridView.pendingJournalEdits)
+        self.assertEqual(1, gridView.gridDataMgr.journalRecordNumber)
+
+        reloadedGridView = GridView(surface=self.screen, configManager=configMgr)
+        reloadedGridView.loadGridData()
+
+        self.assertEqual(1, reloadedGridView.cellValueGrid.getCell(0, 0))
+        self.assertTrue(reloadedGridView.compactEditJournal())
+
+        reloadedGridView.waitGridDataSaved()
+
+        self.assertFalse(os.path.exists(gridView.gridDataMgr.getJournalFilename()))
+        self.assertFalse(reloadedGridView.compactEditJournal())
+        self.assertEqual(1, reloadedGridView.gridDataMgr.readGridData(requiredDimX=1, requiredDimY=1)[0].getCell(0, 0))
+
+        os.remove(gridFileName)
+
+    def testEditJournalIgnoredForNeutralGrid(self):
+        '''
+        Ensures that the edits of a grid initialised with neutral data instead of being loaded
+        are neither journaled nor merged into the grid data file, which would be overwritten
+        by the neutral grid.
+        '''
+        gridFileName = 'test_journal_neutral.grid'
+        configMgr = ConfigurationManager(self.configFilePath)
+        configMgr.loadAtStartPathFilename = gridFileName
+        configMgr.editJournal = 'True'
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        gridData = np.zeros((2, 2), dtype=np.uint8)
+        gridData[1, 1] = 1
+        gridView.gridDataMgr.writeGridData(gridData)
+        gridView.initialiseCellsToValue(0)
+        cellZoneRect = gridView.getCellZoneRect()
+        gridView.toggleCell((cellZoneRect.left + 1, cellZoneRect.top + 1))
+        gridView.flushEditJournal()
+
+        self.assertFalse(os.path.exists(gridView.gridDataMgr.getJournalFilename()))
+        self.assertFalse(gridView.compactEditJournal())
+        self.assertEqual([[0, 0], [0, 1]], gridView.gridDataMgr.readGridData(requiredDimX=2, requiredDimY=2)[0].tolist())
+
+        os.remove(gridFileName)
+
+    def testEditJournalOutdatedByHashLife(self):
+        '''
+        Ensures the edits done after a HashLife step are not appended to the edit journal,
+        which would replay them on the grid data saved before the step, and that compacting
+        the journal saves them with the HashLife generations.
+        '''
+        gridFileName = 'test_journal_hashlife.grid'
+        configMgr = ConfigurationManager(self.configFilePath)
+        configMgr.loadAtStartPathFilename = gridFileName
+        configMgr.editJournal = 'True'
+        configMgr.lifeEngine = 'hashlife'
+        configMgr.hashLifeStepExponent = '2'
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        gridView.initialiseCellsToValue(0)
+        gridView.cellValueGrid.setWindow(0, 0, [[0, 1, 0], [0, 0, 1], [1, 1, 1]])
+        gridView.saveGridData()
+
+        self.assertTrue(gridView.stepCells())
+
+        cellZoneRect = gridView.getCellZoneRect()
+        gridView.toggleCell((cellZoneRect.left + 1, cellZoneRect.top + 1))
+        gridView.flushEditJournal()
+
+        self.assertEqual([], gridView.pendingJournalEdits)
+        self.assertFalse(os.path.exists(gridView.gridDataMgr.getJournalFilename()))
+        self.assertTrue(gridView.compactEditJournal())
+
+        gridView.waitGridDataSaved()
+        savedGridData, _ = gridView.gridDataMgr.readGridData(requiredDimX=4, requiredDimY=4)
+
+        self.assertEqual([[1, 0, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1], [0, 1, 1, 1]], savedGridData.tolist())
+
+        os.remove(gridFileName)
+
+    def testStampGridPatternAtMousePosition(self):
+        '''
+        Ensures the pattern top left cell is written on the cell located at the mouse position
+        and that only the cells changed by the pattern are journaled.
+        '''
+        configMgr = ConfigurationManager(self.configFilePath)
+        configMgr.editJournal = 'True'
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        gridView.initialiseCellsToValue(0)
+        gridView.changed = False
+        cellPlusLineSizePx = gridView.cellSize + gridView.gridLineWidth
+        cellZoneRect = gridView.getCellZoneRect()
+
+        gridView.stampGridPattern([[1, 0], [1, 1]], (cellZoneRect.left + cellPlusLineSizePx + 1, cellZoneRect.top + 1))
+
+        self.assertTrue(gridView.changed)
+        self.assertEqual([[0, 1, 0], [0, 1, 1], [0, 0, 0]], gridView.cellValueGrid.getWindow(0, 3, 0, 3).tolist())
+        self.assertEqual([(0, 1, 1), (1, 1, 1), (1, 2, 1)], gridView.pendingJournalEdits)
+
+    def testStepCellsRepaintsOnlyChangedCells(self):
+        gridView = GridView(surface=self.screen, configManager=ConfigurationManager(self.configFilePath))
+        gridView.initialiseCellsToValue(0)
+        gridView.draw()
+        gridView.cellValueGrid.setWindow(1, 0, [[1, 1, 1]])
+
+        self.assertTrue(gridView.stepCells())
+        self.assertFalse(gridView.changed)
+        self.assertEqual([(0, 1), (1, 0), (1, 2), (2, 1)], sorted(gridView.dirtyCells))
+        self.assertEqual([[0, 1, 0], [0, 1, 0], [0, 1, 0]], gridView.cellValueGrid.getWindow(0, 3, 0, 3).tolist())
+
+    def testStepCellsRepaintsOnlyChangedTiles(self):
+        '''
+        Ensures that, when a generation changes too many cells to repaint them individually,
+        only the changed tiles are repainted by the next draw.
+        '''
+        gridView = GridView(surface=self.screen, configManager=ConfigurationManager(self.configFilePath))
+        gridView.initialiseCellsToValue(0)
+        gridView.draw()
+        gridView.cellValueGrid.setWindow(1, 0, [[1, 1, 1]])
+        savedMaxDirtyCellNumber = gridview.MAX_DIRTY_CELL_NUMBER
+
+        try:
+            gridview.MAX_DIRTY_CELL_NUMBER = 0
+            self.assertTrue(gridView.stepCells())
+        finally:
+            gridview.MAX_DIRTY_CELL_NUMBER = savedMaxDirtyCellNumber
+
+        self.assertFalse(gridView.changed)
+        self.assertEqual({(0, 0)}, gridView.dirtyTiles)
+
+        self.assertTrue(gridView.isDrawPending())
+        updatedRects = gridView.draw()
+        self.assertFalse(gridView.isDrawPending())
+        self.assertEqual(1, len(updatedRects))
+        self.assertTrue(gridView.getCellZoneRect().contains(updatedRects[0]))
+        self.assertEqual(set(), gridView.dirtyTiles)
+
+    def testStepCellsWithHashLife(self):
+        '''
+        Ensures the cell grid is imported into the HashLife quadtree at the first step and
+        that the grid view then draws and edits the quadtree.
+        '''
+        configMgr = ConfigurationManager(self.configFilePath)
+        configMgr.lifeEngine = 'hashlife'
+        configMgr.hashLifeStepExponent = '2'
+        gridView = GridView(surface=self.screen, configManager=configMgr)
+        gridView.initialiseCellsToValue(0)
+        gridView.cellValueGrid.setWindow(0, 0, [[0, 1, 0], [0, 0, 1], [1, 1, 1]])
+
+        self.assertTrue(gridView.stepCells())
+        self.assertIsInstance(gridView.cellValueGrid, HashLifeCellGrid)
+        self.assertEqual(4, gridView.cellValueGrid.generation)
+
+        # after 4 generations, the glider moved by one cell down and right
+        self.assertEqual([[0, 0, 0, 0], [0, 0, 1, 0], [0, 0, 0, 1], [0, 1, 1, 1]], gridView.cellValueGrid.getWindow(0, 4, 0, 4).tolist())
+
+        cellZoneRect = gridView.getCellZoneRect()
+        gridView.toggleCell((cellZoneRect.left + 1, cellZoneRect.top + 1))
+        self.assertEqual(1, gridView.cellValueGrid.getCell(0, 0))
+        gridView.draw()
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+import os, sys, inspect
+
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, parentdir)
+
+import numpy as np
+
+from cellgrid import CellGrid, ChunkedCellGrid
+from hashlife import HashLife, HashLifeCellGrid
+from lifeengine import LifeEngine
+
+GLIDER = [[0, 1, 0],
+          [0, 0, 1],
+          [1, 1, 1]]
+
+
+class TestHashLife(unittest.TestCase):
+    def testNodesAreCanonical(self):
+        hashLife = HashLife()
+        firstNode = hashLife.buildNode(np.array([[0, 1, 0, 0], [0, 0, 1, 0], [1, 1, 1, 0], [0, 0, 0, 0]], dtype=np.uint8))
+        secondNode = hashLife.buildNode(np.array([[0, 1, 0, 0], [0, 0, 1, 0], [1, 1, 1, 0], [0, 0, 0, 0]], dtype=np.uint8))
+
+        self.assertIs(firstNode, secondNode)
+        self.assertEqual(5, firstNode.population)
+        self.assertIs(hashLife.getEmptyNode(2), hashLife.buildNode(np.zeros((4, 4), dtype=np.uint8)))
+
+    def testAdvanceMatchesLifeEngine(self):
+        '''
+        Ensures the generations computed by HashLife, by powers of 2 or not, are those computed
+        by the life engine, for Conway's rule and for another rule.
+        '''
+        cells = (np.random.default_rng(0).random((30, 40)) < 0.35).astype(np.uint8)
+
+        for rule in ('B3/S23', 'B36/S125'):
+            expectedCellGrid = CellGrid(160, 160)
+            expectedCellGrid.setWindow(60, 50, cells)
+            hashLifeCellGrid = HashLifeCellGrid.fromCellGrid(expectedCellGrid, HashLife(rule))
+            lifeEngine = LifeEngine(rule)
+
+            for generationNumber in (1, 2, 5, 8):
+                hashLifeCellGrid.advance(generationNumber)
+
+                for _ in range(generationNumber):
+                    lifeEngine.step(expectedCellGrid)
+
+                self.assertEqual(hashLifeCellGrid, expectedCellGrid)
+
+    def testGliderMovesOverMillionGenerations(self):
+        '''
+        Ensures a glider, which moves by one cell diagonally every 4 generations, is at the
+        expected position after 2^20 generations, computed in a few successors.
+        '''
+        hashLifeCellGrid = HashLifeCellGrid(2 ** 20, 2 ** 20)
+        hashLifeCellGrid.setWindow(0, 0, GLIDER)
+        hashLifeCellGrid.advance(2 ** 20)
+
+        self.assertEqual(2 ** 20, hashLifeCellGrid.generation)
+        self.assertEqual(5, hashLifeCellGrid.root.population)
+        self.assertEqual(GLIDER, hashLifeCellGrid.getWindow(2 ** 18, 2 ** 18 + 3, 2 ** 18, 2 ** 18 + 3).tolist())
+
+    def testGarbageCollectionKeepsUniverse(self):
+        hashLifeCellGrid = HashLifeCellGrid(64, 64, HashLife(maxNodeNumber=10))
+        hashLifeCellGrid.setWindow(10, 10, [[0, 1, 1], [1, 1, 0], [0, 1, 0]])
+        expectedCellGrid = CellGrid(64, 64)
+        expectedCellGrid.setWindow(10, 10, [[0, 1, 1], [1, 1, 0], [0, 1, 0]])
+        lifeEngine = LifeEngine()
+
+        for _ in range(20):
+            hashLifeCellGrid.advance(1)
+            lifeEngine.step(expectedCellGrid)
+
+        self.assertEqual(hashLifeCellGrid, expectedCellGrid)
+        self.assertEqual(0, len(hashLifeCellGrid.hashLife.successors))
+
+    def testExportToCellGrid(self):
+        hashLifeCellGrid = HashLifeCellGrid(20, 20)
+        hashLifeCellGrid.setWindow(18, 18, GLIDER)
+        cellGrid = ChunkedCellGrid(20, 20, tileSize=8)
+        cellGrid.setCell(0, 0, 1)
+        hashLifeCellGrid.exportToCellGrid(cellGrid)
+
+        self.assertEqual(0, cellGrid.getCell(0, 0))
+        self.assertEqual([[0, 1], [0, 0]], cellGrid.getWindow(18, 20, 18, 20).tolist())
+
+    def testCopyIsNotModifiedByEdits(self):
+        hashLifeCellGrid = HashLifeCellGrid(10, 10)
+        hashLifeCellGrid.setCell(3, 4, 1)
+        hashLifeCellGridCopy = hashLifeCellGrid.copy()
+        hashLifeCellGrid.setCell(3, 4, 0)
+
+        self.assertEqual(1, hashLifeCellGridCopy.getCell(3, 4))
+        self.assertEqual(0, hashLifeCellGrid.getCell(3, 4))
+
+        with self.assertRaises(IndexError):
+            hashLifeCellGrid.setCell(10, 0, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
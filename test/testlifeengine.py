@@ -0,0 +1,181 @@
+import unittest
+import os, sys, inspect
+
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, parentdir)
+
+import numpy as np
+
+import lifeengine
+from cellgrid import CellGrid, ChunkedCellGrid, PackedCellGrid, UNBOUNDED_CELL_NUMBER
+from activetilemap import ActiveTileMap
+from lifeengine import LifeEngine, LIFE_EDGES_WRAP
+
+GLIDER = [[0, 1, 0],
+          [0, 0, 1],
+          [1, 1, 1]]
+
+
+class TestLifeEngine(unittest.TestCase):
+    def testParseRule(self):
+        self.assertEqual(({3}, {2, 3}), LifeEngine.parseRule('B3/S23'))
+        self.assertEqual(({3, 6}, {2, 3}), LifeEngine.parseRule('s23/b36'))
+        self.assertEqual(({2}, set()), LifeEngine.parseRule('B2/S'))
+
+        with self.assertRaises(ValueError):
+            LifeEngine.parseRule('23/3')
+
+        with self.assertRaises(ValueError):
+            LifeEngine.parseRule('B03/S23')
+
+    def testStepBlinker(self):
+        cellGrid = CellGrid(5, 5)
+        cellGrid.setWindow(2, 1, [[1, 1, 1]])
+        changedRows, changedCols, changedValues = LifeEngine().step(cellGrid)
+
+        self.assertEqual([[0, 0, 0, 0, 0],
+                          [0, 0, 1, 0, 0],
+                          [0, 0, 1, 0, 0],
+                          [0, 0, 1, 0, 0],
+                          [0, 0, 0, 0, 0]], cellGrid.tolist())
+        self.assertEqual([(1, 2, 1), (2, 1, 0), (2, 3, 0), (3, 2, 1)],
+                         sorted(zip(changedRows.tolist(), changedCols.tolist(), changedValues.tolist())))
+
+    def testGliderCrossesWrappedEdges(self):
+        '''
+        Ensures that on a wrapped 8 x 8 grid, the glider is back at its start position after
+        32 generations, having crossed the bottom and right edges.
+        '''
+        cellGrid = CellGrid(8, 8)
+        cellGrid.setWindow(0, 0, GLIDER)
+        startCells = np.array(cellGrid)
+        lifeEngine = LifeEngine(edges=LIFE_EDGES_WRAP)
+
+        for _ in range(32):
+            lifeEngine.step(cellGrid)
+
+        np.testing.assert_array_equal(startCells, np.array(cellGrid))
+
+    def testGliderDiesAtBoundedEdges(self):
+        cellGrid = CellGrid(6, 6)
+        cellGrid.setWindow(0, 0, GLIDER)
+        lifeEngine = LifeEngine()
+
+        for _ in range(40):
+            lifeEngine.step(cellGrid)
+
+        # the glider ends as a block in the bottom right corner
+        self.assertEqual([[1, 1], [1, 1]], cellGrid.getWindow(4, 6, 4, 6).tolist())
+        self.assertEqual(4, np.array(cellGrid).sum())
+
+    def testStepByBandsOnAllCellStorages(self):
+        '''
+        Ensures the generations computed band by band are identical on the dense, sparse and
+        packed cell storages.
+        '''
+        cells = (np.random.default_rng(0).random((21, 19)) < 0.4).astype(np.uint8)
+        cellGrids = [CellGrid(19, 21), ChunkedCellGrid(19, 21, tileSize=8), PackedCellGrid(19, 21)]
+        savedBandCellNumber = lifeengine.STEP_BAND_CELL_NUMBER
+
+        try:
+            lifeengine.STEP_BAND_CELL_NUMBER = 19 * 4
+
+            for edges in (lifeengine.LIFE_EDGES_BOUNDED, LIFE_EDGES_WRAP):
+                lifeEngine = LifeEngine(edges=edges)
+                expectedCellGrid = CellGrid.fromMatrix(cells)
+
+                # reference generation computed in a single band
+                lifeengine.STEP_BAND_CELL_NUMBER = 19 * 21
+                lifeEngine.step(expectedCellGrid)
+                lifeengine.STEP_BAND_CELL_NUMBER = 19 * 4
+
+                for cellGrid in cellGrids:
+                    cellGrid.setWindow(0, 0, cells)
+                    lifeEngine.step(cellGrid)
+                    np.testing.assert_array_equal(np.array(expectedCellGrid), np.array(cellGrid))
+        finally:
+            lifeengine.STEP_BAND_CELL_NUMBER = savedBandCellNumber
+
+    def testStepWithSeveralWorkers(self):
+        '''
+        Ensures the bands computed simultaneously by several workers produce the same cells
+        and the same changed cell order as a single worker.
+        '''
+        cells = (np.random.default_rng(1).random((150, 37)) < 0.4).astype(np.uint8)
+        savedBandCellNumber = lifeengine.STEP_BAND_CELL_NUMBER
+        savedBandRowNumber = lifeengine.MIN_WORKER_BAND_ROW_NUMBER
+
+        try:
+            # 15 bands of 10 rows, computed by 5 waves of 3 bands
+            lifeengine.STEP_BAND_CELL_NUMBER = 37 * 10
+            lifeengine.MIN_WORKER_BAND_ROW_NUMBER = 8
+
+            for edges in (lifeengine.LIFE_EDGES_BOUNDED, LIFE_EDGES_WRAP):
+                expectedCellGrid = CellGrid.fromMatrix(cells)
+                cellGrid = PackedCellGrid(37, 150)
+                cellGrid.setWindow(0, 0, cells)
+                lifeEngine = LifeEngine(edges=edges, workerNumber=3)
+
+                for _ in range(4):
+                    expectedChangedCells = LifeEngine(edges=edges).step(expectedCellGrid)
+                    changedCells = lifeEngine.step(cellGrid)
+
+                    for expectedChangedCellArray, changedCellArray in zip(expectedChangedCells, changedCells):
+                        np.testing.assert_array_equal(expectedChangedCellArray, changedCellArray)
+
+                    np.testing.assert_array_equal(np.array(expectedCellGrid), np.array(cellGrid))
+
+                lifeEngine.close()
+        finally:
+            lifeengine.STEP_BAND_CELL_NUMBER = savedBandCellNumber
+            lifeengine.MIN_WORKER_BAND_ROW_NUMBER = savedBandRowNumber
+
+    def testStepActiveTilesOnly(self):
+        '''
+        Ensures the generations computed on the active tiles only are identical to the
+        generations computed on the whole grid, edits included, and that the tiles far from
+        the glider are not active.
+        '''
+        for edges in (lifeengine.LIFE_EDGES_BOUNDED, LIFE_EDGES_WRAP):
+            lifeEngine = LifeEngine(edges=edges)
+            expectedCellGrid = CellGrid(40, 40)
+            expectedCellGrid.setWindow(0, 0, GLIDER)
+            cellGrid = ChunkedCellGrid(40, 40, tileSize=8)
+            cellGrid.setWindow(0, 0, GLIDER)
+            activeTileMap = ActiveTileMap(tileSize=8)
+
+            for generation in range(60):
+                if generation == 30:
+                    expectedCellGrid.setWindow(30, 1, [[1, 1, 1]])
+                    cellGrid.setWindow(30, 1, [[1, 1, 1]])
+                    activeTileMap.addChangedWindow(30, 31, 1, 4)
+
+                lifeEngine.step(expectedCellGrid)
+                lifeEngine.step(cellGrid, activeTileMap)
+                np.testing.assert_array_equal(np.array(expectedCellGrid), cellGrid.getWindow(0, 40, 0, 40))
+                self.assertLessEqual(len(activeTileMap.changedTiles), 5)
+
+    def testStepUntrackedFarCells(self):
+        '''
+        Ensures that the first generation of an unbounded sparse grid whose changed tiles are
+        unknown is computed on its allocated tiles, and not on the whole data extent which
+        would not fit in memory.
+        '''
+        cellGrid = ChunkedCellGrid(UNBOUNDED_CELL_NUMBER, UNBOUNDED_CELL_NUMBER)
+        cellGrid.setWindow(2 ** 39, 2 ** 39, [[1, 1, 1]])
+        activeTileMap = ActiveTileMap()
+
+        changedRows, changedCols, _ = LifeEngine().step(cellGrid, activeTileMap)
+
+        self.assertEqual(4, changedRows.size)
+        np.testing.assert_array_equal([[0, 1, 0], [0, 1, 0], [0, 1, 0]], cellGrid.getWindow(2 ** 39 - 1, 2 ** 39 + 2, 2 ** 39, 2 ** 39 + 3))
+        self.assertTrue(activeTileMap.isTracking())
+
+    def testWrapUnboundedGridRaisesValueError(self):
+        with self.assertRaises(ValueError):
+            LifeEngine(edges=LIFE_EDGES_WRAP).step(ChunkedCellGrid())
+
+
+if __name__ == '__main__':
+    unittest.main()
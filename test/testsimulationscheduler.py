@@ -0,0 +1,71 @@
+import unittest
+import os, sys, inspect
+
+currentdir = os.path.dirname(os.path.abspath(inspect.getfile(inspect.currentframe())))
+parentdir = os.path.dirname(currentdir)
+sys.path.insert(0, parentdir)
+
+from simulationscheduler import SimulationScheduler
+
+
+class FakeClock():
+    '''
+    Clock advanced by the test instead of the real time.
+    '''
+    def __init__(self):
+        self.time = 0
+
+    def __call__(self):
+        return self.time
+
+
+class TestSimulationScheduler(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.stepDuration = 0
+
+    def step(self):
+        self.clock.time += self.stepDuration
+
+        return True
+
+    def testFixedStepRate(self):
+        '''
+        Ensures that, at 128 generations per second, frames lasting 5.5 / 128 second compute
+        5 or 6 generations, the step fraction being carried over to the next frame. The
+        durations are binary fractions, so that they are exact floats.
+        '''
+        simulationScheduler = SimulationScheduler(fps=20, stepRate=128, clock=self.clock)
+        stepNumbers = []
+
+        for _ in range(5):
+            stepNumbers.append(simulationScheduler.runSteps(self.step))
+            self.clock.time += 5.5 / 128
+
+        self.assertEqual([0, 5, 6, 5, 6], stepNumbers)
+
+    def testStepsLimitedByBudget(self):
+        '''
+        Ensures the steps which do not fit in the frame budget are dropped, and that without
+        step rate, as many steps as fit in the budget are computed.
+        '''
+        self.stepDuration = 0.01
+        simulationScheduler = SimulationScheduler(fps=20, stepRate=1000, clock=self.clock)
+        simulationScheduler.runSteps(self.step)
+        self.clock.time += 0.05
+
+        # 50 steps are due but only 4 fit in the 0.0375 second budget
+        self.assertEqual(4, simulationScheduler.runSteps(self.step))
+        self.assertEqual(46, simulationScheduler.droppedStepNumber)
+
+        simulationScheduler = SimulationScheduler(fps=20, clock=self.clock)
+        self.assertEqual(4, simulationScheduler.runSteps(self.step))
+
+    def testUnchangedCellsStopSteps(self):
+        simulationScheduler = SimulationScheduler(fps=20, clock=self.clock)
+
+        self.assertEqual(1, simulationScheduler.runSteps(lambda: False))
+
+
+if __name__ == '__main__':
+    unittest.main()